@@ -1,7 +1,8 @@
-
-class Assignment:
-
-    def __init__(self, assignment_id, assignment_name, course):
-        self.assignment_id = assignment_id
-        self.assignment_name = assignment_name
-        self.course = course  # the assignment belongs to a unique Course
+
+class Assignment:
+    __slots__ = ("assignment_id", "assignment_name", "course") # no per-instance __dict__
+
+    def __init__(self, assignment_id, assignment_name, course):
+        self.assignment_id = assignment_id
+        self.assignment_name = assignment_name
+        self.course = course  # the assignment belongs to a unique Course
@@ -0,0 +1,211 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from app.course_service_impl import CourseServiceImpl
+from app.page import Page, DEFAULT_PAGE_SIZE
+
+
+# Helper function: each caller of a shared read gets its own list or Page, so a caller
+# changing its result doesn't change the result of the others (the objects in it are shared)
+def copy_result(value):
+    if isinstance(value, list):
+        return list(value)
+    if isinstance(value, Page):
+        return Page(value.items, value.next_cursor)
+    return value
+
+
+class AsyncCourseService:
+    """
+    asyncio facade of a CourseService, with the same methods as coroutines.
+    Calls run on one worker thread, so the event loop is never blocked and the
+    service (not thread-safe) sees one call at a time, in the order they were made.
+
+    - Identical reads running at the same time share one computation; each caller
+      gets its own copy of a list or Page result.
+    - Writes made while the loop is busy are queued and applied together, in order,
+      in one step on the worker thread (at most max_batch writes per step).
+    - A read waits for the writes made before it, so it always sees them.
+    """
+
+    def __init__(self, service=None, max_batch=1000, executor=None):
+        if not isinstance(max_batch, int) or max_batch < 1:
+            raise ValueError("max_batch must be a positive integer.")
+
+        self.service = service if service is not None else CourseServiceImpl()
+        self.max_batch = max_batch
+        self.own_executor = executor is None
+        self.executor = executor if executor is not None else ThreadPoolExecutor(max_workers=1, thread_name_prefix="course-service")
+
+        self.in_flight = {}       # (method name, args) -> future of a running read
+        self.pending_writes = []  # (method name, args, future) waiting for the next step
+        self.flush_scheduled = False
+        self.stats = {"reads": 0, "coalesced_reads": 0, "writes": 0, "write_batches": 0}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    # Applies the pending writes and stops the worker thread (if it was created here)
+    async def close(self):
+        self.flush_writes()
+        if self.own_executor:
+            await asyncio.get_running_loop().run_in_executor(None, self.executor.shutdown)
+
+    # ----------------------------------------------------------
+    # Helper functions to run the calls on the worker thread
+
+    async def read(self, name, *args):
+        self.stats["reads"] += 1
+        # The read runs after the writes made before it, and doesn't share the reads made before them
+        self.flush_writes()
+        key = (name, args)
+        try:
+            future = self.in_flight.get(key)
+        except TypeError: # unhashable arguments, the read is not shared
+            key = None
+            future = None
+
+        if future is not None:
+            self.stats["coalesced_reads"] += 1
+        else:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self.executor, functools.partial(getattr(self.service, name), *args))
+            if key is not None:
+                self.in_flight[key] = future
+                future.add_done_callback(functools.partial(self.read_done, key))
+
+        # shield: a cancelled caller doesn't cancel the read shared with others
+        result = await asyncio.shield(future)
+        # The first caller gets a copy too: it may run and change its result before the others get theirs
+        return result if key is None else copy_result(result)
+
+    def read_done(self, key, future):
+        if self.in_flight.get(key) is future:
+            del self.in_flight[key]
+
+    async def write(self, name, *args):
+        self.stats["writes"] += 1
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending_writes.append((name, args, future))
+        if len(self.pending_writes) >= self.max_batch:
+            self.flush_writes()
+        elif not self.flush_scheduled:
+            self.flush_scheduled = True
+            loop.call_soon(self.flush_writes)
+        return await future
+
+    # Sends the pending writes to the worker thread, as one step
+    def flush_writes(self):
+        self.flush_scheduled = False
+        if not self.pending_writes:
+            return
+        batch = self.pending_writes
+        self.pending_writes = []
+        self.stats["write_batches"] += 1
+        # Reads made from now on must see these writes: they don't share the running reads
+        self.in_flight.clear()
+
+        step = asyncio.get_running_loop().run_in_executor(self.executor, self.apply_writes, batch)
+        step.add_done_callback(self.writes_applied)
+
+    # Runs on the worker thread
+    def apply_writes(self, batch):
+        results = []
+        for name, args, future in batch:
+            try:
+                results.append((future, getattr(self.service, name)(*args), None))
+            except Exception as error: # given to the caller of this write only
+                results.append((future, None, error))
+        return results
+
+    def writes_applied(self, step):
+        for future, result, error in step.result():
+            if future.cancelled():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    # ----------------------------------------------------------
+    # CourseService methods
+
+    async def get_courses(self):
+        return await self.read("get_courses")
+
+    async def get_course_by_id(self, course_id):
+        return await self.read("get_course_by_id", course_id)
+
+    async def create_course(self, course_name):
+        return await self.write("create_course", course_name)
+
+    async def delete_course(self, course_id):
+        return await self.write("delete_course", course_id)
+
+    async def create_assignment(self, course_id, assignment_name):
+        return await self.write("create_assignment", course_id, assignment_name)
+
+    async def enroll_student(self, course_id, student_id):
+        return await self.write("enroll_student", course_id, student_id)
+
+    async def enroll_students_bulk(self, course_id, student_ids):
+        return await self.write("enroll_students_bulk", course_id, student_ids)
+
+    async def dropout_student(self, course_id, student_id):
+        return await self.write("dropout_student", course_id, student_id)
+
+    async def submit_assignment(self, course_id, student_id, assignment_id, grade):
+        return await self.write("submit_assignment", course_id, student_id, assignment_id, grade)
+
+    async def submit_assignments_bulk(self, records):
+        return await self.write("submit_assignments_bulk", records)
+
+    async def get_assignment_grade_avg(self, course_id, assignment_id):
+        return await self.read("get_assignment_grade_avg", course_id, assignment_id)
+
+    async def get_student_grade_avg(self, course_id, student_id):
+        return await self.read("get_student_grade_avg", course_id, student_id)
+
+    async def get_top_five_students(self, course_id):
+        return await self.read("get_top_five_students", course_id)
+
+    async def get_top_k_students(self, course_id, k):
+        return await self.read("get_top_k_students", course_id, k)
+
+    async def get_student_rank(self, course_id, student_id):
+        return await self.read("get_student_rank", course_id, student_id)
+
+    async def get_students_in_rank_range(self, course_id, lo, hi):
+        return await self.read("get_students_in_rank_range", course_id, lo, hi)
+
+    async def get_courses_page(self, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        return await self.read("get_courses_page", cursor, limit)
+
+    async def get_course_students_page(self, course_id, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        return await self.read("get_course_students_page", course_id, cursor, limit)
+
+    async def get_course_assignments_page(self, course_id, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        return await self.read("get_course_assignments_page", course_id, cursor, limit)
+
+    async def get_student_courses_page(self, student_id, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        return await self.read("get_student_courses_page", student_id, cursor, limit)
+
+    async def get_student_transcript(self, student_id):
+        return await self.read("get_student_transcript", student_id)
+
+    async def get_student_overall_avg(self, student_id):
+        return await self.read("get_student_overall_avg", student_id)
+
+    async def get_assignment_grade_percentile(self, course_id, assignment_id, p):
+        return await self.read("get_assignment_grade_percentile", course_id, assignment_id, p)
+
+    async def get_assignment_grade_median(self, course_id, assignment_id):
+        return await self.read("get_assignment_grade_median", course_id, assignment_id)
+
+    async def get_course_grade_distribution(self, course_id):
+        return await self.read("get_course_grade_distribution", course_id)
@@ -0,0 +1,25 @@
+class BulkResult:
+    """
+    Result of a bulk operation. Keeps the objects returned for the applied records
+    and the errors of the rejected ones, so a bad record does not stop the batch.
+    """
+
+    def __init__(self):
+        self.results = [] # objects of the applied records, in record order
+        self.errors = []  # (index, record, message) of the rejected records
+
+    def add_result(self, result):
+        self.results.append(result)
+
+    def add_error(self, index, record, message):
+        self.errors.append((index, record, message))
+
+    # Number of applied records
+    @property
+    def applied(self):
+        return len(self.results)
+
+    # Number of rejected records
+    @property
+    def rejected(self):
+        return len(self.errors)
@@ -0,0 +1,196 @@
+import threading
+from collections import OrderedDict
+
+from app.course_service import CourseService
+from app.course_service_impl import CourseServiceImpl
+from app.page import DEFAULT_PAGE_SIZE
+
+
+class CachedCourseService(CourseService):
+    """
+    Wraps a CourseService and caches the results of the average and top-k queries,
+    keyed by method and arguments. Each course has a version, increased by every change
+    to the course; a cached result is used only while its course has the version it was
+    computed with, so it is never stale. The least recently used results are evicted
+    above max_entries.
+
+    All the changes must go through this object, else the versions don't see them.
+    Other attributes are those of the wrapped service.
+    Useful in front of a service where a query costs more than a dict lookup,
+    e.g. ShardedCourseService (a round trip to another process).
+    """
+
+    def __init__(self, service=None, max_entries=100000):
+        if not isinstance(max_entries, int) or max_entries < 1:
+            raise ValueError("max_entries must be a positive integer.")
+        self.service = service if service is not None else CourseServiceImpl()
+        self.max_entries = max_entries
+        self.entries = OrderedDict() # (method, args) -> (course version, result), least recently used first
+        self.versions = {}           # course_id -> version, 0 if not changed yet
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def __getattr__(self, name):
+        return getattr(self.service, name)
+
+    # ----------------------------------------------------------
+    # Helper functions for the cache
+
+    # Returns the result of method(course_id, *args), from the cache when the course didn't change
+    def cached(self, method, course_id, *args):
+        key = (method.__name__, course_id) + args
+        try:
+            with self.lock:
+                version = self.versions.get(course_id, 0)
+                entry = self.entries.get(key)
+                if entry is not None and entry[0] == version:
+                    self.entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return entry[1]
+                self.stats["misses"] += 1
+        except TypeError: # unhashable arguments, not cached
+            return method(course_id, *args)
+
+        # The version is read before the query: if the course changes meanwhile,
+        # the result is saved with the old version and never used
+        result = method(course_id, *args)
+        with self.lock:
+            self.entries[key] = (version, result)
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.stats["evictions"] += 1
+        return result
+
+    # Called after a change to the courses, so a query running during the change
+    # doesn't save its result with the new version
+    def changed(self, course_ids):
+        with self.lock:
+            for course_id in course_ids:
+                try:
+                    self.versions[course_id] = self.versions.get(course_id, 0) + 1
+                except TypeError: # unhashable id, nothing is cached for it
+                    pass
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+    # ----------------------------------------------------------
+    # Override
+
+    def get_courses(self):
+        return self.service.get_courses()
+
+    def get_course_by_id(self, course_id):
+        return self.service.get_course_by_id(course_id)
+
+    # A query may have been cached for the new id while it didn't exist
+    def create_course(self, course_name):
+        course = self.service.create_course(course_name)
+        self.changed((course.course_id,))
+        return course
+
+    def delete_course(self, course_id):
+        try:
+            return self.service.delete_course(course_id)
+        finally:
+            self.changed((course_id,))
+
+    def create_assignment(self, course_id, assignment_name):
+        try:
+            return self.service.create_assignment(course_id, assignment_name)
+        finally:
+            self.changed((course_id,))
+
+    def enroll_student(self, course_id, student_id):
+        try:
+            return self.service.enroll_student(course_id, student_id)
+        finally:
+            self.changed((course_id,))
+
+    def enroll_students_bulk(self, course_id, student_ids):
+        try:
+            return self.service.enroll_students_bulk(course_id, student_ids)
+        finally:
+            self.changed((course_id,))
+
+    def dropout_student(self, course_id, student_id):
+        try:
+            return self.service.dropout_student(course_id, student_id)
+        finally:
+            self.changed((course_id,))
+
+    def submit_assignment(self, course_id, student_id, assignment_id, grade):
+        try:
+            return self.service.submit_assignment(course_id, student_id, assignment_id, grade)
+        finally:
+            self.changed((course_id,))
+
+    def submit_assignments_bulk(self, records):
+        records = list(records) # read again below to find the changed courses
+        try:
+            return self.service.submit_assignments_bulk(records)
+        finally:
+            course_ids = set()
+            for record in records:
+                try:
+                    course_ids.add(record[0])
+                except (TypeError, IndexError, KeyError): # malformed record
+                    pass
+            self.changed(course_ids)
+
+    def get_assignment_grade_avg(self, course_id, assignment_id):
+        return self.cached(self.service.get_assignment_grade_avg, course_id, assignment_id)
+
+    def get_student_grade_avg(self, course_id, student_id):
+        return self.cached(self.service.get_student_grade_avg, course_id, student_id)
+
+    # The lists are copied, so the callers can't change the cached ones
+    def get_top_five_students(self, course_id):
+        top = self.cached(self.service.get_top_five_students, course_id)
+        return None if top is None else list(top)
+
+    def get_top_k_students(self, course_id, k):
+        top = self.cached(self.service.get_top_k_students, course_id, k)
+        return None if top is None else list(top)
+
+    def get_student_rank(self, course_id, student_id):
+        return self.cached(self.service.get_student_rank, course_id, student_id)
+
+    def get_students_in_rank_range(self, course_id, lo, hi):
+        ranked = self.cached(self.service.get_students_in_rank_range, course_id, lo, hi)
+        return None if ranked is None else list(ranked)
+
+    def get_assignment_grade_percentile(self, course_id, assignment_id, p):
+        return self.cached(self.service.get_assignment_grade_percentile, course_id, assignment_id, p)
+
+    def get_assignment_grade_median(self, course_id, assignment_id):
+        return self.cached(self.service.get_assignment_grade_median, course_id, assignment_id)
+
+    def get_course_grade_distribution(self, course_id):
+        distribution = self.cached(self.service.get_course_grade_distribution, course_id)
+        return None if distribution is None else list(distribution)
+
+    # The pages are not cached: they hold the objects of the service
+    def get_courses_page(self, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        return self.service.get_courses_page(cursor, limit)
+
+    def get_course_students_page(self, course_id, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        return self.service.get_course_students_page(course_id, cursor, limit)
+
+    def get_course_assignments_page(self, course_id, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        return self.service.get_course_assignments_page(course_id, cursor, limit)
+
+    def get_student_courses_page(self, student_id, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        return self.service.get_student_courses_page(student_id, cursor, limit)
+
+    # The student queries are not cached: the versions are kept by course
+    def get_student_transcript(self, student_id):
+        return self.service.get_student_transcript(student_id)
+
+    def get_student_overall_avg(self, student_id):
+        return self.service.get_student_overall_avg(student_id)
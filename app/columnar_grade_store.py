@@ -0,0 +1,215 @@
+try:
+    import numpy as np
+except ImportError: # numpy is optional, only needed for the columnar store
+    np = None
+
+
+class CourseColumns:
+    """
+    Grades of one course in parallel numpy arrays (student index, assignment index, grade).
+    rows gives the row of a grade from its key, the student and assignment indexes packed
+    in one int (see key); the key of a row is read back from the index columns.
+    """
+    __slots__ = ("student_index", "assignment_index", "grade", "size", "rows")
+
+    def __init__(self, capacity):
+        self.student_index = np.zeros(capacity, dtype=np.int32)
+        self.assignment_index = np.zeros(capacity, dtype=np.int32)
+        self.grade = np.zeros(capacity, dtype=np.int16)
+        self.size = 0
+        self.rows = {} # key -> row
+
+    @staticmethod
+    def key(student, assignment):
+        return student << 32 | assignment
+
+    def grow(self):
+        capacity = len(self.grade) * 2
+        for name in ("student_index", "assignment_index", "grade"):
+            column = getattr(self, name)
+            resized = np.zeros(capacity, dtype=column.dtype)
+            resized[:self.size] = column[:self.size]
+            setattr(self, name, resized)
+
+    # Saves a grade, returns True if it is a new row
+    def put(self, student, assignment, value):
+        key = self.key(student, assignment)
+        row = self.rows.get(key)
+        added = row is None
+        if added:
+            if self.size == len(self.grade):
+                self.grow()
+            row = self.rows[key] = self.size
+            self.size += 1
+            self.student_index[row] = student
+            self.assignment_index[row] = assignment
+        self.grade[row] = value
+        return added
+
+    # Removes a grade, returns False if it is not in the course
+    def remove(self, student, assignment):
+        row = self.rows.pop(self.key(student, assignment), None)
+        if row is None:
+            return False
+        # Move the last row into the hole
+        last = self.size - 1
+        if row != last:
+            self.rows[self.key(int(self.student_index[last]), int(self.assignment_index[last]))] = row
+            self.student_index[row] = self.student_index[last]
+            self.assignment_index[row] = self.assignment_index[last]
+            self.grade[row] = self.grade[last]
+        self.size = last
+        return True
+
+
+class ColumnarGradeStore:
+    """
+    Copy of the grades of a CourseServiceImpl in numpy arrays for vectorized analytics:
+    the grades of each course are in their own CourseColumns, so a group-by reads only
+    the rows of its course. Ids are replaced by dense integer indexes.
+    It is registered as a grade listener, so it stays in sync with the service.
+    Requires numpy.
+    """
+
+    def __init__(self, capacity=64):
+        if np is None:
+            raise ImportError("ColumnarGradeStore requires numpy (pip install numpy)")
+
+        self.capacity = max(int(capacity), 1) # initial rows of each course, the arrays double when full
+        self.courses = {} # course_id -> CourseColumns, of the courses with grades
+        self.size = 0
+
+        # Dense integer index of each id, and the ids by index
+        self.student_ids = {}
+        self.assignment_ids = {}
+        self.assignment_by_index = []
+
+    # Creates a store with the grades of a service and keeps it in sync
+    @classmethod
+    def attach(cls, service, capacity=64):
+        store = cls(capacity)
+        service.add_grade_listener(store)
+        return store
+
+    def __len__(self):
+        return self.size
+
+    # Helper function to get the dense index of an id
+    def intern(self, ids, value, by_index=None):
+        index = ids.get(value)
+        if index is None:
+            index = ids[value] = len(ids)
+            if by_index is not None:
+                by_index.append(value)
+        return index
+
+    # ----------------------------------------------------------
+    # Grade listener
+    def grade_added(self, grade):
+        course_id = grade.course.course_id
+        columns = self.courses.get(course_id)
+        if columns is None:
+            columns = self.courses[course_id] = CourseColumns(self.capacity)
+        student = self.intern(self.student_ids, grade.student.student_id)
+        assignment = self.intern(self.assignment_ids, grade.assignment.assignment_id, self.assignment_by_index)
+        if columns.put(student, assignment, grade.grade):
+            self.size += 1
+
+    def grade_removed(self, grade):
+        course_id = grade.course.course_id
+        columns = self.courses.get(course_id)
+        student = self.student_ids.get(grade.student.student_id)
+        assignment = self.assignment_ids.get(grade.assignment.assignment_id)
+        if columns is None or student is None or assignment is None:
+            return
+        if columns.remove(student, assignment):
+            self.size -= 1
+            if columns.size == 0: # e.g. the course was deleted
+                del self.courses[course_id]
+
+    # ----------------------------------------------------------
+    # Analytics
+
+    # Helper function: grades of a course sorted by (assignment index, grade)
+    # Returns [assignment indexes, grades] or None if the course has no grades
+    # Costs the number of grades of the course
+    def course_columns(self, course_id):
+        columns = self.courses.get(course_id)
+        if columns is None:
+            return None
+        assignments = columns.assignment_index[:columns.size]
+        grades = columns.grade[:columns.size]
+        order = np.lexsort((grades, assignments))
+        return assignments[order], grades[order]
+
+    # Helper function: statistics of sorted groups of grades, all groups at once
+    # starts and counts describe each group in the sorted grades
+    def group_stats(self, grades, starts, counts, percentiles):
+        values = grades.astype(np.float64)
+        sums = np.add.reduceat(values, starts)
+        squares = np.add.reduceat(values * values, starts)
+        means = sums / counts
+        stds = np.sqrt(np.maximum(squares / counts - means * means, 0.0))
+        ends = starts + counts - 1
+
+        def percentile(q):
+            # linear interpolation between the closest ranks, as numpy.percentile
+            position = starts + (counts - 1) * (q / 100.0)
+            low = np.floor(position).astype(np.int64)
+            high = np.ceil(position).astype(np.int64)
+            return values[low] + (values[high] - values[low]) * (position - low)
+
+        stats = []
+        medians = percentile(50)
+        others = {q: percentile(q) for q in percentiles}
+        for i in range(len(starts)):
+            stats.append({
+                "count": int(counts[i]),
+                "mean": float(means[i]),
+                "std": float(stds[i]),
+                "min": int(grades[starts[i]]),
+                "max": int(grades[ends[i]]),
+                "median": float(medians[i]),
+                "percentiles": {q: float(others[q][i]) for q in percentiles},
+            })
+        return stats
+
+    # Returns the statistics of every assignment of a course:
+    # {assignment_id: {count, mean, std, min, max, median, percentiles: {q: value}}}
+    def assignment_stats(self, course_id, percentiles=(25, 75, 90)):
+        columns = self.course_columns(course_id)
+        if columns is None:
+            return {}
+        assignments, grades = columns
+        groups, starts, counts = np.unique(assignments, return_index=True, return_counts=True)
+        stats = self.group_stats(grades, starts, counts, percentiles)
+        return {self.assignment_by_index[g]: s for g, s in zip(groups.tolist(), stats)}
+
+    # Returns the statistics of all grades of a course, or None if it has no grades
+    def course_stats(self, course_id, percentiles=(25, 75, 90)):
+        columns = self.course_columns(course_id)
+        if columns is None:
+            return None
+        grades = np.sort(columns[1])
+        return self.group_stats(grades, np.array([0]), np.array([len(grades)]), percentiles)[0]
+
+    # Returns the histogram of every assignment of a course: {assignment_id: [count per bin]}
+    # Bins split 0-100 in equal ranges, the last bin includes 100 (as numpy.histogram)
+    def assignment_histograms(self, course_id, bins=10):
+        columns = self.course_columns(course_id)
+        if columns is None:
+            return {}
+        assignments, grades = columns
+        groups, group_of_row = np.unique(assignments, return_inverse=True)
+        bin_of_row = np.minimum(grades.astype(np.int64) * bins // 100, bins - 1)
+        counts = np.bincount(group_of_row * bins + bin_of_row, minlength=len(groups) * bins)
+        counts = counts.reshape(len(groups), bins)
+        return {self.assignment_by_index[g]: counts[i].tolist() for i, g in enumerate(groups.tolist())}
+
+    # Returns the histogram of all grades of a course
+    def course_histogram(self, course_id, bins=10):
+        columns = self.course_columns(course_id)
+        if columns is None:
+            return [0] * bins
+        bin_of_row = np.minimum(columns[1].astype(np.int64) * bins // 100, bins - 1)
+        return np.bincount(bin_of_row, minlength=bins).tolist()
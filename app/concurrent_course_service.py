@@ -0,0 +1,218 @@
+import contextlib
+import threading
+
+from app.course_service_impl import CourseServiceImpl
+from app.grade_aggregates import GradeAggregates
+from app.rwlock import ReadWriteLock
+from app.page import DEFAULT_PAGE_SIZE
+
+NO_LOCK = contextlib.nullcontext() # for course ids that don't exist, the call finds nothing
+
+
+class LockedGradeAggregates(GradeAggregates):
+    """
+    GradeAggregates changed by several threads: the totals of a student are changed
+    by the threads writing to different courses.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.lock = threading.Lock()
+
+    def add(self, key, value):
+        with self.lock:
+            super().add(key, value)
+
+    def remove(self, key, value):
+        with self.lock:
+            super().remove(key, value)
+
+    def total(self, key):
+        with self.lock:
+            return super().total(key)
+
+    def average(self, key):
+        with self.lock:
+            return super().average(key)
+
+
+class ConcurrentCourseService(CourseServiceImpl):
+    """
+    Thread-safe CourseServiceImpl. Each course has a reader/writer lock: reads of a course
+    (averages, top students) run in parallel, and changes to different courses don't wait
+    for each other. The list of courses has its own lock, taken to create or delete a course.
+    Id allocation uses a small mutex. The student lock, taken after the course lock, guards
+    student creation and the course lists of the students, which are shared by all courses.
+
+    Grade listeners (see add_grade_listener) are called from the threads changing the
+    grades of different courses at the same time, so they must be thread-safe.
+    """
+
+    def __init__(self, storage=None):
+        super().__init__(storage)
+        self.catalog_lock = ReadWriteLock() # list of courses
+        self.course_locks = {}              # course_id -> ReadWriteLock
+        self.serial_lock = threading.Lock()
+        self.student_lock = threading.RLock() # enroll_student holds it while creating the student
+        self.overall_totals = LockedGradeAggregates()
+
+    # Helper function to get the lock of a course
+    def course_lock(self, course_id, write):
+        lock = self.course_locks.get(course_id)
+        if lock is None:
+            return NO_LOCK
+        return lock.write_lock if write else lock.read_lock
+
+    # ----------------------------------------------------------
+    # Serials and students shared by all courses
+    def generate_course_id(self):
+        with self.serial_lock:
+            course_id = super().generate_course_id()
+        # The lock exists before the course is saved, so nobody can see the course without its lock
+        self.course_locks[course_id] = ReadWriteLock()
+        return course_id
+
+    def generate_assignment_id(self):
+        with self.serial_lock:
+            return super().generate_assignment_id()
+
+    def find_or_create_student(self, student_id):
+        student = self.storage.get_student(student_id)
+        if student is not None:
+            return student
+        with self.student_lock: # only one thread creates the student
+            return super().find_or_create_student(student_id)
+
+    # Restores a snapshot: the courses are added to the storage without generate_course_id,
+    # so each one gets its lock here, before the service is returned to other threads
+    @classmethod
+    def load_snapshot(cls, path, storage=None):
+        service = super().load_snapshot(path, storage)
+        for course in service.storage.courses():
+            service.course_locks[course.course_id] = ReadWriteLock()
+        return service
+
+    # Saves a consistent snapshot: waits for the changes in progress and blocks new ones
+    def save_snapshot(self, path):
+        with self.catalog_lock.write_lock, contextlib.ExitStack() as stack:
+            for lock in sorted(self.course_locks.values(), key=id): # same order as submit_assignments_bulk
+                stack.enter_context(lock.write_lock)
+            super().save_snapshot(path)
+
+    # ----------------------------------------------------------
+    # Override
+    def get_courses(self):
+        with self.catalog_lock.read_lock:
+            return super().get_courses()
+
+    def create_course(self, course_name):
+        with self.catalog_lock.write_lock:
+            return super().create_course(course_name)
+
+    def delete_course(self, course_id):
+        with self.catalog_lock.write_lock, self.course_lock(course_id, True), self.student_lock:
+            deleted = super().delete_course(course_id)
+        if deleted:
+            self.course_locks.pop(course_id, None)
+        return deleted
+
+    def create_assignment(self, course_id, assignment_name):
+        with self.course_lock(course_id, True):
+            return super().create_assignment(course_id, assignment_name)
+
+    def enroll_student(self, course_id, student_id):
+        with self.course_lock(course_id, True), self.student_lock:
+            return super().enroll_student(course_id, student_id)
+
+    def enroll_students_bulk(self, course_id, student_ids):
+        with self.course_lock(course_id, True), self.student_lock:
+            return super().enroll_students_bulk(course_id, student_ids)
+
+    def dropout_student(self, course_id, student_id):
+        with self.course_lock(course_id, True), self.student_lock:
+            return super().dropout_student(course_id, student_id)
+
+    def submit_assignment(self, course_id, student_id, assignment_id, grade):
+        with self.course_lock(course_id, True):
+            return super().submit_assignment(course_id, student_id, assignment_id, grade)
+
+    # Takes the write locks of all the courses of the records, always in the same order to avoid deadlocks
+    def submit_assignments_bulk(self, records):
+        records = list(records)
+        locks = {}
+        for record in records:
+            try:
+                lock = self.course_locks.get(record[0])
+            except (TypeError, IndexError, KeyError):
+                continue # malformed record, rejected by the bulk
+            if lock is not None:
+                locks[id(lock)] = lock
+        with contextlib.ExitStack() as stack:
+            for key in sorted(locks):
+                stack.enter_context(locks[key].write_lock)
+            return super().submit_assignments_bulk(records)
+
+    def get_assignment_grade_avg(self, course_id, assignment_id):
+        with self.course_lock(course_id, False):
+            return super().get_assignment_grade_avg(course_id, assignment_id)
+
+    def get_student_grade_avg(self, course_id, student_id):
+        with self.course_lock(course_id, False):
+            return super().get_student_grade_avg(course_id, student_id)
+
+    # get_top_five_students calls get_top_k_students, the lock is taken once
+    def get_top_k_students(self, course_id, k):
+        with self.course_lock(course_id, False):
+            return super().get_top_k_students(course_id, k)
+
+    def get_student_rank(self, course_id, student_id):
+        with self.course_lock(course_id, False):
+            return super().get_student_rank(course_id, student_id)
+
+    def get_students_in_rank_range(self, course_id, lo, hi):
+        with self.course_lock(course_id, False):
+            return super().get_students_in_rank_range(course_id, lo, hi)
+
+    def get_courses_page(self, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        with self.catalog_lock.read_lock:
+            return super().get_courses_page(cursor, limit)
+
+    def get_course_students_page(self, course_id, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        with self.course_lock(course_id, False):
+            return super().get_course_students_page(course_id, cursor, limit)
+
+    def get_course_assignments_page(self, course_id, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        with self.course_lock(course_id, False):
+            return super().get_course_assignments_page(course_id, cursor, limit)
+
+    def get_student_courses_page(self, student_id, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        with self.student_lock:
+            return super().get_student_courses_page(student_id, cursor, limit)
+
+    # The courses are copied under the student lock, then each one is read under its
+    # own lock (the course lock is never taken while holding the student lock)
+    def get_student_transcript(self, student_id):
+        student = self.find_student_by_id(student_id)
+        if student is None:
+            return None
+        with self.student_lock:
+            courses = list(student.courses)
+        entries = []
+        for course in courses:
+            with self.course_lock(course.course_id, False):
+                # not dropped or deleted meanwhile
+                if student in course.students and self.storage.get_course(course.course_id) is course:
+                    entries.append(self.transcript_entry(course, student))
+        return entries
+
+    def get_assignment_grade_percentile(self, course_id, assignment_id, p):
+        with self.course_lock(course_id, False):
+            return super().get_assignment_grade_percentile(course_id, assignment_id, p)
+
+    def get_assignment_grade_median(self, course_id, assignment_id):
+        with self.course_lock(course_id, False):
+            return super().get_assignment_grade_median(course_id, assignment_id)
+
+    def get_course_grade_distribution(self, course_id):
+        with self.course_lock(course_id, False):
+            return super().get_course_grade_distribution(course_id)
@@ -1,13 +1,16 @@
-class Course:
-
-    def __init__(self, course_id, couse_name):
-        self.course_id = course_id
-        self.course_name = couse_name
-        self.assignments = [] # A course can have many Assignments
-        self.students    = [] # A course can have many Students
-
-    def add_assignment(self, assignment):
-        self.assignments.append( assignment )
-        
-    def add_students(self, student):
-        self.students.append( student )
\ No newline at end of file
+from app.ordered_set import OrderedSet
+
+class Course:
+    __slots__ = ("course_id", "course_name", "assignments", "students") # no per-instance __dict__
+
+    def __init__(self, course_id, couse_name):
+        self.course_id = course_id
+        self.course_name = couse_name
+        self.assignments = [] # A course can have many Assignments
+        self.students    = OrderedSet() # A course can have many Students (insertion ordered, O(1) membership)
+
+    def add_assignment(self, assignment):
+        self.assignments.append( assignment )
+        
+    def add_students(self, student):
+        self.students.add( student )
\ No newline at end of file
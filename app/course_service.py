@@ -1,80 +1,192 @@
-from abc import ABC, abstractmethod
-
-
-class CourseService(ABC):
-    @abstractmethod
-    def get_courses(self):
-        """
-        Returns a list of all courses.
-        """
-        pass
-
-    @abstractmethod
-    def get_course_by_id(self, course_id):
-        """
-        Returns a course by its id.
-        """
-        pass
-
-    @abstractmethod
-    def create_course(self, course_name):
-        """
-        Creates a new course.
-        """
-        pass
-
-    @abstractmethod
-    def delete_course(self, course_id):
-        """
-        Deletes a course by its id.
-        """
-        pass
-
-    @abstractmethod
-    def create_assignment(self, course_id, assignment_name):
-        """
-        Creates a new assignment for a course.
-        """
-        pass
-
-    @abstractmethod
-    def enroll_student(self, course_id, student_id):
-        """
-        Enrolls a student in a course.
-        """
-        pass
-
-    @abstractmethod
-    def dropout_student(self, course_id, student_id):
-        """
-        Drops a student from a course.
-        """
-        pass
-
-    @abstractmethod
-    def submit_assignment(self, course_id, student_id, assignment_id, grade):
-        """
-        Submits an assignment for a student. A grade of an assignment will be an integer between 0 and 100 inclusive.
-        """
-        pass
-
-    @abstractmethod
-    def get_assignment_grade_avg(self, course_id, assignment_id):
-        """
-        Returns the average grade for an assignment. Floors the result to the nearest integer.
-        """
-        pass
-
-    @abstractmethod
-    def get_student_grade_avg(self, course_id, student_id):
-        """
-        Returns the average grade for a student in a course. Floors the result to the nearest integer.
-        """
-        pass
-
-    @abstractmethod
-    def get_top_five_students(self, course_id):
-        """
-        Returns the IDs of the top 5 students in a course based on their average grades of all assignments.
-        """
-        pass
+from abc import ABC, abstractmethod
+
+from app.page import DEFAULT_PAGE_SIZE
+
+
+class CourseService(ABC):
+    @abstractmethod
+    def get_courses(self):
+        """
+        Returns a list of all courses.
+        """
+        pass
+
+    @abstractmethod
+    def get_course_by_id(self, course_id):
+        """
+        Returns a course by its id.
+        """
+        pass
+
+    @abstractmethod
+    def create_course(self, course_name):
+        """
+        Creates a new course.
+        """
+        pass
+
+    @abstractmethod
+    def delete_course(self, course_id):
+        """
+        Deletes a course by its id.
+        """
+        pass
+
+    @abstractmethod
+    def create_assignment(self, course_id, assignment_name):
+        """
+        Creates a new assignment for a course.
+        """
+        pass
+
+    @abstractmethod
+    def enroll_student(self, course_id, student_id):
+        """
+        Enrolls a student in a course.
+        """
+        pass
+
+    @abstractmethod
+    def enroll_students_bulk(self, course_id, student_ids):
+        """
+        Enrolls many students in a course. Returns a BulkResult with the enrolled students
+        and an error for each student that could not be enrolled.
+        """
+        pass
+
+    @abstractmethod
+    def dropout_student(self, course_id, student_id):
+        """
+        Drops a student from a course.
+        """
+        pass
+
+    @abstractmethod
+    def submit_assignment(self, course_id, student_id, assignment_id, grade):
+        """
+        Submits an assignment for a student. A grade of an assignment will be an integer between 0 and 100 inclusive.
+        """
+        pass
+
+    @abstractmethod
+    def submit_assignments_bulk(self, records):
+        """
+        Submits many assignments. Each record is (course_id, student_id, assignment_id, grade).
+        Returns a BulkResult with the saved grades and an error for each rejected record.
+        """
+        pass
+
+    @abstractmethod
+    def get_assignment_grade_avg(self, course_id, assignment_id):
+        """
+        Returns the average grade for an assignment. Floors the result to the nearest integer.
+        """
+        pass
+
+    @abstractmethod
+    def get_student_grade_avg(self, course_id, student_id):
+        """
+        Returns the average grade for a student in a course. Floors the result to the nearest integer.
+        """
+        pass
+
+    @abstractmethod
+    def get_top_five_students(self, course_id):
+        """
+        Returns the IDs of the top 5 students in a course based on their average grades of all assignments.
+        """
+        pass
+
+    @abstractmethod
+    def get_top_k_students(self, course_id, k):
+        """
+        Returns the IDs of the top k students in a course based on their average grades of all assignments.
+        Students with the same average are ordered by enrollment, first enrolled first.
+        """
+        pass
+
+    @abstractmethod
+    def get_courses_page(self, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        """
+        Returns a Page of at most limit courses, in creation order, after the cursor
+        (next_cursor of the previous page, None for the first page).
+        """
+        pass
+
+    @abstractmethod
+    def get_course_students_page(self, course_id, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        """
+        Returns a Page of the students of a course, in enrollment order, or None if the course doesn't exist.
+        """
+        pass
+
+    @abstractmethod
+    def get_course_assignments_page(self, course_id, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        """
+        Returns a Page of the assignments of a course, in creation order, or None if the course doesn't exist.
+        """
+        pass
+
+    @abstractmethod
+    def get_student_courses_page(self, student_id, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        """
+        Returns a Page of the courses of a student, in enrollment order, or None if the student doesn't exist.
+        """
+        pass
+
+    @abstractmethod
+    def get_student_transcript(self, student_id):
+        """
+        Returns the transcript of a student: a list of TranscriptEntry, one for each course
+        of the student in enrollment order, or None if the student doesn't exist.
+        """
+        pass
+
+    @abstractmethod
+    def get_student_overall_avg(self, student_id):
+        """
+        Returns the average of all the grades of a student in all its courses, floored to
+        the nearest integer (0 without grades), or None if the student doesn't exist.
+        """
+        pass
+
+    @abstractmethod
+    def get_assignment_grade_percentile(self, course_id, assignment_id, p):
+        """
+        Returns the grade at percentile p (0 to 100, nearest rank) of an assignment:
+        the lowest grade such that at least p% of the grades are lower or equal.
+        Returns None if the assignment has no grades.
+        """
+        pass
+
+    @abstractmethod
+    def get_assignment_grade_median(self, course_id, assignment_id):
+        """
+        Returns the median grade of an assignment (the two middle grades averaged and
+        floored when their count is even), or None if the assignment has no grades.
+        """
+        pass
+
+    @abstractmethod
+    def get_course_grade_distribution(self, course_id):
+        """
+        Returns a list of 101 counts: the number of grades of each value from 0 to 100
+        in a course, or None if the course doesn't exist.
+        """
+        pass
+
+    @abstractmethod
+    def get_student_rank(self, course_id, student_id):
+        """
+        Returns the rank of a student in a course by average grade (1 for the best), ordered
+        as get_top_k_students, or None if the course doesn't exist or the student is not enrolled.
+        """
+        pass
+
+    @abstractmethod
+    def get_students_in_rank_range(self, course_id, lo, hi):
+        """
+        Returns the IDs of the students of a course ranked from lo to hi (both included,
+        1 for the best), ordered as get_top_k_students.
+        """
+        pass
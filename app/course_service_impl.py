@@ -1,289 +1,529 @@
-from app.course_service import CourseService
-from app.course import Course
-from app.assignment import Assignment
-from app.student import Student
-from app.grade import Grade
-
-import re # Regular Expression
-import math
-
-class CourseServiceImpl(CourseService):
-
-    def __init__(self):
-         # Save objects in memory
-        self.course_list = []
-        self.assignment_list = []
-        self.student_list = []
-        self.grade_list = []
-
-        # Unique identifier for course and assignment
-        self.serial_course_id = 0 # Course ID serial
-        self.serial_assignment_id = 0 # Assignment ID serial
-
-    # ----------------------------------------------------------
-    # helper functions for serials
-    def generate_course_id(self):
-        self.serial_course_id = self.serial_course_id+1
-        return self.serial_course_id
-    
-    def generate_assignment_id(self):
-        self.serial_assignment_id = self.serial_assignment_id+1
-        return self.serial_assignment_id
-    
-    # Helper function to find course in a list
-    # Returns the index and the course
-    def find_course_by_id(self, course_id):
-        for i in range(len(self.course_list)) :
-            if self.course_list[i].course_id == course_id:
-                return [i, self.course_list[i]] # return index and object
-        return None
-    
-    # Helper function to find assignment in a list
-    # Returns the index and the assignment
-    def find_assignment_by_id(self, assignment_id):
-        for i in range(len(self.assignment_list)) :
-            if self.assignment_list[i].assignment_id == assignment_id:
-                return [i, self.assignment_list[i]] # return index and object
-        return None
-    
-    # Helper function to find student in a list
-    # Returns the index and the student
-    def find_student_by_id(self, student_id):
-        for i in range(len(self.student_list)) :
-            if self.student_list[i].student_id == student_id:
-                return [i, self.student_list[i]] # return index and object
-        return None
-    
-    # Valiate course name or assignment name. 
-    # Cannot be None
-    # Should be a string type
-    # At least one character.
-    # Cannot exceed 100
-    # Cannot be empty
-    # Can contain only letters, numbers, :,./&_- and space
-    # Return: if name is valid, it returns the name formated, otherwise, throw an Exception
-    def validate_name(self, name):
-        if name == None:
-            raise ValueError("Name cannot be None")
-        
-        if not isinstance(name, str): # should be a string
-            raise ValueError("Name should be a valid string")
-        
-        name = name.strip() # remove left right space
-        name = " ".join(name.split()) # remove additional space betwen words
-        len_name = len(name)
-        if len_name<1 or len_name>100:
-            raise ValueError("Name should be at least one character and cannot exceed 100")
-        
-        pattern = r'^[a-zA-Z0-9:,.//&_\-\s]+$'
-        if re.fullmatch(pattern, name):
-            return name
-        else:
-             raise ValueError("Name should contains only numbers, letter and the characters : , . / & _ - ")
-
-    
-    # ----------------------------------------------------------
-    # Override
-    # Returns a list of all courses.
-    def get_courses(self):
-        return self.course_list
-
-    # Override
-    # Returns a course by its id.
-    def get_course_by_id(self, course_id):
-        result = self.find_course_by_id(course_id) # returns [index, object] or None
-        if (result is None):
-            return None
-        else:
-            return result[1]
-
-    # Override
-    # Returns a list of all courses.
-    def create_course(self, course_name):
-        course_name = self.validate_name(course_name)
-
-        course_id = self.generate_course_id()
-        course = Course(course_id, course_name)
-        # save
-        self.course_list.append(course)
-        return course
-    
-    # Override
-    # Deletes a course by its id.
-    def delete_course(self, course_id):
-        result = self.find_course_by_id(course_id) # returns [index, object] or None
-        if (result == None):
-            return False
-        else:
-            self.course_list.pop( result[0] ) # remove by index
-            return True
-
-    # ----------------------------------------------------------
-    # Override
-    # Creates a new assignment for a course.
-    def create_assignment(self, course_id, assignment_name):
-        assignment_name = self.validate_name(assignment_name)
-        
-        course = self.get_course_by_id(course_id) # find the course
-        if (course is None):
-            return None
-        else:
-            assignment_id = self.generate_assignment_id()
-            assignment = Assignment(assignment_id, assignment_name, course) # new assignment
-            self.assignment_list.append(assignment)
-
-            course.add_assignment(assignment)  # bi-directional : and assignment to the course
-            return assignment
-
-    # Override
-    # Enrolls a student in a course.
-    def enroll_student(self, course_id, student_id):
-        course = self.get_course_by_id(course_id) # find the course
-        if (course is None):
-            return None
-
-        # Check student
-        result = self.find_student_by_id( student_id )
-        student = None
-        if (result is None):
-            student = Student(student_id) # create new student
-            self.student_list.append( student ) # add to list of student
-        else:
-            student = result[1] # find_student_by_id returns [index, object] 
-
-        # Prevent duplicates
-        if student not in course.students:
-            course.add_students(student)
-        if course not in student.courses:
-            student.courses.append(course)
-
-        return student
-
-    # Override
-    # Drops a student from a course.
-    def dropout_student(self, course_id, student_id):
-        # find the course
-        course = self.get_course_by_id(course_id) 
-        if (course is None):
-            return False
-        
-        # find the student
-        result = self.find_student_by_id( student_id )
-        if (result is None):
-            return False
-        student = result[1] # find_student_by_id returns [index, object]
-
-        # Remove student from course
-        if student in course.students:
-            course.students.remove(student)
-
-        # Remove course from student
-        if course in student.courses:
-            student.courses.remove(course)
-
-        # Remove only grades related to this course and student
-        self.grade_list = [
-                g for g in self.grade_list 
-                if not (g.course == course and g.student == student)
-            ]
-        
-        return True
-
-
-    # Override
-    # Submits an assignment for a student. A grade of an assignment will be an integer between 0 and 100 inclusive.
-    def submit_assignment(self, course_id, student_id, assignment_id, grade):
-        # Validate grade
-        if not isinstance(grade, int) or grade < 0 or grade > 100:
-            raise ValueError("Grade must be an integer between 0 and 100.")
-
-        course = self.get_course_by_id(course_id)
-        if course is None:
-            return None
-
-        student_result = self.find_student_by_id(student_id)
-        if student_result is None:
-            return None
-        student = student_result[1] # find_student_by_id returns [index, object]
-
-        assignment_result = self.find_assignment_by_id(assignment_id)
-        if assignment_result is None:
-            return None
-        assignment = assignment_result[1] # find_assignment_by_id returns [index, object]
-
-        # Assignment must belong to course
-        if assignment not in course.assignments:
-            return None
-
-        # Student must be enrolled in course
-        if student not in course.students:
-            return None
-
-        # Check if assignment is already submit, if so, override it
-        existing_index = None
-        for i in range(len(self.grade_list)) :
-            g = self.grade_list[i]
-            if (g.course == course and g.assignment == assignment and g.student == student):
-                existing_index = i
-                break
-
-        # New Grade
-        grade = Grade(course, student, assignment, grade)
-        # if it already exists, just update, otherwise, add a new one
-        if (existing_index is None):
-            self.grade_list.append( grade )
-        else:
-            self.grade_list[existing_index] = grade
-        
-        return grade
-
-    # Override
-    # Returns the average grade for an assignment. Floors the result to the nearest integer.
-    def get_assignment_grade_avg(self, course_id, assignment_id):
-        grades = [
-            g.grade for g in self.grade_list
-            if g.course.course_id == course_id and g.assignment.assignment_id == assignment_id
-        ]
-
-        if not grades:
-            return 0
-
-        return math.floor(sum(grades) / len(grades))
-
-    # Override
-    # Returns the average grade for a student in a course. Floors the result to the nearest integer.
-    def get_student_grade_avg(self, course_id, student_id):
-        grades = [
-            g.grade for g in self.grade_list
-            if g.course.course_id == course_id and g.student.student_id == student_id
-        ]
-
-        if not grades:
-            return 0
-
-        return math.floor(sum(grades) / len(grades))
-
-    # Returns the IDs of the top 5 students in a course based on their average grades of all assignments.
-    def get_top_five_students(self, course_id):
-        course = self.get_course_by_id(course_id)
-        if course is None:
-            return []
-
-        student_averages = [] # example: [(student1, 85), (student2, 91), (student3, 78)]
-
-        for student in course.students:
-            avg = self.get_student_grade_avg(course_id, student.student_id)
-            student_averages.append((student.student_id, avg))
-
-        # Sort by grade
-        student_averages.sort(key=lambda x: x[1], reverse=True) # x[1] is the avg
-
-        # Get top five
-        top_five = []
-        i = 0
-        while i<5 and i<len(student_averages):
-            top_five.append( student_averages[i][0] )   # to return only student_id
-            # top_five.append( student_averages[i] ) -> # to return (student_id, avg),
-            i += 1
-
-        return top_five
\ No newline at end of file
+from app.course_service import CourseService
+from app.course import Course
+from app.assignment import Assignment
+from app.student import Student
+from app.grade import Grade
+from app.storage import DictStorage
+from app.grade_aggregates import GradeAggregates
+from app.grade_histograms import GradeHistograms, validate_percentile
+from app.leaderboard import Leaderboard
+from app.bulk_result import BulkResult
+from app import snapshot
+from app.page import Page, DEFAULT_PAGE_SIZE, validate_limit
+from app.transcript import TranscriptEntry
+
+import bisect
+import re # Regular Expression
+
+# Raises ValueError unless lo and hi are ranks with 1 <= lo <= hi
+def validate_rank_range(lo, hi):
+    for rank in (lo, hi):
+        if not isinstance(rank, int) or isinstance(rank, bool):
+            raise ValueError("lo and hi must be integers.")
+    if lo < 1 or hi < lo:
+        raise ValueError("lo and hi must be ranks with 1 <= lo <= hi.")
+
+
+# Valiate course name or assignment name. 
+# Cannot be None
+# Should be a string type
+# At least one character.
+# Cannot exceed 100
+# Cannot be empty
+# Can contain only letters, numbers, :,./&_- and space
+# Return: if name is valid, it returns the name formated, otherwise, throw an Exception
+def validate_name(name):
+    if name == None:
+        raise ValueError("Name cannot be None")
+    
+    if not isinstance(name, str): # should be a string
+        raise ValueError("Name should be a valid string")
+    
+    name = name.strip() # remove left right space
+    name = " ".join(name.split()) # remove additional space betwen words
+    len_name = len(name)
+    if len_name<1 or len_name>100:
+        raise ValueError("Name should be at least one character and cannot exceed 100")
+    
+    pattern = r'^[a-zA-Z0-9:,.//&_\-\s]+$'
+    if re.fullmatch(pattern, name):
+        return name
+    else:
+         raise ValueError("Name should contains only numbers, letter and the characters : , . / & _ - ")
+
+
+class CourseServiceImpl(CourseService):
+
+    def __init__(self, storage=None):
+        # Save objects in memory
+        # Storage engine keyed by id (see app/storage.py), DictStorage by default
+        self.storage = storage if storage is not None else DictStorage()
+
+        # Running sum and count of grades, for the average queries
+        self.assignment_totals = GradeAggregates() # (course_id, assignment_id)
+        self.student_totals = GradeAggregates()    # (course_id, student_id)
+        self.overall_totals = GradeAggregates()    # student_id, grades of all the courses
+        # Number of grades of each value, for the percentiles and distributions
+        self.assignment_histograms = GradeHistograms() # (course_id, assignment_id)
+        self.course_histograms = GradeHistograms()     # course_id
+        # Students of each course ranked by average grade
+        self.leaderboards = {} # course_id -> Leaderboard
+        # Objects notified when a grade is saved or removed (see add_grade_listener)
+        self.grade_listeners = []
+
+        # Unique identifier for course and assignment
+        self.serial_course_id = 0 # Course ID serial
+        self.serial_assignment_id = 0 # Assignment ID serial
+
+    # Lists of objects saved in the storage, in insertion order
+    @property
+    def course_list(self):
+        return list(self.storage.courses())
+
+    @property
+    def assignment_list(self):
+        return list(self.storage.assignments())
+
+    @property
+    def student_list(self):
+        return list(self.storage.students())
+
+    @property
+    def grade_list(self):
+        return list(self.storage.grades())
+
+    # Saves the state of the service (objects and serials) in a binary snapshot file
+    def save_snapshot(self, path):
+        snapshot.save_snapshot(self, path)
+
+    # Creates a service with the state saved in a snapshot file (see app/snapshot.py)
+    @classmethod
+    def load_snapshot(cls, path, storage=None):
+        return snapshot.load_snapshot(path, cls(storage))
+
+    # ----------------------------------------------------------
+    # helper functions for serials
+    def generate_course_id(self):
+        self.serial_course_id = self.serial_course_id+1
+        return self.serial_course_id
+    
+    def generate_assignment_id(self):
+        self.serial_assignment_id = self.serial_assignment_id+1
+        return self.serial_assignment_id
+    
+    # Helper function to find course by id
+    # Returns the course or None
+    def find_course_by_id(self, course_id):
+        return self.storage.get_course(course_id)
+    
+    # Helper function to find assignment by id
+    # Returns the assignment or None
+    def find_assignment_by_id(self, assignment_id):
+        return self.storage.get_assignment(assignment_id)
+    
+    # Helper function to find student by id
+    # Returns the student or None
+    def find_student_by_id(self, student_id):
+        return self.storage.get_student(student_id)
+
+    # Helper function to find a student, or create it if it doesn't exist
+    def find_or_create_student(self, student_id):
+        student = self.storage.get_student(student_id)
+        if (student is None):
+            student = Student(student_id) # create new student
+            self.storage.add_student( student ) # save the new student
+        return student
+
+    # Helper function to find the grade of a student for an assignment of a course
+    # Returns the grade or None
+    def find_grade(self, course_id, student_id, assignment_id):
+        return self.storage.get_grade(course_id, student_id, assignment_id)
+    
+    # Helper functions to keep the grade aggregates and listeners up to date
+    # Must be called for every grade saved or removed from the storage
+    def index_grade(self, grade):
+        course_id = grade.course.course_id
+        self.assignment_totals.add((course_id, grade.assignment.assignment_id), grade.grade)
+        self.student_totals.add((course_id, grade.student.student_id), grade.grade)
+        self.overall_totals.add(grade.student.student_id, grade.grade)
+        self.assignment_histograms.add((course_id, grade.assignment.assignment_id), grade.grade)
+        self.course_histograms.add(course_id, grade.grade)
+        for listener in self.grade_listeners:
+            listener.grade_added(grade)
+
+    def unindex_grade(self, grade):
+        course_id = grade.course.course_id
+        self.assignment_totals.remove((course_id, grade.assignment.assignment_id), grade.grade)
+        self.student_totals.remove((course_id, grade.student.student_id), grade.grade)
+        self.overall_totals.remove(grade.student.student_id, grade.grade)
+        self.assignment_histograms.remove((course_id, grade.assignment.assignment_id), grade.grade)
+        self.course_histograms.remove(course_id, grade.grade)
+        for listener in self.grade_listeners:
+            listener.grade_removed(grade)
+
+    # Registers an object with grade_added(grade) and grade_removed(grade) methods,
+    # called for every grade saved or removed. The grades already saved are sent to grade_added.
+    # e.g. ColumnarGradeStore (app/columnar_grade_store.py)
+    def add_grade_listener(self, listener):
+        for grade in self.storage.grades():
+            listener.grade_added(grade)
+        self.grade_listeners.append(listener)
+
+    # Helper function to move a student in the course leaderboard after its grades changed
+    def update_leaderboard(self, course_id, student_id):
+        leaderboard = self.leaderboards.get(course_id)
+        if leaderboard is not None:
+            leaderboard.update(student_id, self.student_totals.average((course_id, student_id)))
+
+    # Valiate course name or assignment name (see validate_name below)
+    def validate_name(self, name):
+        return validate_name(name)
+
+    # ----------------------------------------------------------
+    # Override
+    # Returns a list of all courses.
+    def get_courses(self):
+        return self.course_list
+
+    # Override
+    # Returns a course by its id.
+    def get_course_by_id(self, course_id):
+        return self.find_course_by_id(course_id) # returns object or None
+
+    # Override
+    # Returns a list of all courses.
+    def create_course(self, course_name):
+        course_name = self.validate_name(course_name)
+
+        course_id = self.generate_course_id()
+        course = Course(course_id, course_name)
+        # save
+        self.storage.add_course(course)
+        self.leaderboards[course_id] = Leaderboard()
+        return course
+    
+    # Override
+    # Deletes a course by its id.
+    def delete_course(self, course_id):
+        course = self.storage.remove_course(course_id) # returns the removed object or None
+        if (course is None):
+            return False
+        else:
+            self.leaderboards.pop(course_id, None)
+            # Remove the grades of the course
+            for grade in self.storage.remove_course_grades(course_id):
+                self.unindex_grade(grade)
+            # Remove the assignments of the course
+            for assignment in course.assignments:
+                self.storage.remove_assignment(assignment.assignment_id)
+            # Remove course from its students
+            for student in course.students:
+                student.courses.discard(course)
+            return True
+
+    # ----------------------------------------------------------
+    # Override
+    # Creates a new assignment for a course.
+    def create_assignment(self, course_id, assignment_name):
+        assignment_name = self.validate_name(assignment_name)
+        
+        course = self.get_course_by_id(course_id) # find the course
+        if (course is None):
+            return None
+        else:
+            assignment_id = self.generate_assignment_id()
+            assignment = Assignment(assignment_id, assignment_name, course) # new assignment
+            self.storage.add_assignment(assignment)
+
+            course.add_assignment(assignment)  # bi-directional : and assignment to the course
+            return assignment
+
+    # Override
+    # Enrolls a student in a course.
+    def enroll_student(self, course_id, student_id):
+        course = self.get_course_by_id(course_id) # find the course
+        if (course is None):
+            return None
+
+        # Check student
+        student = self.find_or_create_student( student_id )
+
+        # Prevent duplicates
+        if student not in course.students:
+            course.add_students(student)
+            self.leaderboards[course_id].add(student_id, self.student_totals.average((course_id, student_id)))
+        if course not in student.courses:
+            student.courses.add(course)
+
+        return student
+
+    # Override
+    # Enrolls many students in a course in one pass, the course is looked up once.
+    def enroll_students_bulk(self, course_id, student_ids):
+        result = BulkResult()
+        course = self.get_course_by_id(course_id) # find the course
+        leaderboard = self.leaderboards.get(course_id)
+
+        for index, student_id in enumerate(student_ids):
+            if (course is None):
+                result.add_error(index, student_id, "Course not found")
+                continue
+
+            student = self.find_or_create_student( student_id )
+
+            # Prevent duplicates
+            if student not in course.students:
+                course.add_students(student)
+                leaderboard.add(student_id, self.student_totals.average((course_id, student_id)))
+                student.courses.add(course)
+
+            result.add_result(student)
+
+        return result
+
+    # Override
+    # Drops a student from a course.
+    def dropout_student(self, course_id, student_id):
+        # find the course
+        course = self.get_course_by_id(course_id) 
+        if (course is None):
+            return False
+        
+        # find the student
+        student = self.find_student_by_id( student_id )
+        if (student is None):
+            return False
+
+        # Remove student from course
+        course.students.discard(student)
+        self.leaderboards[course_id].remove(student_id)
+
+        # Remove course from student
+        student.courses.discard(course)
+
+        # Remove only grades related to this course and student
+        for grade in self.storage.remove_student_grades(course_id, student_id):
+            self.unindex_grade(grade)
+        
+        return True
+
+
+    # Override
+    # Submits an assignment for a student. A grade of an assignment will be an integer between 0 and 100 inclusive.
+    def submit_assignment(self, course_id, student_id, assignment_id, grade):
+        # Validate grade
+        if not isinstance(grade, int) or grade < 0 or grade > 100:
+            raise ValueError("Grade must be an integer between 0 and 100.")
+
+        course = self.get_course_by_id(course_id)
+        if course is None:
+            return None
+
+        student = self.find_student_by_id(student_id)
+        if student is None:
+            return None
+
+        assignment = self.find_assignment_by_id(assignment_id)
+        if assignment is None:
+            return None
+
+        # Assignment must belong to course
+        if assignment.course is not course:
+            return None
+
+        # Student must be enrolled in course
+        if student not in course.students:
+            return None
+
+        # New Grade
+        grade = Grade(course, student, assignment, grade)
+        # if it already exists, just update (override), otherwise, add a new one
+        previous = self.storage.put_grade( grade )
+        if (previous is not None):
+            self.unindex_grade(previous)
+        self.index_grade(grade)
+        self.update_leaderboard(course_id, student_id)
+        
+        return grade
+
+    # Override
+    # Submits many assignments in one pass. Each record is (course_id, student_id, assignment_id, grade).
+    # Courses are looked up once per batch and each leaderboard is updated once per student.
+    def submit_assignments_bulk(self, records):
+        result = BulkResult()
+        courses = {} # course_id -> Course, or None if it doesn't exist
+        changed = {} # (course_id, student_id) whose average changed, in order
+        # local names for the calls made for each record
+        find_student_by_id = self.storage.get_student
+        find_assignment_by_id = self.storage.get_assignment
+        put_grade = self.storage.put_grade
+        add_result = result.results.append
+
+        for index, record in enumerate(records):
+            try:
+                course_id, student_id, assignment_id, value = record
+            except (TypeError, ValueError):
+                result.add_error(index, record, "Record should be (course_id, student_id, assignment_id, grade)")
+                continue
+
+            # Validate grade
+            if not isinstance(value, int) or value < 0 or value > 100:
+                result.add_error(index, record, "Grade must be an integer between 0 and 100.")
+                continue
+
+            if course_id in courses:
+                course = courses[course_id]
+            else:
+                course = courses[course_id] = self.get_course_by_id(course_id)
+            if course is None:
+                result.add_error(index, record, "Course not found")
+                continue
+
+            student = find_student_by_id(student_id)
+            if student is None:
+                result.add_error(index, record, "Student not found")
+                continue
+
+            assignment = find_assignment_by_id(assignment_id)
+            if assignment is None or assignment.course is not course:
+                result.add_error(index, record, "Assignment not found in course")
+                continue
+
+            # Student must be enrolled in course
+            if student not in course.students:
+                result.add_error(index, record, "Student not enrolled in course")
+                continue
+
+            grade = Grade(course, student, assignment, value)
+            previous = put_grade( grade )
+            if (previous is not None):
+                self.unindex_grade(previous)
+            self.index_grade(grade)
+            changed[(course_id, student_id)] = True
+            add_result(grade)
+
+        for course_id, student_id in changed:
+            self.update_leaderboard(course_id, student_id)
+
+        return result
+
+    # Override
+    # Returns the average grade for an assignment. Floors the result to the nearest integer.
+    def get_assignment_grade_avg(self, course_id, assignment_id):
+        return self.assignment_totals.average((course_id, assignment_id))
+
+    # Override
+    # Returns the average grade for a student in a course. Floors the result to the nearest integer.
+    def get_student_grade_avg(self, course_id, student_id):
+        return self.student_totals.average((course_id, student_id))
+
+    # Override
+    # Returns the IDs of the top 5 students in a course based on their average grades of all assignments.
+    def get_top_five_students(self, course_id):
+        return self.get_top_k_students(course_id, 5)
+
+    # Override
+    # Returns the IDs of the top k students in a course based on their average grades of all assignments.
+    # Ties are ordered by enrollment. Costs O(k), the leaderboard is kept sorted as grades change.
+    def get_top_k_students(self, course_id, k):
+        if not isinstance(k, int) or isinstance(k, bool) or k < 0:
+            raise ValueError("k must be a non-negative integer.")
+
+        leaderboard = self.leaderboards.get(course_id)
+        if leaderboard is None:
+            return []
+
+        return leaderboard.top(k)
+
+    # Override
+    # O(log n) in the leaderboard of the course
+    def get_student_rank(self, course_id, student_id):
+        leaderboard = self.leaderboards.get(course_id)
+        if leaderboard is None:
+            return None
+        return leaderboard.rank(student_id)
+
+    # Override
+    # O(log n + hi - lo)
+    def get_students_in_rank_range(self, course_id, lo, hi):
+        validate_rank_range(lo, hi)
+        leaderboard = self.leaderboards.get(course_id)
+        if leaderboard is None:
+            return []
+        return leaderboard.ranked(lo, hi)
+
+    # Helper function for a course of a transcript, from the grade buckets of the storage
+    def transcript_entry(self, course, student):
+        grades = self.storage.student_grades(course.course_id, student.student_id)
+        return TranscriptEntry(course, grades, self.student_totals.average((course.course_id, student.student_id)))
+
+    # Override
+    # Costs O(courses and grades of the student)
+    def get_student_transcript(self, student_id):
+        student = self.find_student_by_id(student_id)
+        if student is None:
+            return None
+        return [self.transcript_entry(course, student) for course in student.courses]
+
+    # Override
+    # O(1), from the running sum and count of the grades of the student
+    def get_student_overall_avg(self, student_id):
+        if self.find_student_by_id(student_id) is None:
+            return None
+        return self.overall_totals.average(student_id)
+
+    # Override
+    # O(1): at most 101 steps in the histogram of the assignment
+    def get_assignment_grade_percentile(self, course_id, assignment_id, p):
+        validate_percentile(p)
+        return self.assignment_histograms.percentile((course_id, assignment_id), p)
+
+    # Override
+    def get_assignment_grade_median(self, course_id, assignment_id):
+        return self.assignment_histograms.median((course_id, assignment_id))
+
+    # Override
+    def get_course_grade_distribution(self, course_id):
+        if self.find_course_by_id(course_id) is None:
+            return None
+        return self.course_histograms.distribution(course_id)
+
+    # ----------------------------------------------------------
+    # Pagination. Each page costs O(log n + limit); the cursors stay valid while the
+    # lists change (see OrderedSet.page)
+
+    # Override
+    # The cursor is the id of the last course of the page
+    def get_courses_page(self, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        validate_limit(limit)
+        courses, next_cursor = self.storage.courses_page(cursor, limit)
+        return Page(courses, next_cursor)
+
+    # Override
+    def get_course_students_page(self, course_id, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        validate_limit(limit)
+        course = self.find_course_by_id(course_id)
+        if course is None:
+            return None
+        return Page(*course.students.page(cursor, limit))
+
+    # Override
+    # Assignments are in creation order, so by increasing id: the cursor is the id of the last one
+    def get_course_assignments_page(self, course_id, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        validate_limit(limit)
+        course = self.find_course_by_id(course_id)
+        if course is None:
+            return None
+        assignments = course.assignments
+        start = 0 if cursor is None else bisect.bisect_right(assignments, cursor, key=lambda a: a.assignment_id)
+        items = assignments[start:start + limit]
+        next_cursor = items[-1].assignment_id if start + limit < len(assignments) else None
+        return Page(items, next_cursor)
+
+    # Override
+    def get_student_courses_page(self, student_id, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        validate_limit(limit)
+        student = self.find_student_by_id(student_id)
+        if student is None:
+            return None
+        return Page(*student.courses.page(cursor, limit))
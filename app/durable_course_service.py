@@ -0,0 +1,252 @@
+import gc
+import os
+import re
+
+from app.course_service import CourseService
+from app.course_service_impl import CourseServiceImpl
+from app import operation_log
+from app.operation_log import OperationLog, OperationLogReader
+from app.page import DEFAULT_PAGE_SIZE
+
+SNAPSHOT_FILE = "snapshot-%08d.bin"
+LOG_FILE = "log-%08d.bin"
+FILE_PATTERN = re.compile(r"^(snapshot|log)-(\d{8})\.bin$")
+
+
+class DurableCourseService(CourseService):
+    """
+    CourseServiceImpl that keeps its state in a directory: the last snapshot and the
+    operation log of the changes made after it. On start, the snapshot is loaded and the
+    log is replayed, so the service comes back with the same objects and ids.
+
+    Files are numbered by generation: snapshot-N is the state before log-N.
+    checkpoint() starts a new generation and removes the files of the previous ones.
+    """
+
+    def __init__(self, directory, batch_size=1000, flush_interval=0.05, sync=True, storage=None):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+        snapshots, logs = self.list_generations()
+        if snapshots:
+            self.generation = snapshots[-1]
+            self.service = CourseServiceImpl.load_snapshot(self.snapshot_path(self.generation), storage)
+        else:
+            self.generation = 0
+            self.service = CourseServiceImpl(storage)
+
+        # Replay the changes made after the snapshot
+        self.replayed = 0
+        for generation in logs:
+            if generation >= self.generation:
+                self.replay(self.log_path(generation))
+                self.generation = generation
+
+        self.log_options = (batch_size, flush_interval, sync)
+        self.log = OperationLog(self.log_path(self.generation), *self.log_options)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ----------------------------------------------------------
+    # Helper functions for the files of the directory
+    def snapshot_path(self, generation):
+        return os.path.join(self.directory, SNAPSHOT_FILE % generation)
+
+    def log_path(self, generation):
+        return os.path.join(self.directory, LOG_FILE % generation)
+
+    # Returns the sorted generations of the snapshots and of the logs
+    def list_generations(self):
+        snapshots = []
+        logs = []
+        for name in os.listdir(self.directory):
+            match = FILE_PATTERN.match(name)
+            if match:
+                (snapshots if match.group(1) == "snapshot" else logs).append(int(match.group(2)))
+        return sorted(snapshots), sorted(logs)
+
+    # Applies the operations of a log to the service. A frame cut by a crash is removed from the file.
+    # Consecutive grades are applied in bulk, and only the last grade of each
+    # (course, student, assignment) is applied: the earlier ones are overridden anyway.
+    def replay(self, path):
+        service = self.service
+        reader = OperationLogReader(path)
+        grades = {} # (course_id, student_id, assignment_id) -> grade, in first submission order
+
+        # The replay creates many objects and no garbage, pause the cyclic garbage collector
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for operation in reader:
+                op = operation[0]
+                if op == operation_log.SUBMIT_ASSIGNMENT:
+                    grades[(operation[1], operation[4], operation[2])] = operation[3]
+                    continue
+                if grades:
+                    self.replay_grades(grades)
+                    grades = {}
+
+                if op == operation_log.ENROLL_STUDENT:
+                    service.enroll_student(operation[1], operation[2])
+                elif op == operation_log.DROPOUT_STUDENT:
+                    service.dropout_student(operation[1], operation[2])
+                elif op == operation_log.CREATE_COURSE:
+                    course = service.create_course(operation[2])
+                    self.check_replayed_id("course", operation[1], course.course_id)
+                elif op == operation_log.DELETE_COURSE:
+                    service.delete_course(operation[1])
+                elif op == operation_log.CREATE_ASSIGNMENT:
+                    assignment = service.create_assignment(operation[1], operation[3])
+                    self.check_replayed_id("assignment", operation[2], None if assignment is None else assignment.assignment_id)
+            if grades:
+                self.replay_grades(grades)
+        finally:
+            if gc_enabled:
+                gc.enable()
+        self.replayed += reader.count
+
+        # Remove the end of a frame cut by a crash
+        if os.path.getsize(path) > reader.valid_size:
+            with open(path, "r+b") as file:
+                file.truncate(reader.valid_size)
+
+    def replay_grades(self, grades):
+        records = [(course_id, student_id, assignment_id, grade)
+                   for (course_id, student_id, assignment_id), grade in grades.items()]
+        result = self.service.submit_assignments_bulk(records)
+        if result.errors:
+            raise ValueError("Operation log does not match the snapshot: " + result.errors[0][2])
+
+    def check_replayed_id(self, kind, logged_id, replayed_id):
+        if logged_id != replayed_id:
+            raise ValueError("Operation log does not match the snapshot: %s id %s replayed as %s"
+                             % (kind, logged_id, replayed_id))
+
+    # Saves a snapshot of the current state and starts a new log, the older files are removed
+    def checkpoint(self):
+        self.log.close()
+        self.generation += 1
+        self.log = OperationLog(self.log_path(self.generation), *self.log_options)
+        self.service.save_snapshot(self.snapshot_path(self.generation))
+
+        snapshots, logs = self.list_generations()
+        for generation in snapshots:
+            if generation < self.generation:
+                os.remove(self.snapshot_path(generation))
+        for generation in logs:
+            if generation < self.generation:
+                os.remove(self.log_path(generation))
+
+    # Writes the pending operations of the log
+    def flush(self):
+        self.log.flush()
+
+    def close(self):
+        self.log.close()
+
+    # ----------------------------------------------------------
+    # Override
+    # Changes are applied to the service, and logged only when they succeed
+
+    def get_courses(self):
+        return self.service.get_courses()
+
+    def get_course_by_id(self, course_id):
+        return self.service.get_course_by_id(course_id)
+
+    def create_course(self, course_name):
+        course = self.service.create_course(course_name)
+        self.log.append(operation_log.CREATE_COURSE, course.course_id, course.course_name)
+        return course
+
+    def delete_course(self, course_id):
+        deleted = self.service.delete_course(course_id)
+        if deleted:
+            self.log.append(operation_log.DELETE_COURSE, course_id)
+        return deleted
+
+    def create_assignment(self, course_id, assignment_name):
+        assignment = self.service.create_assignment(course_id, assignment_name)
+        if assignment is not None:
+            self.log.append(operation_log.CREATE_ASSIGNMENT, course_id, assignment.assignment_id, assignment.assignment_name)
+        return assignment
+
+    def enroll_student(self, course_id, student_id):
+        student = self.service.enroll_student(course_id, student_id)
+        if student is not None:
+            self.log.append(operation_log.ENROLL_STUDENT, course_id, student_id)
+        return student
+
+    def enroll_students_bulk(self, course_id, student_ids):
+        result = self.service.enroll_students_bulk(course_id, student_ids)
+        for student in result.results:
+            self.log.append(operation_log.ENROLL_STUDENT, course_id, student.student_id)
+        return result
+
+    def dropout_student(self, course_id, student_id):
+        dropped = self.service.dropout_student(course_id, student_id)
+        if dropped:
+            self.log.append(operation_log.DROPOUT_STUDENT, course_id, student_id)
+        return dropped
+
+    def submit_assignment(self, course_id, student_id, assignment_id, grade):
+        saved = self.service.submit_assignment(course_id, student_id, assignment_id, grade)
+        if saved is not None:
+            self.log.append(operation_log.SUBMIT_ASSIGNMENT, course_id, assignment_id, grade, student_id)
+        return saved
+
+    def submit_assignments_bulk(self, records):
+        result = self.service.submit_assignments_bulk(records)
+        for grade in result.results:
+            self.log.append(operation_log.SUBMIT_ASSIGNMENT, grade.course.course_id,
+                            grade.assignment.assignment_id, grade.grade, grade.student.student_id)
+        return result
+
+    def get_assignment_grade_avg(self, course_id, assignment_id):
+        return self.service.get_assignment_grade_avg(course_id, assignment_id)
+
+    def get_student_grade_avg(self, course_id, student_id):
+        return self.service.get_student_grade_avg(course_id, student_id)
+
+    def get_top_five_students(self, course_id):
+        return self.service.get_top_five_students(course_id)
+
+    def get_top_k_students(self, course_id, k):
+        return self.service.get_top_k_students(course_id, k)
+
+    def get_student_rank(self, course_id, student_id):
+        return self.service.get_student_rank(course_id, student_id)
+
+    def get_students_in_rank_range(self, course_id, lo, hi):
+        return self.service.get_students_in_rank_range(course_id, lo, hi)
+
+    def get_courses_page(self, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        return self.service.get_courses_page(cursor, limit)
+
+    def get_course_students_page(self, course_id, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        return self.service.get_course_students_page(course_id, cursor, limit)
+
+    def get_course_assignments_page(self, course_id, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        return self.service.get_course_assignments_page(course_id, cursor, limit)
+
+    def get_student_courses_page(self, student_id, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        return self.service.get_student_courses_page(student_id, cursor, limit)
+
+    def get_student_transcript(self, student_id):
+        return self.service.get_student_transcript(student_id)
+
+    def get_student_overall_avg(self, student_id):
+        return self.service.get_student_overall_avg(student_id)
+
+    def get_assignment_grade_percentile(self, course_id, assignment_id, p):
+        return self.service.get_assignment_grade_percentile(course_id, assignment_id, p)
+
+    def get_assignment_grade_median(self, course_id, assignment_id):
+        return self.service.get_assignment_grade_median(course_id, assignment_id)
+
+    def get_course_grade_distribution(self, course_id):
+        return self.service.get_course_grade_distribution(course_id)
@@ -0,0 +1,349 @@
+import bisect
+import itertools
+from abc import ABC, abstractmethod
+from array import array
+
+REMOVED = -1 # target of a removed entry, until its list is compacted
+
+
+class Interner:
+    """
+    Dense integer keys for the ids of objects (e.g. student ids like "JO01"):
+    the first id gets 0, the next one 1, and so on. objects[key] is the object.
+    Keys are not reused, so a key kept by a view never points to another object.
+    """
+    __slots__ = ("keys", "objects")
+
+    def __init__(self):
+        self.keys = {}     # id -> key
+        self.objects = []  # key -> object, None once released
+
+    # Returns the key of an id, given to the object if the id is new
+    def intern(self, object_id, obj):
+        key = self.keys.get(object_id)
+        if key is None:
+            key = self.keys[object_id] = len(self.objects)
+            self.objects.append(obj)
+        return key
+
+    def key(self, object_id):
+        return self.keys.get(object_id)
+
+    def release(self, object_id):
+        key = self.keys.pop(object_id, None)
+        if key is not None:
+            self.objects[key] = None
+
+    def __len__(self):
+        return len(self.keys)
+
+
+class EnrollmentIndex:
+    """
+    Enrollments as compact adjacency lists in both directions, course -> students and
+    student -> courses. Courses and students get dense keys (Interner), and the list of
+    each one is an array of (target key, enrollment number) pairs, 16 bytes per entry,
+    instead of the dicts and lists of objects of OrderedSet.
+
+    - Enrollment numbers grow with each enrollment, so each list is sorted by them:
+      they are the page cursors, and a course finds a student by binary search.
+    - Membership is checked in the list of the student, short (a few courses).
+    - A removed entry leaves REMOVED as target; the list is compacted when half of it is removed.
+
+    course.students and student.courses become views of the index (attach_course, attach_student).
+    """
+
+    def __init__(self):
+        self.courses = Interner()
+        self.students = Interner()
+        self.course_lists = []     # course key -> array of pairs, None without enrollments
+        self.student_lists = []    # student key -> array of pairs, None without enrollments
+        self.course_removed = array("q")  # course key -> removed entries in its list
+        self.student_removed = array("q")
+        self.next_number = 0
+
+    # ----------------------------------------------------------
+    # Registration of the objects
+
+    # Makes course.students a view of the index, with the students the course already had
+    def attach_course(self, course):
+        key = self.courses.key(course.course_id)
+        if key is not None and isinstance(course.students, CourseStudents):
+            return key
+        key = self.courses.intern(course.course_id, course)
+        self.courses.objects[key] = course
+        while len(self.course_lists) <= key:
+            self.course_lists.append(None)
+            self.course_removed.append(0)
+        students = list(course.students)
+        course.students = CourseStudents(self, key)
+        for student in students:
+            self.enroll(key, self.attach_student(student))
+        return key
+
+    # Makes student.courses a view of the index, with the courses the student already had
+    def attach_student(self, student):
+        key = self.students.key(student.student_id)
+        if key is not None and isinstance(student.courses, StudentCourses):
+            return key
+        key = self.students.intern(student.student_id, student)
+        self.students.objects[key] = student
+        while len(self.student_lists) <= key:
+            self.student_lists.append(None)
+            self.student_removed.append(0)
+        courses = list(student.courses)
+        student.courses = StudentCourses(self, key)
+        for course in courses:
+            self.enroll(self.attach_course(course), key)
+        return key
+
+    # Removes all the enrollments of a course and releases its key
+    def detach_course(self, course):
+        key = self.courses.key(course.course_id)
+        if key is None:
+            return
+        for student_key in list(self.targets(self.course_lists[key])):
+            self.remove(key, student_key)
+        self.course_lists[key] = None
+        self.course_removed[key] = 0
+        self.courses.release(course.course_id)
+
+    # ----------------------------------------------------------
+    # Enrollments, by keys
+
+    def contains(self, course_key, student_key):
+        pairs = self.student_lists[student_key]
+        return pairs is not None and course_key in pairs[::2]
+
+    # Adds an enrollment, returns False if it already exists
+    def enroll(self, course_key, student_key):
+        if self.contains(course_key, student_key):
+            return False
+        number = self.next_number
+        self.next_number += 1
+        pairs = self.course_lists[course_key]
+        if pairs is None:
+            pairs = self.course_lists[course_key] = array("q")
+        pairs.append(student_key)
+        pairs.append(number)
+        # The list of a student is short: it is copied with its exact size, without spare capacity
+        pairs = self.student_lists[student_key]
+        entry = array("q", (course_key, number))
+        self.student_lists[student_key] = entry if pairs is None else pairs + entry
+        return True
+
+    # Removes an enrollment, returns False if it doesn't exist
+    # Costs O(courses of the student + log(students of the course))
+    def remove(self, course_key, student_key):
+        pairs = self.student_lists[student_key]
+        if pairs is None:
+            return False
+        try:
+            position = pairs[::2].index(course_key)
+        except ValueError:
+            return False
+        number = pairs[2 * position + 1]
+        self.remove_at(self.student_lists, self.student_removed, student_key, position)
+
+        pairs = self.course_lists[course_key]
+        position = bisect.bisect_left(range(len(pairs) // 2), number, key=lambda i: pairs[2 * i + 1])
+        self.remove_at(self.course_lists, self.course_removed, course_key, position)
+        return True
+
+    # Helper function to mark an entry removed, and compact the list when half of it is removed
+    def remove_at(self, lists, removed, key, position):
+        pairs = lists[key]
+        pairs[2 * position] = REMOVED
+        removed[key] += 1
+        if removed[key] * 4 > len(pairs): # more than half of the pairs
+            compacted = array("q")
+            for i in range(0, len(pairs), 2):
+                if pairs[i] != REMOVED:
+                    compacted.append(pairs[i])
+                    compacted.append(pairs[i + 1])
+            lists[key] = compacted if compacted else None
+            removed[key] = 0
+
+    # ----------------------------------------------------------
+    # Reads of a list of pairs
+
+    @staticmethod
+    def targets(pairs):
+        if pairs is None:
+            return ()
+        return (target for target in pairs[::2] if target != REMOVED)
+
+    # Returns (target keys, cursor): up to limit targets after the cursor (an enrollment number),
+    # the next cursor is None after the last one. O(log n + limit) plus the removed entries skipped.
+    @staticmethod
+    def page(pairs, cursor, limit):
+        if pairs is None:
+            return [], None
+        size = len(pairs) // 2
+        i = 0 if cursor is None else bisect.bisect_right(range(size), cursor, key=lambda j: pairs[2 * j + 1])
+        keys = []
+        last = None
+        while i < size and len(keys) < limit:
+            if pairs[2 * i] != REMOVED:
+                keys.append(pairs[2 * i])
+                last = pairs[2 * i + 1]
+            i += 1
+        while i < size and pairs[2 * i] == REMOVED:
+            i += 1
+        return keys, (last if i < size else None)
+
+
+class EnrollmentView(ABC):
+    """
+    Read-only list API of OrderedSet (iteration, len, membership, indexing, pages) over
+    one adjacency list of an EnrollmentIndex; add and discard change the enrollments.
+    The objects are looked up from their keys when read.
+    """
+    __slots__ = ("index", "key")
+
+    def __init__(self, index, key):
+        self.index = index
+        self.key = key
+
+    @abstractmethod
+    def pairs(self):
+        """
+        Returns the array of (target key, enrollment number) pairs, or None without enrollments.
+        """
+        pass
+
+    @abstractmethod
+    def removed(self):
+        """
+        Returns the number of removed entries in the pairs.
+        """
+        pass
+
+    @abstractmethod
+    def objects(self):
+        """
+        Returns the list of the target objects, by key.
+        """
+        pass
+
+    # Iterates over a copy of the keys, so the enrollments can change during the iteration
+    def __iter__(self):
+        pairs = self.pairs()
+        if pairs is None:
+            return iter(())
+        keys = pairs[::2]
+        if self.removed():
+            keys = filter(REMOVED.__ne__, keys)
+        return map(self.objects().__getitem__, keys)
+
+    def __reversed__(self):
+        return reversed(list(self))
+
+    def __len__(self):
+        pairs = self.pairs()
+        return 0 if pairs is None else len(pairs) // 2 - self.removed()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        size = len(self)
+        if index < 0:
+            index += size
+        if index < 0 or index >= size:
+            raise IndexError("index out of range")
+        pairs = self.pairs()
+        if self.removed() == 0:
+            return self.objects()[pairs[2 * index]]
+        return self.objects()[next(itertools.islice(EnrollmentIndex.targets(pairs), index, None))]
+
+    def page(self, cursor=None, limit=50):
+        keys, next_cursor = EnrollmentIndex.page(self.pairs(), cursor, limit)
+        objects = self.objects()
+        return [objects[key] for key in keys], next_cursor
+
+    def remove(self, item):
+        if not self.discard(item):
+            raise ValueError("item not in the enrollments")
+
+    def __eq__(self, other):
+        if isinstance(other, (EnrollmentView, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return type(self).__name__ + "(" + repr(list(self)) + ")"
+
+
+class CourseStudents(EnrollmentView):
+    """
+    course.students of a course attached to an EnrollmentIndex.
+    """
+    __slots__ = ()
+
+    def pairs(self):
+        return self.index.course_lists[self.key]
+
+    def removed(self):
+        return self.index.course_removed[self.key]
+
+    def objects(self):
+        return self.index.students.objects
+
+    # Looks for the course in the (short) list of the student
+    def __contains__(self, student):
+        index = self.index
+        student_key = index.students.keys.get(student.student_id)
+        if student_key is None:
+            return False
+        pairs = index.student_lists[student_key]
+        return pairs is not None and self.key in pairs[::2]
+
+    def add(self, student):
+        index = self.index
+        student_key = index.students.keys.get(student.student_id)
+        if student_key is None:
+            student_key = index.attach_student(student)
+        index.enroll(self.key, student_key)
+
+    append = add # list compatibility
+
+    def discard(self, student):
+        student_key = self.index.students.key(student.student_id)
+        return student_key is not None and self.index.remove(self.key, student_key)
+
+
+class StudentCourses(EnrollmentView):
+    """
+    student.courses of a student attached to an EnrollmentIndex.
+    """
+    __slots__ = ()
+
+    def pairs(self):
+        return self.index.student_lists[self.key]
+
+    def removed(self):
+        return self.index.student_removed[self.key]
+
+    def objects(self):
+        return self.index.courses.objects
+
+    def __contains__(self, course):
+        index = self.index
+        course_key = index.courses.keys.get(course.course_id)
+        if course_key is None:
+            return False
+        pairs = index.student_lists[self.key]
+        return pairs is not None and course_key in pairs[::2]
+
+    def add(self, course):
+        index = self.index
+        course_key = index.courses.keys.get(course.course_id)
+        if course_key is None:
+            course_key = index.attach_course(course)
+        index.enroll(course_key, self.key)
+
+    append = add # list compatibility
+
+    def discard(self, course):
+        course_key = self.index.courses.key(course.course_id)
+        return course_key is not None and self.index.remove(course_key, self.key)
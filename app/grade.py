@@ -1,7 +1,12 @@
-class Grade:
-
-    def __init__(self, course, student, assignment, grade):
-        self.course = course
-        self.student = student
-        self.assignment = assignment
-        self.grade = grade
\ No newline at end of file
+class Grade:
+    __slots__ = ("student", "assignment", "grade") # no per-instance __dict__
+
+    def __init__(self, course, student, assignment, grade):
+        # The course is not saved: the assignment belongs to a unique Course (see course property)
+        self.student = student
+        self.assignment = assignment
+        self.grade = grade
+
+    @property
+    def course(self):
+        return self.assignment.course
\ No newline at end of file
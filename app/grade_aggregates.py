@@ -0,0 +1,45 @@
+import math
+
+
+class GradeAggregates:
+    """
+    Running sum and count of grades by key, e.g. (course_id, assignment_id).
+    Averages are answered in O(1) without scanning the grades.
+    """
+
+    def __init__(self):
+        self.totals = {} # key -> [sum, count]
+
+    def add(self, key, value):
+        total = self.totals.get(key)
+        if total is None:
+            self.totals[key] = [value, 1]
+        else:
+            total[0] += value
+            total[1] += 1
+
+    def remove(self, key, value):
+        total = self.totals.get(key)
+        if total is None:
+            return
+        total[0] -= value
+        total[1] -= 1
+        if total[1] <= 0:
+            del self.totals[key] # no more grades for this key
+
+    # Returns the number of grades of a key
+    def count(self, key):
+        total = self.totals.get(key)
+        return 0 if total is None else total[1]
+
+    # Returns (sum, count) of the grades of a key
+    def total(self, key):
+        total = self.totals.get(key)
+        return (0, 0) if total is None else (total[0], total[1])
+
+    # Returns the average of a key floored to the nearest integer, 0 if there are no grades
+    def average(self, key):
+        total = self.totals.get(key)
+        if total is None:
+            return 0
+        return math.floor(total[0] / total[1])
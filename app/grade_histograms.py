@@ -0,0 +1,79 @@
+import bisect
+import itertools
+import math
+from array import array
+
+GRADE_COUNT = 101 # grades are integers from 0 to 100
+EMPTY = array("I", [0]) * GRADE_COUNT
+
+
+# Raises ValueError if p is not a number between 0 and 100
+def validate_percentile(p):
+    if not isinstance(p, (int, float)) or isinstance(p, bool) or not 0 <= p <= 100:
+        raise ValueError("p must be a number between 0 and 100.")
+
+
+# Returns the grade at percentile p (nearest rank) of a histogram holding count grades,
+# None if it is empty. The grade of a rank is found in the running sums of the 101 buckets.
+def percentile_of(counts, count, p):
+    if count == 0:
+        return None
+    rank = max(math.ceil(p * count / 100), 1)
+    return bisect.bisect_left(list(itertools.accumulate(counts)), rank)
+
+
+# Returns the median of a histogram, the average of the two middle grades floored
+# when the count is even, None if it is empty
+def median_of(counts, count):
+    if count == 0:
+        return None
+    running = list(itertools.accumulate(counts))
+    # ranks of the middle grades, the same one when the count is odd
+    return (bisect.bisect_left(running, (count + 1) // 2) + bisect.bisect_left(running, count // 2 + 1)) // 2
+
+
+class GradeHistograms:
+    """
+    Number of grades of each value (0 to 100) by key, e.g. (course_id, assignment_id).
+    Grades are bounded, so 101 buckets describe the distribution exactly: percentiles
+    and medians cost at most 101 steps, however many grades there are.
+    """
+
+    def __init__(self):
+        self.histograms = {} # key -> [array of 101 counts, count]
+
+    def add(self, key, grade):
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = [array("I", EMPTY), 0]
+        histogram[0][grade] += 1
+        histogram[1] += 1
+
+    def remove(self, key, grade):
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            return
+        histogram[0][grade] -= 1
+        histogram[1] -= 1
+        if histogram[1] <= 0:
+            del self.histograms[key] # no more grades for this key
+
+    # Returns the number of grades of a key
+    def count(self, key):
+        histogram = self.histograms.get(key)
+        return 0 if histogram is None else histogram[1]
+
+    # Returns a list of the number of grades of each value, from 0 to 100
+    def distribution(self, key):
+        histogram = self.histograms.get(key)
+        return list(EMPTY if histogram is None else histogram[0])
+
+    # Returns the grade at percentile p of a key, None without grades
+    def percentile(self, key, p):
+        histogram = self.histograms.get(key)
+        return None if histogram is None else percentile_of(histogram[0], histogram[1], p)
+
+    # Returns the median grade of a key, None without grades
+    def median(self, key):
+        histogram = self.histograms.get(key)
+        return None if histogram is None else median_of(histogram[0], histogram[1])
@@ -0,0 +1,132 @@
+import csv
+import json
+
+
+class Table:
+    """
+    Rows of an export, produced one at a time while they are written.
+    fields: names of the columns; rows: iterator of dicts {field: value}.
+    """
+
+    def __init__(self, fields, rows):
+        self.fields = fields
+        self.rows = rows
+
+    def __iter__(self):
+        return self.rows
+
+    # Writes the rows to a text file (or any object with write, e.g. socket.makefile("w")).
+    # Returns the number of rows written.
+    def write_csv(self, out):
+        writer = csv.DictWriter(out, self.fields, lineterminator="\n")
+        writer.writeheader()
+        count = 0
+        for row in self.rows:
+            writer.writerow(row)
+            count += 1
+        return count
+
+    # One JSON object per line
+    def write_jsonl(self, out):
+        count = 0
+        for row in self.rows:
+            out.write(json.dumps(row) + "\n")
+            count += 1
+        return count
+
+    def write(self, out, format="csv"):
+        if format == "csv":
+            return self.write_csv(out)
+        if format == "jsonl":
+            return self.write_jsonl(out)
+        raise ValueError("format should be csv or jsonl")
+
+
+class GradebookExporter:
+    """
+    Exports the gradebook of a course (students x assignments), its roster and the
+    transcript of a student as Tables. The rows are read from the indexes of the storage
+    while they are written, so an export costs the size of its own course or student,
+    not of all the grades, and only the list of students (or courses) is copied first,
+    so enrollments can change during an export.
+
+    Each export returns None if the course or student doesn't exist.
+    Raises TypeError for a service without a storage (e.g. SqliteCourseService, ShardedCourseService).
+    """
+
+    def __init__(self, service):
+        self.service = service
+        # The storage of the service, or of the service it wraps (e.g. DurableCourseService)
+        wrapped = service
+        while wrapped is not None and not hasattr(wrapped, "storage"):
+            wrapped = getattr(wrapped, "service", None)
+        if wrapped is None:
+            raise TypeError("GradebookExporter needs a service with a storage, not " + type(service).__name__)
+        self.storage = wrapped.storage
+
+    # A row per student of the course, a column per assignment with the grade (None if not graded)
+    def gradebook(self, course_id):
+        course = self.service.get_course_by_id(course_id)
+        if course is None:
+            return None
+        columns = self.assignment_columns(course)
+        fields = ["student_id"] + [label for assignment_id, label in columns] + ["average"]
+        return Table(fields, self.gradebook_rows(course, columns))
+
+    def gradebook_rows(self, course, columns):
+        course_id = course.course_id
+        for student in list(course.students):
+            grades = {g.assignment.assignment_id: g.grade for g in self.storage.student_grades(course_id, student.student_id)}
+            row = {"student_id": student.student_id}
+            for assignment_id, label in columns:
+                row[label] = grades.get(assignment_id)
+            row["average"] = self.service.get_student_grade_avg(course_id, student.student_id)
+            yield row
+
+    # Column label of each assignment: its name, with the id when two assignments have the same name
+    def assignment_columns(self, course):
+        names = {}
+        for assignment in course.assignments:
+            names[assignment.assignment_name] = names.get(assignment.assignment_name, 0) + 1
+        columns = []
+        for assignment in course.assignments:
+            label = assignment.assignment_name
+            if names[label] > 1 or label in ("student_id", "average"):
+                label += " #" + str(assignment.assignment_id)
+            columns.append((assignment.assignment_id, label))
+        return columns
+
+    # A row per student of the course, with the number of graded assignments and the average
+    def roster(self, course_id):
+        course = self.service.get_course_by_id(course_id)
+        if course is None:
+            return None
+        return Table(["student_id", "graded", "average"], self.roster_rows(course))
+
+    def roster_rows(self, course):
+        course_id = course.course_id
+        for student in list(course.students):
+            yield {
+                "student_id": student.student_id,
+                "graded": len(self.storage.student_grades(course_id, student.student_id)),
+                "average": self.service.get_student_grade_avg(course_id, student.student_id),
+            }
+
+    # A row per grade of the student, course by course in enrollment order
+    def transcript(self, student_id):
+        student = self.storage.get_student(student_id)
+        if student is None:
+            return None
+        fields = ["course_id", "course_name", "assignment_id", "assignment_name", "grade"]
+        return Table(fields, self.transcript_rows(student))
+
+    def transcript_rows(self, student):
+        for course in list(student.courses):
+            for grade in list(self.storage.student_grades(course.course_id, student.student_id)):
+                yield {
+                    "course_id": course.course_id,
+                    "course_name": course.course_name,
+                    "assignment_id": grade.assignment.assignment_id,
+                    "assignment_name": grade.assignment.assignment_name,
+                    "grade": grade.grade,
+                }
@@ -0,0 +1,239 @@
+import csv
+import json
+import os
+
+from app.course_service_impl import validate_name
+
+# Fields of a row, and the default column (CSV) or key (JSONL) of each
+COLUMNS = {
+    "course": "course",
+    "assignment": "assignment",
+    "student_id": "student_id",
+    "grade": "grade",
+}
+
+
+class ImportReport:
+    """
+    Progress and result of an import. Only the first max_samples rejected rows are kept;
+    all of them are written to the rejected file, if there is one.
+    """
+
+    def __init__(self, total_bytes=0, max_samples=100):
+        self.rows = 0
+        self.imported = 0
+        self.rejected = 0
+        self.created_courses = 0
+        self.created_assignments = 0
+        self.bytes_read = 0
+        self.total_bytes = total_bytes
+        self.max_samples = max_samples
+        self.samples = [] # [(line, reason)]
+
+    # Fraction of the file read, between 0 and 1
+    @property
+    def progress(self):
+        return min(1.0, self.bytes_read / self.total_bytes) if self.total_bytes else 0.0
+
+    def __repr__(self):
+        return "ImportReport(rows=%d, imported=%d, rejected=%d, created_courses=%d, created_assignments=%d)" % (
+            self.rows, self.imported, self.rejected, self.created_courses, self.created_assignments)
+
+
+class GradebookImporter:
+    """
+    Loads grades from CSV or JSONL files into a CourseService. Each row has a course name,
+    an assignment name, a student id and a grade. Courses and assignments are found by
+    name, or created if create is True, and the students are enrolled in their courses.
+
+    The file is read as a stream: rows go through a pipeline of generators and are loaded
+    batch_size at a time with the bulk calls, so the memory used doesn't depend on the size
+    of the file. Rejected rows are counted, with the reason, and written to rejected_path.
+    progress(report) is called after each batch.
+    """
+
+    def __init__(self, service, batch_size=10000, create=True, progress=None, rejected_path=None, columns=None):
+        if not isinstance(batch_size, int) or batch_size < 1:
+            raise ValueError("batch_size must be a positive integer.")
+        self.service = service
+        self.batch_size = batch_size
+        self.create = create
+        self.progress = progress
+        self.rejected_path = rejected_path
+        self.columns = dict(COLUMNS, **(columns or {}))
+        # Found or created by this importer
+        self.course_ids = None # course name -> course_id, loaded on the first import
+        self.assignment_ids = {} # (course_id, assignment name) -> assignment_id
+        self.rejected_writer = None
+
+    # Imports a file; format is "csv" or "jsonl", by default given by the extension
+    def import_file(self, path, format=None):
+        if format is None:
+            format = "csv" if path.lower().endswith(".csv") else "jsonl"
+        if format not in ("csv", "jsonl"):
+            raise ValueError("format should be csv or jsonl")
+
+        report = ImportReport(os.path.getsize(path))
+        rejected_file = None
+        if self.rejected_path is not None:
+            rejected_file = open(self.rejected_path, "w", newline="", encoding="utf-8")
+            self.rejected_writer = csv.writer(rejected_file)
+            self.rejected_writer.writerow(["line", "reason", "row"])
+        try:
+            with open(path, newline="", encoding="utf-8") as f:
+                lines = self.count_bytes(f, report)
+                rows = self.read_csv(lines) if format == "csv" else self.read_jsonl(lines)
+                self.import_rows(rows, report)
+        finally:
+            if rejected_file is not None:
+                rejected_file.close()
+                self.rejected_writer = None
+        return report
+
+    # Imports rows given as (line number, {column: value})
+    def import_rows(self, rows, report=None):
+        report = report if report is not None else ImportReport()
+        if self.course_ids is None:
+            self.load_names()
+        for batch in self.batches(self.parse(rows, report)):
+            self.load_batch(batch, report)
+            if self.progress is not None:
+                self.progress(report)
+        return report
+
+    # ----------------------------------------------------------
+    # Pipeline
+
+    # Counts the characters read (the bytes, for ASCII files) for the progress
+    def count_bytes(self, lines, report):
+        for line in lines:
+            report.bytes_read += len(line)
+            yield line
+
+    def read_csv(self, lines):
+        reader = csv.DictReader(lines)
+        for row in reader:
+            yield reader.line_num, row
+
+    # A line that is not a JSON object is yielded as None, and rejected by parse
+    def read_jsonl(self, lines):
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield number, row if isinstance(row, dict) else None
+
+    # Yields (line, course name, assignment name, student_id, grade) of the valid rows
+    def parse(self, rows, report):
+        for line, row in rows:
+            report.rows += 1
+            if row is None:
+                self.reject(report, line, row, "Row is not a JSON object")
+                continue
+            try:
+                yield (line,) + self.parse_row(row)
+            except ValueError as error:
+                self.reject(report, line, row, str(error))
+
+    def parse_row(self, row):
+        values = []
+        for field, column in self.columns.items():
+            if row.get(column) is None:
+                raise ValueError("Missing " + column)
+            values.append(row[column])
+        course_name, assignment_name, student_id, grade = values
+
+        course_name = validate_name(course_name)
+        assignment_name = validate_name(assignment_name)
+        student_id = str(student_id).strip()
+        if not student_id:
+            raise ValueError("Missing " + self.columns["student_id"])
+        return course_name, assignment_name, student_id, self.parse_grade(grade)
+
+    # Grades are integers between 0 and 100 inclusive, in CSV they are text
+    def parse_grade(self, grade):
+        if isinstance(grade, str):
+            try:
+                grade = int(grade.strip())
+            except ValueError:
+                raise ValueError("Grade must be an integer between 0 and 100.")
+        if isinstance(grade, bool) or not isinstance(grade, int) or grade < 0 or grade > 100:
+            raise ValueError("Grade must be an integer between 0 and 100.")
+        return grade
+
+    def batches(self, items):
+        batch = []
+        for item in items:
+            batch.append(item)
+            if len(batch) == self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    # ----------------------------------------------------------
+    # Loading
+
+    # Names of the courses and assignments already in the service
+    def load_names(self):
+        self.course_ids = {}
+        for course in self.service.get_courses():
+            self.course_ids.setdefault(course.course_name, course.course_id)
+            for assignment in course.assignments:
+                self.assignment_ids.setdefault((course.course_id, assignment.assignment_name), assignment.assignment_id)
+
+    def find_course(self, course_name, report):
+        course_id = self.course_ids.get(course_name)
+        if course_id is None:
+            if not self.create:
+                raise ValueError("Course not found")
+            course_id = self.course_ids[course_name] = self.service.create_course(course_name).course_id
+            report.created_courses += 1
+        return course_id
+
+    def find_assignment(self, course_id, assignment_name, report):
+        assignment_id = self.assignment_ids.get((course_id, assignment_name))
+        if assignment_id is None:
+            if not self.create:
+                raise ValueError("Assignment not found in course")
+            assignment = self.service.create_assignment(course_id, assignment_name)
+            if assignment is None:
+                raise ValueError("Course not found")
+            assignment_id = self.assignment_ids[(course_id, assignment_name)] = assignment.assignment_id
+            report.created_assignments += 1
+        return assignment_id
+
+    # Finds or creates the courses and assignments of the batch, enrolls the students,
+    # then submits the grades in one call
+    def load_batch(self, batch, report):
+        records = []
+        lines = []
+        rosters = {} # course_id -> {student_id: None}
+        for line, course_name, assignment_name, student_id, grade in batch:
+            try:
+                course_id = self.find_course(course_name, report)
+                assignment_id = self.find_assignment(course_id, assignment_name, report)
+            except ValueError as error:
+                self.reject(report, line, (course_name, assignment_name, student_id, grade), str(error))
+                continue
+            rosters.setdefault(course_id, {})[student_id] = None
+            records.append((course_id, student_id, assignment_id, grade))
+            lines.append(line)
+
+        for course_id, student_ids in rosters.items():
+            self.service.enroll_students_bulk(course_id, list(student_ids))
+
+        result = self.service.submit_assignments_bulk(records)
+        for index, record, message in result.errors:
+            self.reject(report, lines[index], record, message)
+        report.imported += len(records) - len(result.errors)
+
+    def reject(self, report, line, row, reason):
+        report.rejected += 1
+        if len(report.samples) < report.max_samples:
+            report.samples.append((line, reason))
+        if self.rejected_writer is not None:
+            self.rejected_writer.writerow([line, reason, json.dumps(row, default=str)])
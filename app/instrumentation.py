@@ -0,0 +1,342 @@
+import inspect
+import time
+
+from app.course_service import CourseService
+from app.page import DEFAULT_PAGE_SIZE
+
+# Methods of CourseService that are timed
+METHODS = sorted(CourseService.__abstractmethods__)
+
+# Collections of the service whose size is reported, and the storage call that lists them
+COLLECTIONS = (
+    ("course_list", "courses"),
+    ("assignment_list", "assignments"),
+    ("student_list", "students"),
+    ("grade_list", "grades"),
+)
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed (HDR-style) histogram of latencies in nanoseconds: each power of two
+    is split in 2^SUB_BITS buckets, so a bucket is at most 1/2^SUB_BITS wide relative
+    to its values (6.25% with 4 bits) and recording a value is a few integer operations.
+    """
+
+    SUB_BITS = 4
+    SUB_COUNT = 1 << SUB_BITS
+
+    def __init__(self):
+        self.counts = [0] * ((64 - self.SUB_BITS) * self.SUB_COUNT)
+        self.count = 0
+
+    # Bucket of a value: values below 2 * SUB_COUNT have their own bucket, then
+    # the bucket is given by the power of two and the next SUB_BITS bits
+    def record(self, value):
+        bits = value.bit_length()
+        if bits > self.SUB_BITS + 1:
+            shift = bits - self.SUB_BITS - 1
+            value = ((shift + 1) << self.SUB_BITS) + (value >> shift) - self.SUB_COUNT
+        self.counts[value] += 1
+        self.count += 1
+
+    # Highest value of a bucket
+    def bucket_limit(self, index):
+        if index < 2 * self.SUB_COUNT:
+            return index
+        shift = (index >> self.SUB_BITS) - 1
+        return (((index & (self.SUB_COUNT - 1)) + self.SUB_COUNT + 1) << shift) - 1
+
+    # Value under which a fraction q (0..1) of the values are, within the bucket precision
+    def percentile(self, q):
+        if self.count == 0:
+            return 0
+        rank = max(1, -(-self.count * q // 1)) # ceil, at least the first value
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return self.bucket_limit(index)
+        return self.bucket_limit(len(self.counts) - 1)
+
+    # Returns [(bucket limit, count)] of the non-empty buckets
+    def buckets(self):
+        return [(self.bucket_limit(index), count) for index, count in enumerate(self.counts) if count]
+
+
+class MethodStats:
+    """
+    Calls and errors of one method, and the latency histogram of the timed calls.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_ns = 0 # of the timed calls
+        self.histogram = LatencyHistogram()
+
+
+class Instrumentation:
+    """
+    Statistics of the calls made to a CourseService, and the size of its collections.
+    Not synchronized: with several threads, a few counts may be lost.
+    """
+
+    def __init__(self, service=None):
+        self.service = service
+        self.methods = {name: MethodStats() for name in METHODS}
+
+    def reset(self):
+        self.methods = {name: MethodStats() for name in METHODS}
+
+    # Returns {collection: size}, from the storage of the service (or of the service it wraps)
+    def collection_sizes(self):
+        service = self.service
+        while service is not None and not hasattr(service, "storage"):
+            service = getattr(service, "service", None)
+        if service is None:
+            return {}
+        return {name: len(getattr(service.storage, listing)()) for name, listing in COLLECTIONS}
+
+    # Returns the statistics as plain data (latencies in microseconds)
+    def snapshot(self):
+        methods = {}
+        for name, stats in self.methods.items():
+            histogram = stats.histogram
+            methods[name] = {
+                "calls": stats.calls,
+                "errors": stats.errors,
+                "timed": histogram.count,
+                "mean_us": stats.total_ns / histogram.count / 1000 if histogram.count else 0.0,
+                "p50_us": histogram.percentile(0.5) / 1000,
+                "p90_us": histogram.percentile(0.9) / 1000,
+                "p99_us": histogram.percentile(0.99) / 1000,
+                "max_us": histogram.percentile(1.0) / 1000,
+            }
+        return {"methods": methods, "collections": self.collection_sizes()}
+
+    # Returns the statistics in the Prometheus text format; the latencies are histograms in seconds
+    def prometheus_text(self, prefix="course_service"):
+        lines = [
+            "# HELP %s_calls_total Calls of each CourseService method." % prefix,
+            "# TYPE %s_calls_total counter" % prefix,
+        ]
+        for name, stats in self.methods.items():
+            lines.append('%s_calls_total{method="%s"} %d' % (prefix, name, stats.calls))
+        lines.append("# HELP %s_errors_total Calls that raised an exception." % prefix)
+        lines.append("# TYPE %s_errors_total counter" % prefix)
+        for name, stats in self.methods.items():
+            lines.append('%s_errors_total{method="%s"} %d' % (prefix, name, stats.errors))
+
+        lines.append("# HELP %s_latency_seconds Latency of the timed calls of each CourseService method." % prefix)
+        lines.append("# TYPE %s_latency_seconds histogram" % prefix)
+        for name, stats in self.methods.items():
+            cumulative = 0
+            for limit, count in stats.histogram.buckets():
+                cumulative += count
+                lines.append('%s_latency_seconds_bucket{method="%s",le="%.9g"} %d' % (prefix, name, limit / 1e9, cumulative))
+            lines.append('%s_latency_seconds_bucket{method="%s",le="+Inf"} %d' % (prefix, name, stats.histogram.count))
+            lines.append('%s_latency_seconds_sum{method="%s"} %.9g' % (prefix, name, stats.total_ns / 1e9))
+            lines.append('%s_latency_seconds_count{method="%s"} %d' % (prefix, name, stats.histogram.count))
+
+        lines.append("# HELP %s_collection_size Objects in each collection of the service." % prefix)
+        lines.append("# TYPE %s_collection_size gauge" % prefix)
+        for name, size in self.collection_sizes().items():
+            lines.append('%s_collection_size{collection="%s"} %d' % (prefix, name, size))
+        return "\n".join(lines) + "\n"
+
+
+# Returns function counted into stats, with one call of every sample_every timed into
+# its histogram. This runs on every call, so it avoids what costs in Python: the methods
+# with 1, 2 or 4 parameters get a wrapper with the same parameters (no *args tuple),
+# the calls not sampled only count, and LatencyHistogram.record is inlined.
+def timed(function, stats, sample_every=1):
+    histogram = stats.histogram
+    counts = histogram.counts
+    clock = time.perf_counter_ns
+    sub_bits = LatencyHistogram.SUB_BITS
+    sub_count = LatencyHistogram.SUB_COUNT
+    countdown = sample_every
+
+    def sampled(args, kwargs={}):
+        nonlocal countdown
+        countdown = sample_every
+        start = clock()
+        try:
+            return function(*args, **kwargs)
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            elapsed = clock() - start
+            stats.total_ns += elapsed
+            index = elapsed
+            bits = elapsed.bit_length()
+            if bits > sub_bits + 1:
+                shift = bits - sub_bits - 1
+                index = ((shift + 1) << sub_bits) + (elapsed >> shift) - sub_count
+            counts[index] += 1
+            histogram.count += 1
+
+    def method1(a):
+        nonlocal countdown
+        stats.calls += 1
+        countdown -= 1
+        if countdown:
+            try:
+                return function(a)
+            except Exception:
+                stats.errors += 1
+                raise
+        return sampled((a,))
+
+    def method2(a, b):
+        nonlocal countdown
+        stats.calls += 1
+        countdown -= 1
+        if countdown:
+            try:
+                return function(a, b)
+            except Exception:
+                stats.errors += 1
+                raise
+        return sampled((a, b))
+
+    def method4(a, b, c, d):
+        nonlocal countdown
+        stats.calls += 1
+        countdown -= 1
+        if countdown:
+            try:
+                return function(a, b, c, d)
+            except Exception:
+                stats.errors += 1
+                raise
+        return sampled((a, b, c, d))
+
+    def method(*args, **kwargs):
+        nonlocal countdown
+        stats.calls += 1
+        countdown -= 1
+        if countdown:
+            try:
+                return function(*args, **kwargs)
+            except Exception:
+                stats.errors += 1
+                raise
+        return sampled(args, kwargs)
+
+    parameters = inspect.signature(function).parameters.values()
+    if all(p.kind == p.POSITIONAL_OR_KEYWORD and p.default is p.empty for p in parameters):
+        method = {1: method1, 2: method2, 4: method4}.get(len(parameters), method)
+    method.__name__ = function.__name__
+    return method
+
+
+class InstrumentedCourseService(CourseService):
+    """
+    Proxy around any CourseService that records the calls of its methods in
+    self.instrumentation. Every call is counted and one of every sample_every calls is
+    timed, which keeps the overhead low on fast methods (sample_every=1 times them all).
+    Other attributes are those of the wrapped service.
+    """
+
+    def __init__(self, service, sample_every=16):
+        if not isinstance(sample_every, int) or sample_every < 1:
+            raise ValueError("sample_every must be a positive integer.")
+        self.service = service
+        self.sample_every = sample_every
+        self.instrumentation = Instrumentation(service)
+        self.time_methods()
+
+    # The timed methods are closures over the method of the service and its statistics,
+    # set on the object: there is no lookup on each call
+    def time_methods(self):
+        for name in METHODS:
+            setattr(self, name, timed(getattr(self.service, name), self.instrumentation.methods[name], self.sample_every))
+
+    # Clears the statistics
+    def reset(self):
+        self.instrumentation.reset()
+        self.time_methods()
+
+    def __getattr__(self, name):
+        return getattr(self.service, name)
+
+    # Override
+    # The methods below are replaced by the timed ones in __init__
+
+    def get_courses(self):
+        return self.service.get_courses()
+
+    def get_course_by_id(self, course_id):
+        return self.service.get_course_by_id(course_id)
+
+    def create_course(self, course_name):
+        return self.service.create_course(course_name)
+
+    def delete_course(self, course_id):
+        return self.service.delete_course(course_id)
+
+    def create_assignment(self, course_id, assignment_name):
+        return self.service.create_assignment(course_id, assignment_name)
+
+    def enroll_student(self, course_id, student_id):
+        return self.service.enroll_student(course_id, student_id)
+
+    def enroll_students_bulk(self, course_id, student_ids):
+        return self.service.enroll_students_bulk(course_id, student_ids)
+
+    def dropout_student(self, course_id, student_id):
+        return self.service.dropout_student(course_id, student_id)
+
+    def submit_assignment(self, course_id, student_id, assignment_id, grade):
+        return self.service.submit_assignment(course_id, student_id, assignment_id, grade)
+
+    def submit_assignments_bulk(self, records):
+        return self.service.submit_assignments_bulk(records)
+
+    def get_assignment_grade_avg(self, course_id, assignment_id):
+        return self.service.get_assignment_grade_avg(course_id, assignment_id)
+
+    def get_student_grade_avg(self, course_id, student_id):
+        return self.service.get_student_grade_avg(course_id, student_id)
+
+    def get_top_five_students(self, course_id):
+        return self.service.get_top_five_students(course_id)
+
+    def get_top_k_students(self, course_id, k):
+        return self.service.get_top_k_students(course_id, k)
+
+    def get_student_rank(self, course_id, student_id):
+        return self.service.get_student_rank(course_id, student_id)
+
+    def get_students_in_rank_range(self, course_id, lo, hi):
+        return self.service.get_students_in_rank_range(course_id, lo, hi)
+
+    def get_courses_page(self, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        return self.service.get_courses_page(cursor, limit)
+
+    def get_course_students_page(self, course_id, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        return self.service.get_course_students_page(course_id, cursor, limit)
+
+    def get_course_assignments_page(self, course_id, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        return self.service.get_course_assignments_page(course_id, cursor, limit)
+
+    def get_student_courses_page(self, student_id, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        return self.service.get_student_courses_page(student_id, cursor, limit)
+
+    def get_student_transcript(self, student_id):
+        return self.service.get_student_transcript(student_id)
+
+    def get_student_overall_avg(self, student_id):
+        return self.service.get_student_overall_avg(student_id)
+
+    def get_assignment_grade_percentile(self, course_id, assignment_id, p):
+        return self.service.get_assignment_grade_percentile(course_id, assignment_id, p)
+
+    def get_assignment_grade_median(self, course_id, assignment_id):
+        return self.service.get_assignment_grade_median(course_id, assignment_id)
+
+    def get_course_grade_distribution(self, course_id):
+        return self.service.get_course_grade_distribution(course_id)
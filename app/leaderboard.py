@@ -0,0 +1,74 @@
+from app.ranked_list import RankedList
+
+
+class Leaderboard:
+    """
+    Students of a course ranked by their average grade, kept sorted as grades change.
+    Ties are ordered by enrollment: the student enrolled first comes first.
+    The ranking is a RankedList, so the rank of a student is found in O(log n).
+    """
+
+    def __init__(self):
+        self.ranking = RankedList() # sorted (-average, enrollment_seq, student_id)
+        self.entries = {}    # student_id -> its entry in ranking
+        self.next_seq = 0    # enrollment sequence, used to break ties
+
+    def __len__(self):
+        return len(self.ranking)
+
+    def __contains__(self, student_id):
+        return student_id in self.entries
+
+    # Adds an enrolled student with an average
+    def add(self, student_id, average=0):
+        if student_id in self.entries:
+            return
+        entry = (-average, self.next_seq, student_id)
+        self.next_seq += 1
+        self.entries[student_id] = entry
+        self.ranking.add(entry)
+
+    # Adds many (student_id, average) in enrollment order, sorting the leaderboard once
+    def extend(self, students):
+        added = []
+        for student_id, average in students:
+            if student_id in self.entries:
+                continue
+            entry = (-average, self.next_seq, student_id)
+            self.next_seq += 1
+            self.entries[student_id] = entry
+            added.append(entry)
+        self.ranking.extend(added)
+
+    # Removes a student, returns False if the student is not in the leaderboard
+    def remove(self, student_id):
+        entry = self.entries.pop(student_id, None)
+        if entry is None:
+            return False
+        self.ranking.remove(entry)
+        return True
+
+    # Changes the average of a student, the student keeps its enrollment sequence
+    def update(self, student_id, average):
+        entry = self.entries.get(student_id)
+        if entry is None or entry[0] == -average:
+            return
+        self.ranking.remove(entry)
+        entry = (-average, entry[1], student_id)
+        self.entries[student_id] = entry
+        self.ranking.add(entry)
+
+    # Returns the IDs of the k first students
+    def top(self, k):
+        return [entry[2] for entry in self.ranking.range(0, k)]
+
+    # Returns the rank of a student (1 for the first), None if the student is not in the leaderboard
+    def rank(self, student_id):
+        entry = self.entries.get(student_id)
+        if entry is None:
+            return None
+        return self.ranking.index(entry) + 1
+
+    # Returns the IDs of the students ranked from lo to hi (included, 1 for the first)
+    def ranked(self, lo, hi):
+        return [entry[2] for entry in self.ranking.range(lo - 1, hi)]
@@ -0,0 +1,206 @@
+import os
+import struct
+import threading
+import zlib
+
+# Append-only log of the operations that changed a CourseService.
+# Operations are written in frames, one frame per group commit:
+#   frame length (u32), crc32 of the frame (u32), the records of the frame
+# A record is the operation code followed by its fields (little-endian).
+# A frame cut by a crash fails the length or crc check and ends the replay.
+
+CREATE_COURSE = 1      # course_id, course_name
+DELETE_COURSE = 2      # course_id
+CREATE_ASSIGNMENT = 3  # course_id, assignment_id, assignment_name
+ENROLL_STUDENT = 4     # course_id, student_id
+DROPOUT_STUDENT = 5    # course_id, student_id
+SUBMIT_ASSIGNMENT = 6  # course_id, assignment_id, grade, student_id
+
+FRAME_HEADER = struct.Struct("<II")
+OP = struct.Struct("<B")
+INT = struct.Struct("<q")
+INT_INT = struct.Struct("<qq")
+SUBMIT = struct.Struct("<qqB")
+LENGTH = struct.Struct("<I")
+
+TAG_STR = 0
+TAG_INT = 1
+
+
+# Helper functions to encode the fields
+def encode_string(value):
+    data = value.encode("utf-8")
+    return LENGTH.pack(len(data)) + data
+
+# Student ids can be str or int
+def encode_id(value):
+    if isinstance(value, str):
+        return OP.pack(TAG_STR) + encode_string(value)
+    if isinstance(value, int) and not isinstance(value, bool):
+        return OP.pack(TAG_INT) + INT.pack(value)
+    raise ValueError("Operation log supports only str or int ids, got " + repr(value))
+
+
+# Returns the bytes of a record
+def encode(op, *fields):
+    if op == SUBMIT_ASSIGNMENT:
+        return OP.pack(op) + SUBMIT.pack(fields[0], fields[1], fields[2]) + encode_id(fields[3])
+    if op == ENROLL_STUDENT or op == DROPOUT_STUDENT:
+        return OP.pack(op) + INT.pack(fields[0]) + encode_id(fields[1])
+    if op == CREATE_COURSE:
+        return OP.pack(op) + INT.pack(fields[0]) + encode_string(fields[1])
+    if op == DELETE_COURSE:
+        return OP.pack(op) + INT.pack(fields[0])
+    if op == CREATE_ASSIGNMENT:
+        return OP.pack(op) + INT_INT.pack(fields[0], fields[1]) + encode_string(fields[2])
+    raise ValueError("Unknown operation " + str(op))
+
+
+# Returns the bytes of a frame with the records
+def encode_frame(records):
+    data = b"".join(records)
+    return FRAME_HEADER.pack(len(data), zlib.crc32(data)) + data
+
+
+# Helper functions to decode the fields, return the value and the next position
+def decode_string(data, position):
+    (length,) = LENGTH.unpack_from(data, position)
+    position += 4
+    return data[position:position + length].decode("utf-8"), position + length
+
+def decode_id(data, position):
+    if data[position] == TAG_INT:
+        return INT.unpack_from(data, position + 1)[0], position + 9
+    return decode_string(data, position + 1)
+
+
+# Decodes the record at a position, returns [(op, fields...), next position]
+def decode(data, position):
+    op = data[position]
+    if op == SUBMIT_ASSIGNMENT:
+        course_id, assignment_id, grade = SUBMIT.unpack_from(data, position + 1)
+        student_id, position = decode_id(data, position + 18)
+        return (op, course_id, assignment_id, grade, student_id), position
+    if op == ENROLL_STUDENT or op == DROPOUT_STUDENT:
+        (course_id,) = INT.unpack_from(data, position + 1)
+        student_id, position = decode_id(data, position + 9)
+        return (op, course_id, student_id), position
+    if op == CREATE_COURSE:
+        (course_id,) = INT.unpack_from(data, position + 1)
+        name, position = decode_string(data, position + 9)
+        return (op, course_id, name), position
+    if op == DELETE_COURSE:
+        return (op, INT.unpack_from(data, position + 1)[0]), position + 9
+    if op == CREATE_ASSIGNMENT:
+        course_id, assignment_id = INT_INT.unpack_from(data, position + 1)
+        name, position = decode_string(data, position + 17)
+        return (op, course_id, assignment_id, name), position
+    raise ValueError("Unknown operation " + str(op))
+
+
+class OperationLogReader:
+    """
+    Iterates the operations of a log file, as tuples (op, fields...), one frame at a time.
+    Stops at the first incomplete or corrupted frame (a write cut by a crash);
+    valid_size is then the size of the valid part of the file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.valid_size = 0
+        self.count = 0
+
+    def __iter__(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as file:
+            while True:
+                header = file.read(FRAME_HEADER.size)
+                if len(header) < FRAME_HEADER.size:
+                    return
+                length, crc = FRAME_HEADER.unpack(header)
+                data = file.read(length)
+                if len(data) < length or zlib.crc32(data) != crc:
+                    return
+
+                operations = []
+                position = 0
+                while position < length:
+                    operation, position = decode(data, position)
+                    operations.append(operation)
+                self.valid_size += FRAME_HEADER.size + length
+                self.count += len(operations)
+                yield from operations
+
+
+class OperationLog:
+    """
+    Appends operations to a log file with group commit: records are buffered and written
+    in one frame (and fsynced) when batch_size records are waiting, when flush_interval
+    seconds have passed, or when flush() is called. Operations not flushed yet are lost on a crash.
+    """
+
+    def __init__(self, path, batch_size=1000, flush_interval=0.05, sync=True):
+        if not isinstance(batch_size, int) or batch_size < 1:
+            raise ValueError("batch_size must be a positive integer.")
+
+        self.path = path
+        self.batch_size = batch_size
+        self.sync = sync
+        self.pending = []
+        self.lock = threading.Lock()
+        self.file = open(path, "ab")
+
+        # Flushes the pending records every flush_interval seconds
+        self.closed = threading.Event()
+        self.flusher = None
+        if flush_interval:
+            self.flush_interval = flush_interval
+            self.flusher = threading.Thread(target=self.flush_periodically, name="operation-log-flush", daemon=True)
+            self.flusher.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def flush_periodically(self):
+        while not self.closed.wait(self.flush_interval):
+            self.flush()
+
+    # Adds an operation, the batch is written when it is full
+    # Raises ValueError if the log is closed
+    def append(self, op, *fields):
+        record = encode(op, *fields)
+        with self.lock:
+            if self.file.closed:
+                raise ValueError("operation log is closed")
+            self.pending.append(record)
+            if len(self.pending) >= self.batch_size:
+                self.write_pending()
+
+    # Writes the pending records
+    def flush(self):
+        with self.lock:
+            self.write_pending()
+
+    # Helper function: must be called with the lock
+    def write_pending(self):
+        if not self.pending:
+            return
+        if self.file.closed: # append rejects records once closed, so none are dropped here
+            raise ValueError("operation log is closed")
+        self.file.write(encode_frame(self.pending))
+        self.pending = []
+        self.file.flush()
+        if self.sync:
+            os.fsync(self.file.fileno())
+
+    def close(self):
+        self.closed.set()
+        if self.flusher is not None:
+            self.flusher.join()
+        with self.lock:
+            self.write_pending()
+            self.file.close()
@@ -0,0 +1,122 @@
+import bisect
+import itertools
+
+
+class Removed:
+    """
+    Place of a removed item in OrderedSet.order, until the list is compacted.
+    """
+    __slots__ = ("seq",)
+
+    def __init__(self, seq):
+        self.seq = seq
+
+
+class OrderedSet:
+    """
+    Collection of unique objects that keeps insertion order.
+    Backed by a dict, so add, remove and membership tests are O(1).
+    Supports the read operations of a list used by callers: iteration, len and indexing.
+
+    Each item gets an increasing sequence number; order lists the items by sequence
+    number, so page() finds where a page starts with a binary search (stable cursors).
+    Removed items leave a Removed in order, dropped when they are half of the list.
+    The changes are not thread-safe: callers lock (see ConcurrentCourseService).
+    """
+    __slots__ = ("items", "order", "next_seq", "removed")
+
+    def __init__(self, items=()):
+        self.items = {}  # item -> sequence number
+        self.order = []  # items and Removed, by sequence number
+        self.next_seq = 0
+        self.removed = 0
+        for item in items:
+            self.add(item)
+
+    def add(self, item):
+        if item not in self.items:
+            self.items[item] = self.next_seq
+            self.order.append(item)
+            self.next_seq += 1
+
+    append = add # list compatibility
+
+    # Removes an item, raises ValueError if it is not in the set (as list.remove)
+    def remove(self, item):
+        if item not in self.items:
+            raise ValueError("item not in OrderedSet")
+        self.discard(item)
+
+    def discard(self, item):
+        seq = self.items.get(item)
+        if seq is None:
+            return
+        self.order[self.position(seq)] = Removed(seq) # found before the item leaves items
+        del self.items[item]
+        self.removed += 1
+        if self.removed * 2 > len(self.order):
+            self.order = [x for x in self.order if type(x) is not Removed]
+            self.removed = 0
+
+    # Helper function for the binary searches in order
+    def seq_of(self, x):
+        return x.seq if type(x) is Removed else self.items[x]
+
+    # Index in order of the first entry with a sequence number >= seq
+    def position(self, seq):
+        return bisect.bisect_left(self.order, seq, key=self.seq_of)
+
+    # Returns (items, cursor): up to limit items after the cursor, the first ones if cursor is None.
+    # cursor is None after the last page. A cursor stays valid when items are added or removed.
+    # Costs O(log n + limit) (plus the removed items skipped).
+    def page(self, cursor=None, limit=50):
+        start = 0 if cursor is None else bisect.bisect_right(self.order, cursor, key=self.seq_of)
+        order = self.order
+        items = []
+        index = start
+        while index < len(order) and len(items) < limit:
+            x = order[index]
+            if type(x) is not Removed:
+                items.append(x)
+            index += 1
+        while index < len(order) and type(order[index]) is Removed:
+            index += 1
+        next_cursor = self.items[items[-1]] if items and index < len(order) else None
+        return items, next_cursor
+
+    def __contains__(self, item):
+        return item in self.items
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __reversed__(self):
+        return reversed(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    # Indexing is O(1) without removed items in order, else it walks the set (O(1) for the first and last items)
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self.items)[index]
+        size = len(self.items)
+        if index < 0:
+            index += size
+        if index < 0 or index >= size:
+            raise IndexError("OrderedSet index out of range")
+        if self.removed == 0:
+            return self.order[index]
+        if index == size - 1:
+            return next(reversed(self.items))
+        return next(itertools.islice(self.items, index, None))
+
+    def __eq__(self, other):
+        if isinstance(other, OrderedSet):
+            return list(self.items) == list(other.items)
+        if isinstance(other, list):
+            return list(self.items) == other
+        return NotImplemented
+
+    def __repr__(self):
+        return "OrderedSet(" + repr(list(self.items)) + ")"
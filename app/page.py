@@ -0,0 +1,45 @@
+DEFAULT_PAGE_SIZE = 50
+
+
+class Page:
+    """
+    One page of a listing. items is a tuple, so the page can't be used to change the
+    lists of the service. next_cursor is passed to get the next page, None on the last page.
+    """
+    __slots__ = ("items", "next_cursor")
+
+    def __init__(self, items, next_cursor):
+        self.items = tuple(items)
+        self.next_cursor = next_cursor
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+    def __repr__(self):
+        return "Page(" + repr(list(self.items)) + ", next_cursor=" + repr(self.next_cursor) + ")"
+
+
+# Raises ValueError if limit is not a positive integer
+def validate_limit(limit):
+    if not isinstance(limit, int) or isinstance(limit, bool) or limit < 1:
+        raise ValueError("limit must be a positive integer.")
+
+
+# Iterates over all the items of a paginated listing, one page at a time.
+# e.g. for student in iterate_pages(service.get_course_students_page, course_id): ...
+def iterate_pages(get_page, *args, limit=DEFAULT_PAGE_SIZE):
+    cursor = None
+    while True:
+        page = get_page(*args, cursor=cursor, limit=limit)
+        if page is None:
+            return
+        yield from page.items
+        if page.next_cursor is None:
+            return
+        cursor = page.next_cursor
@@ -0,0 +1,157 @@
+import bisect
+import itertools
+
+
+class RankedList:
+    """
+    Sorted list with fast positions (an order-statistic structure).
+    Items are kept in sorted blocks of at most 2 * LOAD items, and a Fenwick tree
+    over the block sizes gives the number of items before each block.
+    add and remove cost O(log n + LOAD), index (position of an item) and
+    locating a position O(log n), a range of positions O(log n + its length).
+    """
+    __slots__ = ("blocks", "maxes", "tree", "size")
+
+    LOAD = 512
+
+    def __init__(self, items=()):
+        self.blocks = []  # sorted blocks of items
+        self.maxes = []   # last item of each block
+        self.tree = [0]   # Fenwick tree of the block sizes, 1-indexed
+        self.size = 0
+        self.rebuild(sorted(items))
+
+    # Helper function to split sorted items into blocks of LOAD items
+    def rebuild(self, items):
+        load = self.LOAD
+        self.blocks = [items[i:i + load] for i in range(0, len(items), load)]
+        self.size = len(items)
+        self.reindex()
+
+    # Helper function to rebuild maxes and the Fenwick tree after blocks were split or removed, O(blocks)
+    def reindex(self):
+        self.maxes = [block[-1] for block in self.blocks]
+        tree = [0] + [len(block) for block in self.blocks]
+        for i in range(1, len(tree)):
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self.tree = tree
+
+    # Helper functions for the Fenwick tree
+    def tree_add(self, block, delta):
+        tree = self.tree
+        i = block + 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    # Number of items in the blocks before block
+    def prefix(self, block):
+        tree = self.tree
+        total = 0
+        while block > 0:
+            total += tree[block]
+            block -= block & -block
+        return total
+
+    # Returns (block, offset) of the item at a position, 0 <= index < len(self)
+    def locate(self, index):
+        tree = self.tree
+        block = 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            next_block = block + step
+            if next_block < len(tree) and tree[next_block] <= index:
+                block = next_block
+                index -= tree[next_block]
+            step >>= 1
+        return block, index
+
+    def add(self, item):
+        blocks = self.blocks
+        if not blocks:
+            self.rebuild([item])
+            return
+        b = bisect.bisect_left(self.maxes, item)
+        if b == len(blocks):
+            b -= 1
+        block = blocks[b]
+        bisect.insort(block, item)
+        self.maxes[b] = block[-1]
+        self.size += 1
+        if len(block) > 2 * self.LOAD:
+            blocks[b:b + 1] = [block[:self.LOAD], block[self.LOAD:]]
+            self.reindex()
+        else: # tree_add(b, 1), inlined
+            tree = self.tree
+            i = b + 1
+            while i < len(tree):
+                tree[i] += 1
+                i += i & -i
+
+    # Adds many items, sorting them once
+    def extend(self, items):
+        self.rebuild(sorted(itertools.chain(self, items)))
+
+    # Removes an item, raises ValueError if it is not in the list (as list.remove)
+    def remove(self, item):
+        b, i = self.find(item)
+        block = self.blocks[b]
+        del block[i]
+        self.size -= 1
+        if block:
+            self.maxes[b] = block[-1]
+            tree = self.tree # tree_add(b, -1), inlined
+            i = b + 1
+            while i < len(tree):
+                tree[i] -= 1
+                i += i & -i
+        else:
+            del self.blocks[b]
+            self.reindex()
+
+    # Helper function to get (block, offset) of an item, raises ValueError if it is not in the list
+    def find(self, item):
+        b = bisect.bisect_left(self.maxes, item)
+        if b < len(self.blocks):
+            block = self.blocks[b]
+            i = bisect.bisect_left(block, item)
+            if i < len(block) and block[i] == item:
+                return b, i
+        raise ValueError("item not in RankedList")
+
+    # Returns the position of an item, raises ValueError if it is not in the list (as list.index)
+    def index(self, item):
+        b, i = self.find(item)
+        return self.prefix(b) + i
+
+    # Returns a list of the items from position start to stop (excluded)
+    def range(self, start, stop):
+        count = min(stop, self.size) - start
+        if count <= 0:
+            return []
+        b, i = (0, start) if start == 0 else self.locate(start)
+        blocks = self.blocks
+        items = blocks[b][i:i + count]
+        while len(items) < count:
+            b += 1
+            items.extend(blocks[b][:count - len(items)])
+        return items
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("RankedList index out of range")
+        b, i = self.locate(index)
+        return self.blocks[b][i]
+
+    def __iter__(self):
+        return itertools.chain.from_iterable(self.blocks)
+
+    def __len__(self):
+        return self.size
+
+    def __repr__(self):
+        return "RankedList(" + repr(list(self)) + ")"
@@ -0,0 +1,63 @@
+import threading
+
+
+class ReadWriteLock:
+    """
+    Lock shared by many readers or held by one writer.
+    Waiting writers block new readers, so a stream of reads cannot starve a write.
+    Not reentrant: a thread must not acquire it again while holding it.
+
+    Usage:
+        with lock.read_lock: ...
+        with lock.write_lock: ...
+    """
+
+    def __init__(self):
+        self.condition = threading.Condition(threading.Lock())
+        self.readers = 0          # threads holding the read lock
+        self.writer = False       # a thread holds the write lock
+        self.waiting_writers = 0
+        self.read_lock = LockSide(self.acquire_read, self.release_read)
+        self.write_lock = LockSide(self.acquire_write, self.release_write)
+
+    def acquire_read(self):
+        with self.condition:
+            while self.writer or self.waiting_writers:
+                self.condition.wait()
+            self.readers += 1
+
+    def release_read(self):
+        with self.condition:
+            self.readers -= 1
+            if self.readers == 0:
+                self.condition.notify_all()
+
+    def acquire_write(self):
+        with self.condition:
+            self.waiting_writers += 1
+            while self.writer or self.readers:
+                self.condition.wait()
+            self.waiting_writers -= 1
+            self.writer = True
+
+    def release_write(self):
+        with self.condition:
+            self.writer = False
+            self.condition.notify_all()
+
+
+class LockSide:
+    """
+    Context manager for the read or write side of a ReadWriteLock.
+    """
+    __slots__ = ("acquire", "release")
+
+    def __init__(self, acquire, release):
+        self.acquire = acquire
+        self.release = release
+
+    def __enter__(self):
+        self.acquire()
+
+    def __exit__(self, *exc):
+        self.release()
@@ -0,0 +1,447 @@
+import math
+import multiprocessing
+import os
+import threading
+
+from app.course_service import CourseService
+from app.course_service_impl import CourseServiceImpl
+from app.course import Course
+from app.assignment import Assignment
+from app.student import Student
+from app.grade import Grade
+from app.bulk_result import BulkResult
+from app.page import Page, DEFAULT_PAGE_SIZE, validate_limit
+from app.transcript import TranscriptEntry
+
+
+class CourseShard(CourseServiceImpl):
+    """
+    CourseServiceImpl running in a shard process. Course and assignment ids are
+    allocated by the ShardedCourseService, so they are unique across the shards.
+    """
+
+    # The serials generate course_id next (see generate_course_id)
+    def create_course_with_id(self, course_id, course_name):
+        self.serial_course_id = course_id - 1
+        return self.create_course(course_name)
+
+    def create_assignment_with_id(self, course_id, assignment_name, assignment_id):
+        self.serial_assignment_id = assignment_id - 1
+        return self.create_assignment(course_id, assignment_name)
+
+    # Deletes a course, returns the IDs of its students, or None if the course doesn't exist
+    def delete_course_students(self, course_id):
+        course = self.get_course_by_id(course_id)
+        if course is None:
+            return None
+        student_ids = [s.student_id for s in course.students]
+        self.delete_course(course_id)
+        return student_ids
+
+    # Returns (sum, count) of the grades of a student in the courses of this shard
+    def student_overall_total(self, student_id):
+        return self.overall_totals.total(student_id)
+
+
+# ----------------------------------------------------------
+# Results are sent between processes as detached copies: each object only carries
+# the ids and names of the objects it refers to, not the whole graph of the shard.
+
+def detach_course(course, members=True):
+    copy = Course(course.course_id, course.course_name)
+    if members:
+        for assignment in course.assignments:
+            copy.add_assignment(Assignment(assignment.assignment_id, assignment.assignment_name, copy))
+        for student in course.students:
+            copy.add_students(Student(student.student_id))
+    return copy
+
+def detach_student(student):
+    copy = Student(student.student_id)
+    for course in student.courses:
+        copy.courses.add(detach_course(course, False))
+    return copy
+
+# copies: the copies already made for this result, so the grades of a bulk call share them
+def detach_grade(grade, copies):
+    assignment = copies.get(grade.assignment)
+    if assignment is None:
+        course = detach_course(grade.course, False)
+        assignment = copies[grade.assignment] = Assignment(grade.assignment.assignment_id, grade.assignment.assignment_name, course)
+    student = copies.get(grade.student)
+    if student is None:
+        student = copies[grade.student] = Student(grade.student.student_id)
+    return Grade(assignment.course, student, assignment, grade.grade)
+
+def detach(value, copies=None):
+    if isinstance(value, Course):
+        return detach_course(value)
+    if isinstance(value, Student):
+        return detach_student(value)
+    if isinstance(value, Assignment):
+        return Assignment(value.assignment_id, value.assignment_name, detach_course(value.course, False))
+    if isinstance(value, Grade):
+        return detach_grade(value, copies if copies is not None else {})
+    if isinstance(value, BulkResult):
+        copy = BulkResult()
+        copies = {}
+        copy.results = [detach(result, copies) for result in value.results]
+        copy.errors = value.errors
+        return copy
+    if isinstance(value, list):
+        return [detach(item, copies) for item in value]
+    if isinstance(value, TranscriptEntry):
+        copies = copies if copies is not None else {}
+        course = detach_course(value.course, False)
+        return TranscriptEntry(course, [detach_grade(g, copies) for g in value.grades], value.average)
+    if isinstance(value, Page):
+        return Page(detach(list(value.items)), value.next_cursor)
+    return value
+
+
+# Main loop of a shard process: runs the calls received on the connection
+def run_shard(connection):
+    shard = CourseShard()
+    while True:
+        try:
+            message = connection.recv()
+        except EOFError:
+            break
+        if message is None: # stop
+            break
+        method, args = message
+        try:
+            connection.send((True, detach(getattr(shard, method)(*args))))
+        except Exception as error:
+            connection.send((False, error))
+    connection.close()
+
+
+class ShardedCourseService(CourseService):
+    """
+    CourseService split across worker processes by course_id, so courses are served
+    by several cores. Each shard is a CourseServiceImpl holding whole courses (their
+    assignments, enrollments and grades); calls about a course go to its shard.
+
+    - Course and assignment ids are allocated here, so they are unique and sequential.
+    - A student enrolled in courses of several shards exists in each of them;
+      the courses of each student are tracked here, so returned students list all of them.
+    - Returned objects are detached copies (see detach).
+    - Bulk calls are split by shard and the shards run their part at the same time.
+    """
+
+    validate_name = CourseServiceImpl.validate_name
+
+    def __init__(self, shards=None, context=None):
+        shards = shards if shards is not None else os.cpu_count() or 1
+        if not isinstance(shards, int) or shards < 1:
+            raise ValueError("shards must be a positive integer.")
+
+        context = context if context is not None else multiprocessing.get_context()
+        self.connections = []
+        self.processes = []
+        self.locks = [] # one call at a time on each connection
+        for i in range(shards):
+            parent, child = context.Pipe()
+            process = context.Process(target=run_shard, args=(child,), name="course-shard-" + str(i), daemon=True)
+            process.start()
+            child.close()
+            self.connections.append(parent)
+            self.processes.append(process)
+            self.locks.append(threading.Lock())
+
+        self.serial_course_id = 0
+        self.serial_assignment_id = 0
+        self.serial_lock = threading.Lock()
+        self.course_names = {}    # course_id -> course_name, of the existing courses (directory_lock)
+        self.student_courses = {} # student_id -> {course_id: enrollment number}, in enrollment order
+        self.enrollments = 0      # enrollment numbers, cursors of get_student_courses_page
+        self.directory_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Stops the shard processes
+    def close(self):
+        for i, connection in enumerate(self.connections):
+            with self.locks[i]:
+                try:
+                    connection.send(None)
+                except (OSError, ValueError): # already closed
+                    pass
+                connection.close()
+        for process in self.processes:
+            process.join()
+
+    # ----------------------------------------------------------
+    # Helper functions to call the shards
+
+    # Returns the shard of a course
+    def shard_of(self, course_id):
+        try:
+            return hash(course_id) % len(self.connections)
+        except TypeError: # unhashable id: no course has it, any shard answers
+            return 0
+
+    def call(self, shard, method, *args):
+        with self.locks[shard]:
+            self.connections[shard].send((method, args))
+            ok, value = self.connections[shard].recv()
+        if not ok:
+            raise value
+        return value
+
+    # Sends calls to several shards, then waits for all the results: the shards work at the same time
+    # calls: {shard: (method, args)}, returns {shard: result}
+    def call_shards(self, calls):
+        shards = sorted(calls)
+        for shard in shards:
+            self.locks[shard].acquire()
+        try:
+            for shard in shards:
+                method, args = calls[shard]
+                self.connections[shard].send((method, args))
+            replies = {shard: self.connections[shard].recv() for shard in shards}
+        finally:
+            for shard in shards:
+                self.locks[shard].release()
+        results = {}
+        for shard in shards:
+            ok, value = replies[shard]
+            if not ok:
+                raise value
+            results[shard] = value
+        return results
+
+    # Helper functions for the courses of the students
+    def add_enrollment(self, course_id, student_id):
+        with self.directory_lock:
+            courses = self.student_courses.setdefault(student_id, {})
+            if course_id not in courses:
+                self.enrollments += 1
+                courses[course_id] = self.enrollments
+
+    def remove_enrollment(self, course_id, student_id):
+        with self.directory_lock:
+            courses = self.student_courses.get(student_id)
+            if courses is not None:
+                courses.pop(course_id, None)
+
+    def student_exists(self, student_id):
+        with self.directory_lock:
+            return student_id in self.student_courses
+
+    # Lists all the courses of a returned student, from every shard
+    def with_all_courses(self, student):
+        student.courses = type(student.courses)()
+        with self.directory_lock:
+            courses = [(course_id, self.course_names.get(course_id))
+                       for course_id in self.student_courses.get(student.student_id, ())]
+        for course_id, course_name in courses:
+            if course_name is not None: # skips a course being deleted
+                student.courses.add(Course(course_id, course_name))
+        return student
+
+    # ----------------------------------------------------------
+    # Override
+    def get_courses(self):
+        results = self.call_shards({shard: ("get_courses", ()) for shard in range(len(self.connections))})
+        courses = [course for shard_courses in results.values() for course in shard_courses]
+        courses.sort(key=lambda c: c.course_id) # ids are sequential: creation order
+        return courses
+
+    def get_course_by_id(self, course_id):
+        return self.call(self.shard_of(course_id), "get_course_by_id", course_id)
+
+    def create_course(self, course_name):
+        course_name = self.validate_name(course_name) # the shard can't fail after this
+        with self.serial_lock: # not held during the call, so the shards create courses at the same time
+            self.serial_course_id += 1
+            course_id = self.serial_course_id
+        course = self.call(self.shard_of(course_id), "create_course_with_id", course_id, course_name)
+        with self.directory_lock:
+            self.course_names[course_id] = course.course_name
+        return course
+
+    def delete_course(self, course_id):
+        student_ids = self.call(self.shard_of(course_id), "delete_course_students", course_id)
+        if student_ids is None:
+            return False
+        for student_id in student_ids:
+            self.remove_enrollment(course_id, student_id)
+        with self.directory_lock:
+            self.course_names.pop(course_id, None)
+        return True
+
+    # The serial is used only if the course exists, as in CourseServiceImpl
+    # (a course deleted during the call leaves an unused id)
+    def create_assignment(self, course_id, assignment_name):
+        assignment_name = self.validate_name(assignment_name)
+        with self.directory_lock:
+            try:
+                exists = course_id in self.course_names
+            except TypeError: # unhashable id
+                exists = False
+        if not exists:
+            return None
+        with self.serial_lock: # not held during the call
+            self.serial_assignment_id += 1
+            assignment_id = self.serial_assignment_id
+        return self.call(self.shard_of(course_id), "create_assignment_with_id", course_id, assignment_name, assignment_id)
+
+    def enroll_student(self, course_id, student_id):
+        student = self.call(self.shard_of(course_id), "enroll_student", course_id, student_id)
+        if student is None:
+            return None
+        self.add_enrollment(course_id, student_id)
+        return self.with_all_courses(student)
+
+    def enroll_students_bulk(self, course_id, student_ids):
+        result = self.call(self.shard_of(course_id), "enroll_students_bulk", course_id, list(student_ids))
+        for student in result.results:
+            self.add_enrollment(course_id, student.student_id)
+        for student in result.results:
+            self.with_all_courses(student)
+        return result
+
+    def dropout_student(self, course_id, student_id):
+        dropped = self.call(self.shard_of(course_id), "dropout_student", course_id, student_id)
+        if dropped:
+            self.remove_enrollment(course_id, student_id)
+        return dropped
+
+    def submit_assignment(self, course_id, student_id, assignment_id, grade):
+        return self.call(self.shard_of(course_id), "submit_assignment", course_id, student_id, assignment_id, grade)
+
+    # Each shard gets its records; the errors and results are merged back in record order
+    def submit_assignments_bulk(self, records):
+        by_shard = {} # shard -> [indexes, records]
+        for index, record in enumerate(records):
+            try:
+                shard = self.shard_of(record[0])
+            except (TypeError, IndexError, KeyError): # malformed record, rejected by the shard
+                shard = 0
+            indexes, shard_records = by_shard.setdefault(shard, ([], []))
+            indexes.append(index)
+            shard_records.append(record)
+
+        results = self.call_shards({shard: ("submit_assignments_bulk", (shard_records,))
+                                    for shard, (indexes, shard_records) in by_shard.items()})
+        merged = []   # (index, grade)
+        errors = []
+        for shard, shard_result in results.items():
+            indexes = by_shard[shard][0]
+            rejected = set()
+            for local_index, record, message in shard_result.errors:
+                rejected.add(local_index)
+                if message == "Student not found" and self.student_exists(record[1]):
+                    message = "Student not enrolled in course" # the student is in another shard
+                errors.append((indexes[local_index], record, message))
+            applied = [index for local_index, index in enumerate(indexes) if local_index not in rejected]
+            merged.extend(zip(applied, shard_result.results))
+
+        result = BulkResult()
+        merged.sort(key=lambda x: x[0])
+        result.results = [grade for index, grade in merged]
+        result.errors = sorted(errors, key=lambda x: x[0])
+        return result
+
+    def get_assignment_grade_avg(self, course_id, assignment_id):
+        return self.call(self.shard_of(course_id), "get_assignment_grade_avg", course_id, assignment_id)
+
+    def get_student_grade_avg(self, course_id, student_id):
+        return self.call(self.shard_of(course_id), "get_student_grade_avg", course_id, student_id)
+
+    def get_top_five_students(self, course_id):
+        return self.call(self.shard_of(course_id), "get_top_five_students", course_id)
+
+    def get_top_k_students(self, course_id, k):
+        return self.call(self.shard_of(course_id), "get_top_k_students", course_id, k)
+
+    def get_student_rank(self, course_id, student_id):
+        return self.call(self.shard_of(course_id), "get_student_rank", course_id, student_id)
+
+    def get_students_in_rank_range(self, course_id, lo, hi):
+        return self.call(self.shard_of(course_id), "get_students_in_rank_range", course_id, lo, hi)
+
+    # The shards return their first pages after the cursor, merged by id
+    def get_courses_page(self, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        validate_limit(limit)
+        results = self.call_shards({shard: ("get_courses_page", (cursor, limit)) for shard in range(len(self.connections))})
+        courses = sorted((course for page in results.values() for course in page), key=lambda c: c.course_id)
+        more = len(courses) > limit or any(page.next_cursor is not None for page in results.values())
+        courses = courses[:limit]
+        return Page(courses, courses[-1].course_id if more else None)
+
+    def get_course_students_page(self, course_id, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        page = self.call(self.shard_of(course_id), "get_course_students_page", course_id, cursor, limit)
+        if page is not None:
+            for student in page:
+                self.with_all_courses(student)
+        return page
+
+    def get_course_assignments_page(self, course_id, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        return self.call(self.shard_of(course_id), "get_course_assignments_page", course_id, cursor, limit)
+
+    # Served from the courses of the students kept here: O(number of courses of the student)
+    def get_student_courses_page(self, student_id, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        validate_limit(limit)
+        with self.directory_lock:
+            try:
+                courses = self.student_courses.get(student_id)
+            except TypeError: # unhashable id
+                courses = None
+            if courses is None:
+                return None
+            after = [(course_id, number, self.course_names.get(course_id)) for course_id, number in courses.items()
+                     if cursor is None or number > cursor]
+        after = [entry for entry in after if entry[2] is not None] # skips a course being deleted
+        items = [Course(course_id, course_name) for course_id, number, course_name in after[:limit]]
+        return Page(items, after[limit - 1][1] if len(after) > limit else None)
+
+    # Helper function to get the shards of the courses of a student, from the directory
+    # Returns (course ids in enrollment order, {shard: [course_id]}), or None if the student doesn't exist
+    def student_shards(self, student_id):
+        with self.directory_lock:
+            try:
+                courses = self.student_courses.get(student_id)
+            except TypeError: # unhashable id
+                courses = None
+            if courses is None:
+                return None
+            course_ids = list(courses)
+        shards = {}
+        for course_id in course_ids:
+            shards.setdefault(self.shard_of(course_id), []).append(course_id)
+        return course_ids, shards
+
+    # Only the shards holding courses of the student are called; entries follow the enrollment order
+    def get_student_transcript(self, student_id):
+        found = self.student_shards(student_id)
+        if found is None:
+            return None
+        course_ids, shards = found
+        results = self.call_shards({shard: ("get_student_transcript", (student_id,)) for shard in shards})
+        entries = {entry.course.course_id: entry for shard_entries in results.values() for entry in shard_entries or ()}
+        return [entries[course_id] for course_id in course_ids if course_id in entries]
+
+    def get_student_overall_avg(self, student_id):
+        found = self.student_shards(student_id)
+        if found is None:
+            return None
+        results = self.call_shards({shard: ("student_overall_total", (student_id,)) for shard in found[1]})
+        total = sum(t for t, c in results.values())
+        count = sum(c for t, c in results.values())
+        return math.floor(total / count) if count else 0
+
+    def get_assignment_grade_percentile(self, course_id, assignment_id, p):
+        return self.call(self.shard_of(course_id), "get_assignment_grade_percentile", course_id, assignment_id, p)
+
+    def get_assignment_grade_median(self, course_id, assignment_id):
+        return self.call(self.shard_of(course_id), "get_assignment_grade_median", course_id, assignment_id)
+
+    def get_course_grade_distribution(self, course_id):
+        return self.call(self.shard_of(course_id), "get_course_grade_distribution", course_id)
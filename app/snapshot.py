@@ -0,0 +1,296 @@
+import mmap
+import os
+import struct
+
+from app.course import Course
+from app.assignment import Assignment
+from app.student import Student
+from app.grade import Grade
+from app.leaderboard import Leaderboard
+
+# Binary snapshot of a CourseServiceImpl (little-endian)
+#
+#   header           magic, version, serial_course_id, serial_assignment_id and the count of each section
+#   string tags      1 byte per string: 0 = str, 1 = int (student ids can be either)
+#   string offsets   (strings + 1) x u64, offsets of each string in the string data
+#   string data      utf-8
+#   courses          course_id, name (string index)
+#   assignments      assignment_id, course_id, name (string index)
+#   students         student_id (string index), the position is the student index
+#   course students  course_id, student index  - in an enrollment order: each course roster and
+#                                                 each student's courses are in order (see enrollment_order)
+#   student courses  student index, course_id  - each student's courses, in order
+#   grades           assignment_id, student index, grade - in grade_list order
+#
+# Records have a fixed size, so a section is read straight from the memory-mapped file
+# and each string is decoded only when it is needed.
+
+MAGIC = b"CSNP"
+VERSION = 1
+
+HEADER = struct.Struct("<4sHHqqQQQQQQQ")
+OFFSET = struct.Struct("<Q")
+COURSE = struct.Struct("<qI")
+ASSIGNMENT = struct.Struct("<qqI")
+STUDENT = struct.Struct("<I")
+COURSE_STUDENT = struct.Struct("<qI")
+STUDENT_COURSE = struct.Struct("<Iq")
+GRADE = struct.Struct("<qIB")
+
+TAG_STR = 0
+TAG_INT = 1
+
+CHUNK = 65536 # records written at once
+
+
+class SnapshotWriter:
+    """
+    Collects the strings of a snapshot and writes the sections.
+    """
+
+    def __init__(self):
+        self.tags = bytearray()
+        self.offsets = [0]
+        self.data = bytearray()
+
+    # Adds a string (or int student id) to the string table, returns its index
+    def add_string(self, value):
+        if isinstance(value, str):
+            self.tags.append(TAG_STR)
+        elif isinstance(value, int) and not isinstance(value, bool):
+            self.tags.append(TAG_INT)
+            value = str(value)
+        else:
+            raise ValueError("Snapshot supports only str or int ids, got " + repr(value))
+        self.data += value.encode("utf-8")
+        self.offsets.append(len(self.data))
+        return len(self.offsets) - 2
+
+
+# Helper function to write fixed size records in chunks
+def write_records(file, record_struct, records):
+    chunk = []
+    for record in records:
+        chunk.append(record_struct.pack(*record))
+        if len(chunk) == CHUNK:
+            file.write(b"".join(chunk))
+            chunk = []
+    file.write(b"".join(chunk))
+
+
+# Helper function to list the enrollments in one order that keeps both the order of each
+# roster and the order of the courses of each student (a merge of both orders), as they were
+# enrolled. A storage with one enrollment order for both directions (CompactStorage) gets
+# both back from it. rosters: course_id -> student indexes, student_courses: student index ->
+# course ids. Enrollments of orders that contradict each other are added at the end. O(enrollments).
+def enrollment_order(rosters, student_courses):
+    course_next = dict.fromkeys(rosters, 0)  # position of the next enrollment in each roster
+    student_next = [0] * len(student_courses)
+    # Enrollments next in both their roster and their student's courses
+    ready = [(course_id, roster[0]) for course_id, roster in rosters.items()
+             if roster and student_courses[roster[0]][:1] == [course_id]]
+    order = []
+    pop = ready.pop
+    push = ready.append
+    while ready:
+        enrollment = pop()
+        order.append(enrollment)
+        course_id, student = enrollment
+        roster = rosters[course_id]
+        i = course_next[course_id] = course_next[course_id] + 1
+        if i < len(roster):
+            other = roster[i]
+            courses = student_courses[other]
+            j = student_next[other]
+            if j < len(courses) and courses[j] == course_id:
+                push((course_id, other))
+        courses = student_courses[student]
+        j = student_next[student] = student_next[student] + 1
+        if j < len(courses):
+            other = courses[j]
+            roster = rosters.get(other, ())
+            i = course_next.get(other, 0)
+            if i < len(roster) and roster[i] == student:
+                push((other, student))
+    if len(order) < sum(len(roster) for roster in rosters.values()):
+        done = set(order)
+        order += [(course_id, student) for course_id, roster in rosters.items() for student in roster
+                  if (course_id, student) not in done]
+    return order
+
+
+# Saves the state of a CourseServiceImpl in a binary file.
+# The file is written next to the path and renamed, so a crash never leaves a partial snapshot.
+def save_snapshot(service, path):
+    storage = service.storage
+    strings = SnapshotWriter()
+
+    courses = [(c.course_id, strings.add_string(c.course_name)) for c in storage.courses()]
+    assignments = [(a.assignment_id, a.course.course_id, strings.add_string(a.assignment_name))
+                   for a in storage.assignments()]
+    student_index = {}
+    students = []
+    for student in storage.students():
+        student_index[student.student_id] = len(students)
+        students.append((strings.add_string(student.student_id),))
+    rosters = {c.course_id: [student_index[s.student_id] for s in c.students] for c in storage.courses()}
+    courses_of = [[c.course_id for c in s.courses] for s in storage.students()]
+    course_students = enrollment_order(rosters, courses_of)
+    student_courses = [(student, course_id) for student, course_ids in enumerate(courses_of) for course_id in course_ids]
+    grade_count = sum(1 for _ in storage.grades())
+
+    tmp_path = str(path) + ".tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, 0, service.serial_course_id, service.serial_assignment_id,
+                               len(strings.offsets) - 1, len(courses), len(assignments), len(students),
+                               len(course_students), len(student_courses), grade_count))
+        file.write(strings.tags)
+        write_records(file, OFFSET, ((offset,) for offset in strings.offsets))
+        file.write(strings.data)
+        write_records(file, COURSE, courses)
+        write_records(file, ASSIGNMENT, assignments)
+        write_records(file, STUDENT, students)
+        write_records(file, COURSE_STUDENT, course_students)
+        write_records(file, STUDENT_COURSE, student_courses)
+        write_records(file, GRADE, ((g.assignment.assignment_id, student_index[g.student.student_id], g.grade)
+                                    for g in storage.grades()))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+
+class SnapshotReader:
+    """
+    Reads a snapshot from a memory-mapped file. Sections are decoded only when iterated.
+    """
+
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError: # empty file
+            self.file.close()
+            raise ValueError("Invalid snapshot: empty file")
+        self.view = memoryview(self.map)
+
+        if len(self.map) < HEADER.size:
+            self.close()
+            raise ValueError("Invalid snapshot: file too short")
+        (magic, version, _, self.serial_course_id, self.serial_assignment_id,
+         self.string_count, self.course_count, self.assignment_count, self.student_count,
+         self.course_student_count, self.student_course_count, self.grade_count) = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError("Invalid snapshot: bad magic number")
+        if version != VERSION:
+            self.close()
+            raise ValueError("Unsupported snapshot version " + str(version))
+
+        # Offsets of each section
+        position = HEADER.size
+        self.tags_start = position
+        position += self.string_count
+        self.offsets_start = position
+        position += (self.string_count + 1) * OFFSET.size
+        self.data_start = position
+        if position > len(self.map): # the last offset is read below
+            self.close()
+            raise ValueError("Invalid snapshot: file truncated")
+        self.data_size = OFFSET.unpack_from(self.map, self.offsets_start + self.string_count * OFFSET.size)[0]
+        position += self.data_size
+        self.sections = {}
+        for name, record_struct, count in [("courses", COURSE, self.course_count),
+                                           ("assignments", ASSIGNMENT, self.assignment_count),
+                                           ("students", STUDENT, self.student_count),
+                                           ("course_students", COURSE_STUDENT, self.course_student_count),
+                                           ("student_courses", STUDENT_COURSE, self.student_course_count),
+                                           ("grades", GRADE, self.grade_count)]:
+            self.sections[name] = (record_struct, position, position + count * record_struct.size)
+            position += count * record_struct.size
+        if position > len(self.map):
+            self.close()
+            raise ValueError("Invalid snapshot: file truncated")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self.view is not None:
+            self.view.release()
+            self.view = None
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        self.file.close()
+
+    # Decodes a string of the string table
+    # Raises ValueError for an index or offsets out of the string table
+    def string(self, index):
+        if not 0 <= index < self.string_count:
+            raise ValueError("Invalid snapshot: string index %d out of range" % index)
+        start, end = struct.unpack_from("<QQ", self.map, self.offsets_start + index * OFFSET.size)
+        if not start <= end <= self.data_size:
+            raise ValueError("Invalid snapshot: string %d out of the string data" % index)
+        value = str(self.view[self.data_start + start:self.data_start + end], "utf-8")
+        if self.map[self.tags_start + index] == TAG_INT:
+            return int(value)
+        return value
+
+    # Iterates the records of a section, as tuples
+    def records(self, name):
+        record_struct, start, end = self.sections[name]
+        if start == end:
+            return iter(())
+        return record_struct.iter_unpack(self.view[start:end])
+
+
+# Restores a snapshot in an empty CourseServiceImpl.
+# Objects are created straight from the records, without going through the validation
+# of the public methods, and each leaderboard is sorted once at the end.
+def load_snapshot(path, service):
+    with SnapshotReader(path) as reader:
+        storage = service.storage
+        service.serial_course_id = reader.serial_course_id
+        service.serial_assignment_id = reader.serial_assignment_id
+
+        courses = {}
+        for course_id, name in reader.records("courses"):
+            course = Course(course_id, reader.string(name))
+            storage.add_course(course)
+            courses[course_id] = course
+
+        assignments = {}
+        for assignment_id, course_id, name in reader.records("assignments"):
+            course = courses[course_id]
+            assignment = Assignment(assignment_id, reader.string(name), course)
+            storage.add_assignment(assignment)
+            course.add_assignment(assignment)
+            assignments[assignment_id] = assignment
+
+        students = []
+        for (student_id,) in reader.records("students"):
+            student = Student(reader.string(student_id))
+            storage.add_student(student)
+            students.append(student)
+
+        for course_id, student in reader.records("course_students"):
+            courses[course_id].add_students(students[student])
+        for student, course_id in reader.records("student_courses"):
+            students[student].courses.add(courses[course_id])
+
+        for assignment_id, student, value in reader.records("grades"):
+            assignment = assignments[assignment_id]
+            grade = Grade(assignment.course, students[student], assignment, value)
+            storage.put_grade(grade)
+            service.index_grade(grade)
+
+    for course_id, course in courses.items():
+        leaderboard = Leaderboard()
+        leaderboard.extend(
+            (s.student_id, service.student_totals.average((course_id, s.student_id))) for s in course.students
+        )
+        service.leaderboards[course_id] = leaderboard
+    return service
@@ -0,0 +1,458 @@
+import sqlite3
+
+from app.course_service import CourseService
+from app.course_service_impl import validate_name, validate_rank_range
+from app.course import Course
+from app.assignment import Assignment
+from app.student import Student
+from app.grade import Grade
+from app.bulk_result import BulkResult
+from app.page import Page, DEFAULT_PAGE_SIZE, validate_limit
+from app.transcript import TranscriptEntry
+from app.grade_histograms import GRADE_COUNT, validate_percentile, percentile_of, median_of
+
+# Ids are never reused (AUTOINCREMENT), as with the serials of CourseServiceImpl.
+# Enrollment and grade rowids give the enrollment order (ties of the top students)
+# and the order of grade_list; a grade overridden by an upsert keeps its rowid.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS course (
+    course_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    course_name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS assignment (
+    assignment_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    course_id INTEGER NOT NULL REFERENCES course(course_id),
+    assignment_name TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS assignment_course ON assignment(course_id);
+CREATE TABLE IF NOT EXISTS student (
+    student_id PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS enrollment (
+    enrollment_id INTEGER PRIMARY KEY AUTOINCREMENT, -- page cursor of the rosters
+    course_id INTEGER NOT NULL REFERENCES course(course_id),
+    student_id NOT NULL REFERENCES student(student_id),
+    UNIQUE (course_id, student_id)
+);
+-- The rowid ends each index entry, so the rows of a course or a student are in enrollment order
+CREATE INDEX IF NOT EXISTS enrollment_course ON enrollment(course_id);
+CREATE INDEX IF NOT EXISTS enrollment_student ON enrollment(student_id);
+CREATE TABLE IF NOT EXISTS grade (
+    grade_id INTEGER PRIMARY KEY,
+    course_id INTEGER NOT NULL REFERENCES course(course_id),
+    student_id NOT NULL REFERENCES student(student_id),
+    assignment_id INTEGER NOT NULL REFERENCES assignment(assignment_id),
+    grade INTEGER NOT NULL,
+    UNIQUE (course_id, student_id, assignment_id)
+);
+-- The grade is in the indexes so the averages and the top students read only the index
+CREATE INDEX IF NOT EXISTS grade_assignment ON grade(course_id, assignment_id, grade);
+CREATE INDEX IF NOT EXISTS grade_student ON grade(course_id, student_id, grade);
+"""
+
+# Statements are constant strings, so sqlite3 prepares each one once and reuses it (statement cache)
+INSERT_COURSE = "INSERT INTO course (course_name) VALUES (?)"
+INSERT_ASSIGNMENT = "INSERT INTO assignment (course_id, assignment_name) VALUES (?, ?)"
+INSERT_STUDENT = "INSERT OR IGNORE INTO student (student_id) VALUES (?)"
+INSERT_ENROLLMENT = "INSERT OR IGNORE INTO enrollment (course_id, student_id) VALUES (?, ?)"
+UPSERT_GRADE = ("INSERT INTO grade (course_id, student_id, assignment_id, grade) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (course_id, student_id, assignment_id) DO UPDATE SET grade = excluded.grade")
+DELETE_ENROLLMENT = "DELETE FROM enrollment WHERE course_id = ? AND student_id = ?"
+DELETE_STUDENT_GRADES = "DELETE FROM grade WHERE course_id = ? AND student_id = ?"
+DELETE_COURSE_GRADES = "DELETE FROM grade WHERE course_id = ?"
+DELETE_COURSE_ENROLLMENTS = "DELETE FROM enrollment WHERE course_id = ?"
+DELETE_COURSE_ASSIGNMENTS = "DELETE FROM assignment WHERE course_id = ?"
+DELETE_COURSE = "DELETE FROM course WHERE course_id = ?"
+SELECT_GRADES = "SELECT course_id, student_id, assignment_id, grade FROM grade ORDER BY grade_id"
+SELECT_GRADE = "SELECT grade FROM grade WHERE course_id = ? AND student_id = ? AND assignment_id = ?"
+# Integer division of non-negative numbers: the floored average; NULL without grades
+ASSIGNMENT_AVG = "SELECT SUM(grade) / COUNT(*) FROM grade WHERE course_id = ? AND assignment_id = ?"
+STUDENT_AVG = "SELECT SUM(grade) / COUNT(*) FROM grade WHERE course_id = ? AND student_id = ?"
+# Pages (keyset pagination): the cursor is the last id of the previous page, one more row
+# than the limit tells if there is a next page
+COURSES_PAGE = "SELECT course_id FROM course WHERE course_id > ? ORDER BY course_id LIMIT ?"
+ASSIGNMENTS_PAGE = ("SELECT assignment_id FROM assignment WHERE course_id = ? AND assignment_id > ? "
+                    "ORDER BY assignment_id LIMIT ?")
+STUDENTS_PAGE = ("SELECT enrollment_id, student_id FROM enrollment WHERE course_id = ? AND enrollment_id > ? "
+                 "ORDER BY enrollment_id LIMIT ?")
+STUDENT_COURSES_PAGE = ("SELECT enrollment_id, course_id FROM enrollment WHERE student_id = ? AND enrollment_id > ? "
+                        "ORDER BY enrollment_id LIMIT ?")
+# Student queries read the grade_student index, one range for each course of the student
+STUDENT_GRADES = "SELECT assignment_id, grade FROM grade WHERE course_id = ? AND student_id = ? ORDER BY grade_id"
+STUDENT_TOTAL = ("SELECT SUM(grade), COUNT(*) FROM grade "
+                 "WHERE course_id IN (SELECT course_id FROM enrollment WHERE student_id = ?) AND student_id = ?")
+# At most 101 rows, read from the grade_assignment index
+ASSIGNMENT_HISTOGRAM = "SELECT grade, COUNT(*) FROM grade WHERE course_id = ? AND assignment_id = ? GROUP BY grade"
+COURSE_HISTOGRAM = "SELECT grade, COUNT(*) FROM grade WHERE course_id = ? GROUP BY grade"
+TOP_STUDENTS = """
+SELECT e.student_id
+FROM enrollment e LEFT JOIN grade g ON g.course_id = e.course_id AND g.student_id = e.student_id
+WHERE e.course_id = ?
+GROUP BY e.student_id
+ORDER BY COALESCE(SUM(g.grade) / COUNT(g.grade), 0) DESC, e.enrollment_id
+LIMIT ?
+"""
+RANKED_STUDENTS = TOP_STUDENTS + "OFFSET ?"
+# Ranks all the students of the course: O(students of the course), SQLite has no order-statistic index
+STUDENT_RANK = """
+SELECT rank FROM (
+    SELECT e.student_id, ROW_NUMBER() OVER (ORDER BY COALESCE(SUM(g.grade) / COUNT(g.grade), 0) DESC, e.enrollment_id) AS rank
+    FROM enrollment e LEFT JOIN grade g ON g.course_id = e.course_id AND g.student_id = e.student_id
+    WHERE e.course_id = ?
+    GROUP BY e.student_id
+)
+WHERE student_id = ?
+"""
+
+
+class SqliteCourseService(CourseService):
+    """
+    CourseService stored in a SQLite database (":memory:" by default, or a file that keeps
+    the data between runs). Grades live only in the database: averages and top students
+    are computed in SQL. Courses, assignments and students are also kept in memory
+    (identity map), so each id has one object, whose relations (course.students,
+    student.courses...) follow the changes as with CourseServiceImpl.
+
+    Every change is one transaction; the bulk calls write all their rows in one transaction.
+    Ids must be values SQLite can store (e.g. str or int student ids).
+    """
+
+    def __init__(self, path=":memory:"):
+        self.connection = sqlite3.connect(path, cached_statements=256)
+        self.connection.executescript(SCHEMA)
+        if path != ":memory:":
+            self.connection.execute("PRAGMA journal_mode = WAL")
+            self.connection.execute("PRAGMA synchronous = NORMAL")
+
+        # Identity map, in insertion order
+        self.courses = {}     # course_id -> Course
+        self.assignments = {} # assignment_id -> Assignment
+        self.students = {}    # student_id -> Student
+        self.load_objects()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    # Loads the courses, assignments, students and enrollments saved in the database
+    def load_objects(self):
+        execute = self.connection.execute
+        for course_id, course_name in execute("SELECT course_id, course_name FROM course ORDER BY course_id"):
+            self.courses[course_id] = Course(course_id, course_name)
+        for assignment_id, course_id, assignment_name in execute(
+                "SELECT assignment_id, course_id, assignment_name FROM assignment ORDER BY assignment_id"):
+            course = self.courses[course_id]
+            assignment = self.assignments[assignment_id] = Assignment(assignment_id, assignment_name, course)
+            course.add_assignment(assignment)
+        for (student_id,) in execute("SELECT student_id FROM student ORDER BY rowid"):
+            self.students[student_id] = Student(student_id)
+        for course_id, student_id in execute("SELECT course_id, student_id FROM enrollment ORDER BY enrollment_id"):
+            course = self.courses[course_id]
+            student = self.students[student_id]
+            course.add_students(student)
+            student.courses.add(course)
+
+    # ----------------------------------------------------------
+    # Lists of objects, in insertion order
+
+    @property
+    def course_list(self):
+        return list(self.courses.values())
+
+    @property
+    def assignment_list(self):
+        return list(self.assignments.values())
+
+    @property
+    def student_list(self):
+        return list(self.students.values())
+
+    @property
+    def grade_list(self):
+        return [self.make_grade(*row) for row in self.connection.execute(SELECT_GRADES)]
+
+    # Helper function to make a Grade from a row, with the objects of the identity map
+    def make_grade(self, course_id, student_id, assignment_id, grade):
+        return Grade(self.courses[course_id], self.students[student_id], self.assignments[assignment_id], grade)
+
+    # Returns the grade of a student for an assignment, or None
+    def find_grade(self, course_id, student_id, assignment_id):
+        row = self.connection.execute(SELECT_GRADE, (course_id, student_id, assignment_id)).fetchone()
+        if row is None:
+            return None
+        return self.make_grade(course_id, student_id, assignment_id, row[0])
+
+    # Valiate course name or assignment name (see course_service_impl.validate_name)
+    def validate_name(self, name):
+        return validate_name(name)
+
+    # Helper function to get a student, inserted (in the transaction of the caller) if needed.
+    # New students are collected in created; the caller adds them to the identity map
+    # after the commit, so a rolled back transaction leaves no student that isn't saved.
+    def find_or_create_student(self, student_id, created):
+        student = self.students.get(student_id)
+        if student is None:
+            student = created.get(student_id)
+        if student is None:
+            self.connection.execute(INSERT_STUDENT, (student_id,))
+            student = created[student_id] = Student(student_id)
+        return student
+
+    # ----------------------------------------------------------
+    # Override
+    def get_courses(self):
+        return self.course_list
+
+    def get_course_by_id(self, course_id):
+        try:
+            return self.courses.get(course_id)
+        except TypeError: # unhashable id
+            return None
+
+    def create_course(self, course_name):
+        course_name = self.validate_name(course_name)
+        with self.connection:
+            course_id = self.connection.execute(INSERT_COURSE, (course_name,)).lastrowid
+        course = self.courses[course_id] = Course(course_id, course_name)
+        return course
+
+    def delete_course(self, course_id):
+        course = self.get_course_by_id(course_id)
+        if course is None:
+            return False
+        with self.connection:
+            for statement in (DELETE_COURSE_GRADES, DELETE_COURSE_ENROLLMENTS, DELETE_COURSE_ASSIGNMENTS, DELETE_COURSE):
+                self.connection.execute(statement, (course_id,))
+        del self.courses[course_id]
+        for assignment in course.assignments:
+            del self.assignments[assignment.assignment_id]
+        for student in course.students:
+            student.courses.discard(course)
+        return True
+
+    def create_assignment(self, course_id, assignment_name):
+        assignment_name = self.validate_name(assignment_name)
+        course = self.get_course_by_id(course_id)
+        if course is None:
+            return None
+        with self.connection:
+            assignment_id = self.connection.execute(INSERT_ASSIGNMENT, (course_id, assignment_name)).lastrowid
+        assignment = self.assignments[assignment_id] = Assignment(assignment_id, assignment_name, course)
+        course.add_assignment(assignment)
+        return assignment
+
+    def enroll_student(self, course_id, student_id):
+        course = self.get_course_by_id(course_id)
+        if course is None:
+            return None
+        created = {}
+        with self.connection:
+            student = self.find_or_create_student(student_id, created)
+            if student not in course.students:
+                self.connection.execute(INSERT_ENROLLMENT, (course_id, student_id))
+        self.students.update(created)
+        course.add_students(student)
+        student.courses.add(course)
+        return student
+
+    def enroll_students_bulk(self, course_id, student_ids):
+        result = BulkResult()
+        course = self.get_course_by_id(course_id)
+        if course is None:
+            for index, student_id in enumerate(student_ids):
+                result.add_error(index, student_id, "Course not found")
+            return result
+
+        created = {}
+        with self.connection:
+            students = [self.find_or_create_student(student_id, created) for student_id in student_ids]
+            new = {student.student_id: student for student in students if student not in course.students}
+            self.connection.executemany(INSERT_ENROLLMENT, ((course_id, student_id) for student_id in new))
+        self.students.update(created)
+        for student in new.values():
+            course.add_students(student)
+            student.courses.add(course)
+        for student in students:
+            result.add_result(student)
+        return result
+
+    def dropout_student(self, course_id, student_id):
+        course = self.get_course_by_id(course_id)
+        if course is None:
+            return False
+        student = self.students.get(student_id)
+        if student is None:
+            return False
+        with self.connection:
+            self.connection.execute(DELETE_STUDENT_GRADES, (course_id, student_id))
+            self.connection.execute(DELETE_ENROLLMENT, (course_id, student_id))
+        course.students.discard(student)
+        student.courses.discard(course)
+        return True
+
+    def submit_assignment(self, course_id, student_id, assignment_id, grade):
+        # Validate grade
+        if not isinstance(grade, int) or grade < 0 or grade > 100:
+            raise ValueError("Grade must be an integer between 0 and 100.")
+
+        course = self.get_course_by_id(course_id)
+        if course is None:
+            return None
+        student = self.students.get(student_id)
+        if student is None:
+            return None
+        assignment = self.assignments.get(assignment_id)
+        if assignment is None or assignment.course is not course:
+            return None
+        if student not in course.students:
+            return None
+
+        with self.connection:
+            self.connection.execute(UPSERT_GRADE, (course_id, student_id, assignment_id, grade))
+        return Grade(course, student, assignment, grade)
+
+    # The records are checked as in CourseServiceImpl, then the valid ones are written in one transaction
+    def submit_assignments_bulk(self, records):
+        result = BulkResult()
+        rows = []
+        for index, record in enumerate(records):
+            try:
+                course_id, student_id, assignment_id, value = record
+            except (TypeError, ValueError):
+                result.add_error(index, record, "Record should be (course_id, student_id, assignment_id, grade)")
+                continue
+
+            if not isinstance(value, int) or value < 0 or value > 100:
+                result.add_error(index, record, "Grade must be an integer between 0 and 100.")
+                continue
+            course = self.get_course_by_id(course_id)
+            if course is None:
+                result.add_error(index, record, "Course not found")
+                continue
+            student = self.students.get(student_id)
+            if student is None:
+                result.add_error(index, record, "Student not found")
+                continue
+            assignment = self.assignments.get(assignment_id)
+            if assignment is None or assignment.course is not course:
+                result.add_error(index, record, "Assignment not found in course")
+                continue
+            if student not in course.students:
+                result.add_error(index, record, "Student not enrolled in course")
+                continue
+
+            rows.append((course_id, student_id, assignment_id, value))
+            result.add_result(Grade(course, student, assignment, value))
+
+        with self.connection:
+            self.connection.executemany(UPSERT_GRADE, rows)
+        return result
+
+    def get_assignment_grade_avg(self, course_id, assignment_id):
+        average = self.connection.execute(ASSIGNMENT_AVG, (course_id, assignment_id)).fetchone()[0]
+        return 0 if average is None else average
+
+    def get_student_grade_avg(self, course_id, student_id):
+        average = self.connection.execute(STUDENT_AVG, (course_id, student_id)).fetchone()[0]
+        return 0 if average is None else average
+
+    def get_top_five_students(self, course_id):
+        return self.get_top_k_students(course_id, 5)
+
+    def get_top_k_students(self, course_id, k):
+        if not isinstance(k, int) or isinstance(k, bool) or k < 0:
+            raise ValueError("k must be a non-negative integer.")
+        return [student_id for (student_id,) in self.connection.execute(TOP_STUDENTS, (course_id, k))]
+
+    def get_student_rank(self, course_id, student_id):
+        row = self.connection.execute(STUDENT_RANK, (course_id, student_id)).fetchone()
+        return None if row is None else row[0]
+
+    def get_students_in_rank_range(self, course_id, lo, hi):
+        validate_rank_range(lo, hi)
+        rows = self.connection.execute(RANKED_STUDENTS, (course_id, hi - lo + 1, lo - 1))
+        return [student_id for (student_id,) in rows]
+
+    # Helper function to make a page from (cursor, object) pairs, read with one row more than limit
+    def make_page(self, rows, limit):
+        items = [item for cursor, item in rows[:limit]]
+        next_cursor = rows[limit - 1][0] if len(rows) > limit else None
+        return Page(items, next_cursor)
+
+    def get_courses_page(self, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        validate_limit(limit)
+        rows = self.connection.execute(COURSES_PAGE, (0 if cursor is None else cursor, limit + 1)).fetchall()
+        return self.make_page([(course_id, self.courses[course_id]) for (course_id,) in rows], limit)
+
+    def get_course_students_page(self, course_id, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        validate_limit(limit)
+        if self.get_course_by_id(course_id) is None:
+            return None
+        rows = self.connection.execute(STUDENTS_PAGE, (course_id, 0 if cursor is None else cursor, limit + 1)).fetchall()
+        return self.make_page([(enrollment_id, self.students[student_id]) for enrollment_id, student_id in rows], limit)
+
+    def get_course_assignments_page(self, course_id, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        validate_limit(limit)
+        if self.get_course_by_id(course_id) is None:
+            return None
+        rows = self.connection.execute(ASSIGNMENTS_PAGE, (course_id, 0 if cursor is None else cursor, limit + 1)).fetchall()
+        return self.make_page([(assignment_id, self.assignments[assignment_id]) for (assignment_id,) in rows], limit)
+
+    def get_student_courses_page(self, student_id, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        validate_limit(limit)
+        try:
+            if student_id not in self.students:
+                return None
+        except TypeError: # unhashable id
+            return None
+        rows = self.connection.execute(STUDENT_COURSES_PAGE, (student_id, 0 if cursor is None else cursor, limit + 1)).fetchall()
+        return self.make_page([(enrollment_id, self.courses[course_id]) for enrollment_id, course_id in rows], limit)
+
+    def get_student_transcript(self, student_id):
+        try:
+            student = self.students.get(student_id)
+        except TypeError: # unhashable id
+            return None
+        if student is None:
+            return None
+        entries = []
+        for course in student.courses:
+            grades = [Grade(course, student, self.assignments[assignment_id], grade)
+                      for assignment_id, grade in self.connection.execute(STUDENT_GRADES, (course.course_id, student_id))]
+            average = sum(g.grade for g in grades) // len(grades) if grades else 0
+            entries.append(TranscriptEntry(course, grades, average))
+        return entries
+
+    def get_student_overall_avg(self, student_id):
+        try:
+            if student_id not in self.students:
+                return None
+        except TypeError: # unhashable id
+            return None
+        total, count = self.connection.execute(STUDENT_TOTAL, (student_id, student_id)).fetchone()
+        return total // count if count else 0
+
+    # Helper function to read a histogram: (list of 101 counts, number of grades)
+    def histogram(self, statement, args):
+        counts = [0] * GRADE_COUNT
+        for grade, count in self.connection.execute(statement, args):
+            counts[grade] = count
+        return counts, sum(counts)
+
+    def get_assignment_grade_percentile(self, course_id, assignment_id, p):
+        validate_percentile(p)
+        return percentile_of(*self.histogram(ASSIGNMENT_HISTOGRAM, (course_id, assignment_id)), p)
+
+    def get_assignment_grade_median(self, course_id, assignment_id):
+        return median_of(*self.histogram(ASSIGNMENT_HISTOGRAM, (course_id, assignment_id)))
+
+    # Reads the grades of the course in the grade_assignment index
+    def get_course_grade_distribution(self, course_id):
+        if self.get_course_by_id(course_id) is None:
+            return None
+        return self.histogram(COURSE_HISTOGRAM, (course_id,))[0]
@@ -0,0 +1,427 @@
+import bisect
+from abc import ABC, abstractmethod
+
+from app.enrollment_index import EnrollmentIndex
+
+
+class Storage(ABC):
+    """
+    Storage engine used by CourseServiceImpl to keep Course, Assignment and Student objects.
+    Entities are kept by their primary key (course_id, assignment_id, student_id)
+    and iterated in insertion order.
+    """
+
+    @abstractmethod
+    def add_course(self, course):
+        """
+        Saves a course.
+        """
+        pass
+
+    @abstractmethod
+    def get_course(self, course_id):
+        """
+        Returns a course by its id, or None.
+        """
+        pass
+
+    @abstractmethod
+    def remove_course(self, course_id):
+        """
+        Removes a course by its id. Returns the removed course, or None.
+        """
+        pass
+
+    @abstractmethod
+    def courses(self):
+        """
+        Returns an iterable of all courses in insertion order.
+        """
+        pass
+
+    @abstractmethod
+    def courses_page(self, cursor, limit):
+        """
+        Returns (courses, next cursor): at most limit courses with an id greater than cursor
+        (all if cursor is None), by id. The next cursor is None after the last course.
+        """
+        pass
+
+    @abstractmethod
+    def add_assignment(self, assignment):
+        """
+        Saves an assignment.
+        """
+        pass
+
+    @abstractmethod
+    def get_assignment(self, assignment_id):
+        """
+        Returns an assignment by its id, or None.
+        """
+        pass
+
+    @abstractmethod
+    def remove_assignment(self, assignment_id):
+        """
+        Removes an assignment by its id. Returns the removed assignment, or None.
+        """
+        pass
+
+    @abstractmethod
+    def assignments(self):
+        """
+        Returns an iterable of all assignments in insertion order.
+        """
+        pass
+
+    @abstractmethod
+    def add_student(self, student):
+        """
+        Saves a student.
+        """
+        pass
+
+    @abstractmethod
+    def get_student(self, student_id):
+        """
+        Returns a student by its id, or None.
+        """
+        pass
+
+    @abstractmethod
+    def students(self):
+        """
+        Returns an iterable of all students in insertion order.
+        """
+        pass
+
+    @abstractmethod
+    def put_grade(self, grade):
+        """
+        Saves a grade. A grade for the same course, student and assignment is replaced
+        and keeps its position. Returns the replaced grade, or None.
+        """
+        pass
+
+    @abstractmethod
+    def get_grade(self, course_id, student_id, assignment_id):
+        """
+        Returns the grade of a student for an assignment of a course, or None.
+        """
+        pass
+
+    @abstractmethod
+    def remove_grade(self, course_id, student_id, assignment_id):
+        """
+        Removes the grade of a student for an assignment of a course. Returns the removed grade, or None.
+        """
+        pass
+
+    @abstractmethod
+    def remove_student_grades(self, course_id, student_id):
+        """
+        Removes all grades of a student in a course. Returns the list of removed grades.
+        """
+        pass
+
+    @abstractmethod
+    def remove_course_grades(self, course_id):
+        """
+        Removes all grades of a course. Returns the list of removed grades.
+        """
+        pass
+
+    @abstractmethod
+    def course_grades(self, course_id):
+        """
+        Returns an iterable of the grades of a course.
+        """
+        pass
+
+    @abstractmethod
+    def student_grades(self, course_id, student_id):
+        """
+        Returns an iterable of the grades of a student in a course.
+        """
+        pass
+
+    @abstractmethod
+    def grades(self):
+        """
+        Returns an iterable of all grades in insertion order.
+        """
+        pass
+
+
+# Composite key of a grade: (course_id, student_id, assignment_id)
+def grade_key(grade):
+    return (grade.course.course_id, grade.student.student_id, grade.assignment.assignment_id)
+
+
+# Original storage: plain lists, every lookup by id walks the list - O(n).
+# Kept to compare against DictStorage (see benchmarks/bench_storage.py)
+class ListStorage(Storage):
+
+    def __init__(self):
+        self.course_list = []
+        self.assignment_list = []
+        self.student_list = []
+        self.grade_list = []
+
+    # Helper function to find an object in a list by one of its attributes
+    # Returns the index or None
+    def find_index(self, object_list, attribute, value):
+        for i in range(len(object_list)) :
+            if getattr(object_list[i], attribute) == value:
+                return i
+        return None
+
+    def add_course(self, course):
+        self.course_list.append(course)
+
+    def get_course(self, course_id):
+        i = self.find_index(self.course_list, "course_id", course_id)
+        return None if i is None else self.course_list[i]
+
+    def remove_course(self, course_id):
+        i = self.find_index(self.course_list, "course_id", course_id)
+        return None if i is None else self.course_list.pop(i) # remove by index
+
+    def courses(self):
+        return self.course_list
+
+    # Ids are increasing in course_list
+    def courses_page(self, cursor, limit):
+        courses = [c for c in self.course_list if cursor is None or c.course_id > cursor]
+        page = courses[:limit]
+        return page, (page[-1].course_id if len(courses) > limit else None)
+
+    def add_assignment(self, assignment):
+        self.assignment_list.append(assignment)
+
+    def get_assignment(self, assignment_id):
+        i = self.find_index(self.assignment_list, "assignment_id", assignment_id)
+        return None if i is None else self.assignment_list[i]
+
+    def remove_assignment(self, assignment_id):
+        i = self.find_index(self.assignment_list, "assignment_id", assignment_id)
+        return None if i is None else self.assignment_list.pop(i)
+
+    def assignments(self):
+        return self.assignment_list
+
+    def add_student(self, student):
+        self.student_list.append(student)
+
+    def get_student(self, student_id):
+        i = self.find_index(self.student_list, "student_id", student_id)
+        return None if i is None else self.student_list[i]
+
+    def students(self):
+        return self.student_list
+
+    def find_grade_index(self, course_id, student_id, assignment_id):
+        for i in range(len(self.grade_list)) :
+            if grade_key(self.grade_list[i]) == (course_id, student_id, assignment_id):
+                return i
+        return None
+
+    def put_grade(self, grade):
+        i = self.find_grade_index(*grade_key(grade))
+        if i is None:
+            self.grade_list.append(grade)
+            return None
+        previous = self.grade_list[i]
+        self.grade_list[i] = grade
+        return previous
+
+    def get_grade(self, course_id, student_id, assignment_id):
+        i = self.find_grade_index(course_id, student_id, assignment_id)
+        return None if i is None else self.grade_list[i]
+
+    def remove_grade(self, course_id, student_id, assignment_id):
+        i = self.find_grade_index(course_id, student_id, assignment_id)
+        return None if i is None else self.grade_list.pop(i)
+
+    def remove_student_grades(self, course_id, student_id):
+        removed = [g for g in self.grade_list if g.course.course_id == course_id and g.student.student_id == student_id]
+        if removed:
+            self.grade_list = [g for g in self.grade_list if not (g.course.course_id == course_id and g.student.student_id == student_id)]
+        return removed
+
+    def remove_course_grades(self, course_id):
+        removed = [g for g in self.grade_list if g.course.course_id == course_id]
+        if removed:
+            self.grade_list = [g for g in self.grade_list if g.course.course_id != course_id]
+        return removed
+
+    def course_grades(self, course_id):
+        return [g for g in self.grade_list if g.course.course_id == course_id]
+
+    def student_grades(self, course_id, student_id):
+        return [g for g in self.grade_list if g.course.course_id == course_id and g.student.student_id == student_id]
+
+    def grades(self):
+        return self.grade_list
+
+
+# Default storage: hash maps keyed by id, lookups by id are O(1).
+# Python dicts keep insertion order, so iteration order is the same as ListStorage.
+# Grades are also kept in buckets by course and student, so removing the grades
+# of a student or of a course costs only the number of removed grades.
+# The sorted list of course ids gives the pages of courses with a binary search
+class DictStorage(Storage):
+
+    def __init__(self):
+        self.course_map = {}      # course_id -> Course
+        self.course_ids = []      # sorted ids of course_map
+        self.assignment_map = {}  # assignment_id -> Assignment
+        self.student_map = {}     # student_id -> Student
+        self.grade_map = {}       # (course_id, student_id, assignment_id) -> Grade
+        self.grade_buckets = {}   # course_id -> student_id -> assignment_id -> Grade
+
+    def add_course(self, course):
+        course_id = course.course_id
+        if course_id not in self.course_map:
+            if not self.course_ids or course_id > self.course_ids[-1]: # new ids are the largest
+                self.course_ids.append(course_id)
+            else:
+                bisect.insort(self.course_ids, course_id)
+        self.course_map[course_id] = course
+
+    def get_course(self, course_id):
+        return self.course_map.get(course_id)
+
+    def remove_course(self, course_id):
+        course = self.course_map.pop(course_id, None)
+        if course is not None:
+            del self.course_ids[bisect.bisect_left(self.course_ids, course_id)]
+        return course
+
+    def courses(self):
+        return self.course_map.values()
+
+    def courses_page(self, cursor, limit):
+        start = 0 if cursor is None else bisect.bisect_right(self.course_ids, cursor)
+        ids = self.course_ids[start:start + limit]
+        next_cursor = ids[-1] if start + limit < len(self.course_ids) else None
+        return [self.course_map[course_id] for course_id in ids], next_cursor
+
+    def add_assignment(self, assignment):
+        self.assignment_map[assignment.assignment_id] = assignment
+
+    def get_assignment(self, assignment_id):
+        return self.assignment_map.get(assignment_id)
+
+    def remove_assignment(self, assignment_id):
+        return self.assignment_map.pop(assignment_id, None)
+
+    def assignments(self):
+        return self.assignment_map.values()
+
+    def add_student(self, student):
+        self.student_map[student.student_id] = student
+
+    def get_student(self, student_id):
+        return self.student_map.get(student_id)
+
+    def students(self):
+        return self.student_map.values()
+
+    def put_grade(self, grade):
+        key = grade_key(grade)
+        course_id, student_id, assignment_id = key
+        previous = self.grade_map.get(key)
+        self.grade_map[key] = grade # replacing a value keeps its position
+
+        course_bucket = self.grade_buckets.get(course_id)
+        if course_bucket is None:
+            course_bucket = self.grade_buckets[course_id] = {}
+        student_bucket = course_bucket.get(student_id)
+        if student_bucket is None:
+            student_bucket = course_bucket[student_id] = {}
+        student_bucket[assignment_id] = grade
+        return previous
+
+    def get_grade(self, course_id, student_id, assignment_id):
+        return self.grade_map.get((course_id, student_id, assignment_id))
+
+    def remove_grade(self, course_id, student_id, assignment_id):
+        grade = self.grade_map.pop((course_id, student_id, assignment_id), None)
+        if grade is not None:
+            course_bucket = self.grade_buckets[course_id]
+            student_bucket = course_bucket[student_id]
+            del student_bucket[assignment_id]
+            # Release empty buckets
+            if not student_bucket:
+                del course_bucket[student_id]
+                if not course_bucket:
+                    del self.grade_buckets[course_id]
+        return grade
+
+    def remove_student_grades(self, course_id, student_id):
+        course_bucket = self.grade_buckets.get(course_id)
+        if course_bucket is None:
+            return []
+        student_bucket = course_bucket.pop(student_id, None)
+        if student_bucket is None:
+            return []
+        if not course_bucket:
+            del self.grade_buckets[course_id]
+        for assignment_id in student_bucket:
+            del self.grade_map[(course_id, student_id, assignment_id)]
+        return list(student_bucket.values())
+
+    def remove_course_grades(self, course_id):
+        course_bucket = self.grade_buckets.pop(course_id, None)
+        if course_bucket is None:
+            return []
+        removed = []
+        for student_id, student_bucket in course_bucket.items():
+            for assignment_id, grade in student_bucket.items():
+                del self.grade_map[(course_id, student_id, assignment_id)]
+                removed.append(grade)
+        return removed
+
+    def course_grades(self, course_id):
+        course_bucket = self.grade_buckets.get(course_id)
+        if course_bucket is None:
+            return []
+        return (grade for student_bucket in course_bucket.values() for grade in student_bucket.values())
+
+    def student_grades(self, course_id, student_id):
+        student_bucket = self.grade_buckets.get(course_id, {}).get(student_id)
+        if student_bucket is None:
+            return []
+        return student_bucket.values()
+
+    def grades(self):
+        return self.grade_map.values()
+
+
+# DictStorage with the enrollments in an EnrollmentIndex: student ids get dense integer
+# keys and course.students / student.courses are views over arrays of keys, so each
+# enrollment costs 32 bytes instead of the dict entries and list slots of two OrderedSets.
+# Membership and removal read the courses of the student (short lists) instead of a hash.
+class CompactStorage(DictStorage):
+
+    def __init__(self):
+        super().__init__()
+        self.enrollments = EnrollmentIndex()
+
+    def add_course(self, course):
+        super().add_course(course)
+        self.enrollments.attach_course(course)
+
+    # The enrollments of the course are removed with it
+    def remove_course(self, course_id):
+        course = super().remove_course(course_id)
+        if course is not None:
+            self.enrollments.detach_course(course)
+        return course
+
+    def add_student(self, student):
+        super().add_student(student)
+        self.enrollments.attach_student(student)
+
@@ -1,5 +1,8 @@
-class Student:
-
-    def __init__(self, student_id):
-        self.student_id = student_id
-        self.courses    = [] # A student can be enrolled in many courses
\ No newline at end of file
+from app.ordered_set import OrderedSet
+
+class Student:
+    __slots__ = ("student_id", "courses") # no per-instance __dict__
+
+    def __init__(self, student_id):
+        self.student_id = student_id
+        self.courses    = OrderedSet() # A student can be enrolled in many courses (insertion ordered, O(1) membership)
\ No newline at end of file
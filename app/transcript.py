@@ -0,0 +1,15 @@
+class TranscriptEntry:
+    """
+    One course of a student transcript: the grades of the student in the course,
+    in submission order, and their average (floored, 0 without grades).
+    """
+    __slots__ = ("course", "grades", "average")
+
+    def __init__(self, course, grades, average):
+        self.course = course
+        self.grades = tuple(grades)
+        self.average = average
+
+    def __repr__(self):
+        return "TranscriptEntry(course_id=%r, grades=%r, average=%r)" % (
+            self.course.course_id, [g.grade for g in self.grades], self.average)
@@ -0,0 +1,53 @@
+# Request throughput of AsyncCourseService with many concurrent clients.
+# Compares micro-batched writes (max_batch) with one write per step (max_batch=1).
+#
+# Run: python -m benchmarks.bench_async --clients 1000 --requests 20
+import argparse
+import asyncio
+import random
+import time
+
+from app.async_course_service import AsyncCourseService
+
+
+async def run(max_batch, clients, requests, courses, read_ratio, seed):
+    service = AsyncCourseService(max_batch=max_batch)
+    assignments = {}
+    for i in range(courses):
+        course = await service.create_course("Course " + str(i))
+        assignment = await service.create_assignment(course.course_id, "Lab")
+        assignments[course.course_id] = assignment.assignment_id
+        await service.enroll_students_bulk(course.course_id, ["S" + str(s) for s in range(50)])
+    course_ids = list(assignments)
+
+    async def client(seed):
+        rnd = random.Random(seed)
+        for _ in range(requests):
+            course_id = rnd.choice(course_ids)
+            if rnd.random() < read_ratio:
+                await service.get_top_five_students(course_id)
+            else:
+                await service.submit_assignment(course_id, "S" + str(rnd.randrange(50)), assignments[course_id],
+                                                rnd.randint(0, 100))
+
+    start = time.perf_counter()
+    await asyncio.gather(*[client(seed + i) for i in range(clients)])
+    elapsed = time.perf_counter() - start
+    stats = service.stats
+    await service.close()
+    return clients * requests / elapsed, stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AsyncCourseService throughput")
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=20, help="requests per client")
+    parser.add_argument("--courses", type=int, default=20)
+    parser.add_argument("--read-ratio", type=float, default=0.9)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    for max_batch in [1, 1000]:
+        throughput, stats = asyncio.run(run(max_batch, args.clients, args.requests, args.courses, args.read_ratio, args.seed))
+        print("max_batch=%-5d %10.1f requests/sec  reads=%d coalesced=%d writes=%d write steps=%d"
+              % (max_batch, throughput, stats["reads"], stats["coalesced_reads"], stats["writes"], stats["write_batches"]))
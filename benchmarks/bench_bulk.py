@@ -0,0 +1,78 @@
+# Compares the bulk APIs with a loop over the single-item methods:
+#   enroll_students_bulk     vs enroll_student
+#   submit_assignments_bulk  vs submit_assignment
+#
+# Run: python -m benchmarks.bench_bulk --courses 200 --students 20000
+import argparse
+import random
+import time
+
+from app.course_service_impl import CourseServiceImpl
+
+
+def create_courses(service, courses, assignments):
+    assignment_ids = {}
+    for i in range(courses):
+        course = service.create_course("Course " + str(i))
+        assignment_ids[course.course_id] = [
+            service.create_assignment(course.course_id, "Assignment " + str(j)).assignment_id
+            for j in range(assignments)
+        ]
+    return assignment_ids
+
+
+def run(bulk, courses, students, assignments, enrollments, seed):
+    rnd = random.Random(seed)
+    service = CourseServiceImpl()
+    assignment_ids = create_courses(service, courses, assignments)
+
+    # enrollments per course
+    rosters = {course_id: [] for course_id in assignment_ids}
+    for i in range(students):
+        for course_id in rnd.sample(list(assignment_ids), enrollments):
+            rosters[course_id].append("S" + str(i))
+    records = [
+        (course_id, student_id, assignment_id, rnd.randint(0, 100))
+        for course_id, roster in rosters.items()
+        for student_id in roster
+        for assignment_id in assignment_ids[course_id]
+    ]
+    rnd.shuffle(records)
+
+    start = time.perf_counter()
+    if bulk:
+        for course_id, roster in rosters.items():
+            service.enroll_students_bulk(course_id, roster)
+    else:
+        for course_id, roster in rosters.items():
+            for student_id in roster:
+                service.enroll_student(course_id, student_id)
+    enroll_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if bulk:
+        service.submit_assignments_bulk(records)
+    else:
+        for record in records:
+            service.submit_assignment(*record)
+    submit_time = time.perf_counter() - start
+
+    enrolled = sum(len(roster) for roster in rosters.values())
+    return enrolled / enroll_time, len(records) / submit_time
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk APIs vs single-item methods")
+    parser.add_argument("--courses", type=int, default=100)
+    parser.add_argument("--students", type=int, default=10000)
+    parser.add_argument("--assignments", type=int, default=3, help="assignments per course")
+    parser.add_argument("--enrollments", type=int, default=2, help="courses per student")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print("courses=%d students=%d assignments=%d enrollments=%d (ops/sec)"
+          % (args.courses, args.students, args.assignments, args.enrollments))
+    single = run(False, args.courses, args.students, args.assignments, args.enrollments, args.seed)
+    bulk = run(True, args.courses, args.students, args.assignments, args.enrollments, args.seed)
+    print("  %-12s single=%12.1f bulk=%12.1f" % ("enroll", single[0], bulk[0]))
+    print("  %-12s single=%12.1f bulk=%12.1f" % ("submit", single[1], bulk[1]))
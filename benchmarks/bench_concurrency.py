@@ -0,0 +1,85 @@
+# Throughput of ConcurrentCourseService (a reader/writer lock per course) against
+# CourseServiceImpl behind one global lock, with several threads on a mixed workload.
+# With the GIL, Python code of different threads doesn't run in parallel: the per-course locks
+# avoid waiting behind a slow or blocked caller of another course, they don't add cores.
+#
+# Run: python -m benchmarks.bench_concurrency --threads 1 2 4 8
+import argparse
+import random
+import threading
+import time
+
+from app.course_service_impl import CourseServiceImpl
+from app.concurrent_course_service import ConcurrentCourseService
+
+
+class GlobalLockService:
+    """
+    CourseServiceImpl with one lock around every call.
+    """
+
+    def __init__(self):
+        self.service = CourseServiceImpl()
+        self.lock = threading.Lock()
+
+    def __getattr__(self, name):
+        method = getattr(self.service, name)
+        def locked(*args):
+            with self.lock:
+                return method(*args)
+        return locked
+
+
+def populate(service, courses, students):
+    assignments = {}
+    for i in range(courses):
+        course = service.create_course("Course " + str(i))
+        assignments[course.course_id] = [service.create_assignment(course.course_id, "Lab " + str(j)).assignment_id
+                                         for j in range(3)]
+        service.enroll_students_bulk(course.course_id, ["S" + str(s) for s in range(i % 7, students, 7)])
+    return assignments
+
+
+def run(service, threads, operations, courses, students, read_ratio, seed):
+    assignments = populate(service, courses, students)
+    course_ids = list(assignments)
+
+    def work(seed):
+        rnd = random.Random(seed)
+        for _ in range(operations):
+            course_id = rnd.choice(course_ids)
+            if rnd.random() < read_ratio:
+                if rnd.random() < 0.5:
+                    service.get_top_five_students(course_id)
+                else:
+                    service.get_assignment_grade_avg(course_id, rnd.choice(assignments[course_id]))
+            else:
+                student_id = "S" + str(rnd.randrange((course_id - 1) % 7, students, 7))
+                service.submit_assignment(course_id, student_id, rnd.choice(assignments[course_id]), rnd.randint(0, 100))
+
+    workers = [threading.Thread(target=work, args=(seed + i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return threads * operations / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-course locks vs one global lock")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--operations", type=int, default=20000, help="operations per thread")
+    parser.add_argument("--courses", type=int, default=200)
+    parser.add_argument("--students", type=int, default=5000)
+    parser.add_argument("--read-ratio", type=float, default=0.8)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print("operations/sec, read ratio %.2f" % args.read_ratio)
+    for threads in args.threads:
+        global_lock = run(GlobalLockService(), threads, args.operations, args.courses, args.students,
+                          args.read_ratio, args.seed)
+        per_course = run(ConcurrentCourseService(), threads, args.operations, args.courses, args.students,
+                         args.read_ratio, args.seed)
+        print("  threads=%-3d global lock=%10.1f per-course locks=%10.1f" % (threads, global_lock, per_course))
@@ -0,0 +1,96 @@
+# Memory and speed of the enrollments, DictStorage (OrderedSet of objects on both sides)
+# against CompactStorage (EnrollmentIndex: integer keys, arrays of keys, lazy views).
+# Memory is measured with tracemalloc while the students are enrolled (no grades), and
+# reported per enrollment: for the whole service (with the Student objects and the
+# leaderboards), and for the enrollment structures only (OrderedSet or EnrollmentIndex,
+# its keys and views).
+#
+# Run: python -m benchmarks.bench_enrollments --courses 1000 --students 200000 --enrollments 5
+import argparse
+import gc
+import os
+import time
+import tracemalloc
+
+from app.course_service_impl import CourseServiceImpl
+from app.storage import DictStorage, CompactStorage
+from benchmarks import workload
+
+# Files allocating the enrollment structures
+ENROLLMENT_FILES = ("ordered_set.py", "enrollment_index.py")
+
+STORAGES = {
+    "dict": DictStorage,
+    "compact": CompactStorage,
+}
+
+
+# Enrolls the students, returns (service, data, bytes per enrollment of the service
+# and of the enrollment structures, seconds)
+def load(storage, courses, students, enrollments, seed):
+    service = CourseServiceImpl(STORAGES[storage]())
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    start = time.perf_counter()
+    data = workload.generate(service, courses, students, 1, enrollments, 0, seed)
+    elapsed = time.perf_counter() - start
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(len(roster) for roster in data.rosters.values())
+    changes = after.compare_to(before, "filename")
+    service_bytes = sum(change.size_diff for change in changes)
+    enrollment_bytes = sum(change.size_diff for change in changes
+                           if os.path.basename(change.traceback[0].filename) in ENROLLMENT_FILES)
+    return service, data, (service_bytes / total, enrollment_bytes / total), elapsed
+
+
+def time_per_call(function, calls):
+    start = time.perf_counter()
+    for args in calls:
+        function(*args)
+    return (time.perf_counter() - start) / len(calls) * 1e6
+
+
+# Microseconds per call of the reads and changes that use the enrollments
+def time_operations(service, data, operations):
+    rnd = data.rnd
+    submissions = [data.random_submission() for _ in range(operations)]
+    members = [(service.get_course_by_id(c), service.find_student_by_id(s)) for c, s, a in submissions]
+    courses = [service.get_course_by_id(c) for c in rnd.sample(data.course_ids(), min(200, len(data.assignments)))]
+    enrolled = rnd.sample([(c, s) for c, s, a in submissions], min(operations, len(submissions)))
+    return {
+        "student in course.students": time_per_call(lambda c, s: s in c.students, members),
+        "course in student.courses": time_per_call(lambda c, s: c in s.courses, members),
+        "iterate student.courses": time_per_call(lambda c, s: list(s.courses), members),
+        "iterate course.students": time_per_call(lambda c: list(c.students), [(c,) for c in courses]),
+        "roster page (50)": time_per_call(lambda c: c.students.page(None, 50), [(c,) for c in courses]),
+        "submit_assignment": time_per_call(service.submit_assignment, [(c, s, a, 50) for c, s, a in submissions]),
+        "enroll_student": time_per_call(service.enroll_student, [(data.random_course(), "N" + str(i)) for i in range(operations)]),
+        "dropout_student": time_per_call(service.dropout_student, list(dict.fromkeys(enrolled))),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Enrollment memory and speed, DictStorage vs CompactStorage")
+    parser.add_argument("--courses", type=int, default=1000)
+    parser.add_argument("--students", type=int, default=100000)
+    parser.add_argument("--enrollments", type=int, default=5, help="courses of each student")
+    parser.add_argument("--operations", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    results = {}
+    for storage in STORAGES:
+        service, data, per_enrollment, elapsed = load(storage, args.courses, args.students, args.enrollments, args.seed)
+        results[storage] = (per_enrollment, elapsed, time_operations(service, data, args.operations))
+        del service, data
+        gc.collect()
+
+    print("%d courses, %d students, %d courses/student" % (args.courses, args.students, args.enrollments))
+    print("  %-28s %12s %12s" % ("", "dict", "compact"))
+    print("  %-28s %12.1f %12.1f" % ("bytes per enrollment", results["dict"][0][0], results["compact"][0][0]))
+    print("  %-28s %12.1f %12.1f" % ("  in enrollment structures", results["dict"][0][1], results["compact"][0][1]))
+    print("  %-28s %12.2f %12.2f" % ("load seconds", results["dict"][1], results["compact"][1]))
+    for name in results["dict"][2]:
+        print("  %-28s %12.3f %12.3f  us" % (name, results["dict"][2][name], results["compact"][2][name]))
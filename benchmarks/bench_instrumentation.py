@@ -0,0 +1,52 @@
+# Overhead of InstrumentedCourseService on the hot paths, against the same calls on
+# CourseServiceImpl, for several sample rates (sample_every=1 times every call).
+#
+# Run: python -m benchmarks.bench_instrumentation --sample-every 1 16
+import argparse
+import time
+
+from app.course_service_impl import CourseServiceImpl
+from app.instrumentation import InstrumentedCourseService
+from benchmarks import workload
+
+
+def run(service, calls, repeat):
+    results = {}
+    for name, args_list in calls.items():
+        method = getattr(service, name)
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for args in args_list:
+                method(*args)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results[name] = best / len(args_list)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Instrumentation overhead")
+    parser.add_argument("--sample-every", type=int, nargs="+", default=[1, 16])
+    parser.add_argument("--operations", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    service = CourseServiceImpl()
+    data = workload.generate(service, 200, 5000, 5, 3, 50, args.seed)
+    submissions = [data.random_submission() for _ in range(args.operations)]
+    calls = {
+        "submit_assignment": [(c, s, a, 50) for c, s, a in submissions],
+        "get_student_grade_avg": [(c, s) for c, s, a in submissions],
+        "get_top_five_students": [(c,) for c, s, a in submissions],
+    }
+
+    baseline = run(service, calls, args.repeat)
+    print("%-24s %12s" % ("", "plain us") + "".join("%22s" % ("sample_every=" + str(n)) for n in args.sample_every))
+    measured = [run(InstrumentedCourseService(service, n), calls, args.repeat) for n in args.sample_every]
+    for name, plain in baseline.items():
+        row = "%-24s %12.3f" % (name, plain * 1e6)
+        for results in measured:
+            row += "%14.3f (%+5.1f%%)" % (results[name] * 1e6, (results[name] / plain - 1) * 100)
+        print(row)
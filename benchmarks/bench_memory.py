@@ -0,0 +1,85 @@
+# Measures the memory of the entities with tracemalloc, in bytes per object:
+#   before - plain classes with a per-instance __dict__ (original entities, copied below)
+#   after  - entities of app/ with __slots__, Grade without the Course reference
+#
+# Run: python -m benchmarks.bench_memory --count 100000
+import argparse
+import gc
+import tracemalloc
+
+from app.course import Course
+from app.assignment import Assignment
+from app.student import Student
+from app.grade import Grade
+
+
+# Original entities
+class DictCourse:
+    def __init__(self, course_id, couse_name):
+        self.course_id = course_id
+        self.course_name = couse_name
+        self.assignments = []
+        self.students = []
+
+
+class DictAssignment:
+    def __init__(self, assignment_id, assignment_name, course):
+        self.assignment_id = assignment_id
+        self.assignment_name = assignment_name
+        self.course = course
+
+
+class DictStudent:
+    def __init__(self, student_id):
+        self.student_id = student_id
+        self.courses = []
+
+
+class DictGrade:
+    def __init__(self, course, student, assignment, grade):
+        self.course = course
+        self.student = student
+        self.assignment = assignment
+        self.grade = grade
+
+
+# Returns the bytes allocated per object created by the factory.
+# Shared values (ids, names, referenced objects) are created before the measure.
+def bytes_per_object(factory, arguments):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory(*args) for args in arguments]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    size = (after - before) / len(objects)
+    del objects
+    return size
+
+
+def measure(course_class, assignment_class, student_class, grade_class, count):
+    names = ["Name " + str(i) for i in range(count)]
+    ids = ["S" + str(i) for i in range(count)]
+    course = course_class(1, "Course")
+    student = student_class("S")
+    assignment = assignment_class(1, "Assignment", course)
+    return {
+        "Course": bytes_per_object(course_class, [(i, names[i]) for i in range(count)]),
+        "Assignment": bytes_per_object(assignment_class, [(i, names[i], course) for i in range(count)]),
+        "Student": bytes_per_object(student_class, [(ids[i],) for i in range(count)]),
+        "Grade": bytes_per_object(grade_class, [(course, student, assignment, i % 101) for i in range(count)]),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bytes per entity, __dict__ vs __slots__")
+    parser.add_argument("--count", type=int, default=100000, help="objects created per entity")
+    args = parser.parse_args()
+
+    before = measure(DictCourse, DictAssignment, DictStudent, DictGrade, args.count)
+    after = measure(Course, Assignment, Student, Grade, args.count)
+
+    print("bytes per entity (count=%d)" % args.count)
+    for entity in before:
+        print("  %-10s before=%7.1f after=%7.1f (%.0f%%)"
+              % (entity, before[entity], after[entity], 100.0 * after[entity] / before[entity]))
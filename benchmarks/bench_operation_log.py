@@ -0,0 +1,61 @@
+# Measures the operation log: logging throughput with group commit (several batch sizes)
+# and replay throughput when a DurableCourseService starts.
+#
+# Run: python -m benchmarks.bench_operation_log --records 1000000
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from app.durable_course_service import DurableCourseService
+
+
+# Creates courses and assignments, enrolls the students and submits grades until records are logged
+def write_changes(service, records, courses, students, seed):
+    rnd = random.Random(seed)
+    assignments = {}
+    for i in range(courses):
+        course = service.create_course("Course " + str(i))
+        assignments[course.course_id] = [service.create_assignment(course.course_id, "Lab " + str(j)).assignment_id
+                                         for j in range(5)]
+    course_ids = list(assignments)
+    for i in range(students):
+        service.enroll_student(course_ids[i % courses], "S" + str(i))
+    logged = courses * 6 + students
+    while logged < records:
+        i = rnd.randrange(students)
+        course_id = course_ids[i % courses]
+        service.submit_assignment(course_id, "S" + str(i), rnd.choice(assignments[course_id]), rnd.randint(0, 100))
+        logged += 1
+    return logged
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Operation log write and replay throughput")
+    parser.add_argument("--records", type=int, default=200000)
+    parser.add_argument("--courses", type=int, default=1000)
+    parser.add_argument("--students", type=int, default=50000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 100, 10000])
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    for batch_size in args.batch_sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            # batch_size 1 syncs every record: limit the records so it ends in a reasonable time
+            records = args.records if batch_size > 1 else min(args.records, args.courses * 6 + args.students + 2000)
+            service = DurableCourseService(directory, batch_size=batch_size, flush_interval=None)
+            start = time.perf_counter()
+            logged = write_changes(service, records, args.courses, args.students, args.seed)
+            service.close()
+            elapsed = time.perf_counter() - start
+            print("write  batch=%-6d records=%-9d %10.1f records/sec" % (batch_size, logged, logged / elapsed))
+
+            if batch_size == args.batch_sizes[-1]:
+                size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+                start = time.perf_counter()
+                service = DurableCourseService(directory, flush_interval=None)
+                elapsed = time.perf_counter() - start
+                service.close()
+                print("replay records=%-9d %10.1f records/sec (%.1f s, log %.1f MB)"
+                      % (service.replayed, service.replayed / elapsed, elapsed, size / 1e6))
@@ -0,0 +1,58 @@
+# Cost of moving a student in a leaderboard (one grade change) and of finding its rank,
+# with the RankedList of Leaderboard against a plain sorted list (bisect.insort), for
+# courses of several sizes.
+#
+# Run: python -m benchmarks.bench_ranking --students 1000 100000 1000000
+import argparse
+import bisect
+import random
+import time
+
+from app.ranked_list import RankedList
+
+
+# Applies the changes of average to the ranking, returns the time per change
+def time_updates(ranking, remove, add, entries, changes):
+    entries = dict(entries)
+    start = time.perf_counter()
+    for seq, average in changes:
+        entry = entries[seq]
+        remove(ranking, entry)
+        entry = entries[seq] = (-average, seq, entry[2])
+        add(ranking, entry)
+    return (time.perf_counter() - start) / len(changes), entries
+
+
+def time_ranks(index, ranking, entries, changes):
+    start = time.perf_counter()
+    for seq, average in changes:
+        index(ranking, entries[seq])
+    return (time.perf_counter() - start) / len(changes)
+
+
+def list_remove(ranking, entry):
+    del ranking[bisect.bisect_left(ranking, entry)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Leaderboard ranking structures")
+    parser.add_argument("--students", type=int, nargs="+", default=[1000, 100000, 1000000])
+    parser.add_argument("--operations", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print("%10s %18s %18s %16s %16s" % ("students", "list update us", "ranked update us", "list rank us", "ranked rank us"))
+    for students in args.students:
+        rnd = random.Random(args.seed)
+        entries = {seq: (-rnd.randrange(101), seq, "S" + str(seq)) for seq in range(students)}
+        changes = [(rnd.randrange(students), rnd.randrange(101)) for _ in range(args.operations)]
+
+        plain = sorted(entries.values())
+        list_update, list_entries = time_updates(plain, list_remove, bisect.insort, entries, changes)
+        list_rank = time_ranks(bisect.bisect_left, plain, list_entries, changes)
+
+        ranked = RankedList(entries.values())
+        ranked_update, ranked_entries = time_updates(ranked, RankedList.remove, RankedList.add, entries, changes)
+        ranked_rank = time_ranks(RankedList.index, ranked, ranked_entries, changes)
+
+        print("%10d %18.2f %18.2f %16.2f %16.2f" % (students, list_update * 1e6, ranked_update * 1e6, list_rank * 1e6, ranked_rank * 1e6))
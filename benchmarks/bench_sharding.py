@@ -0,0 +1,69 @@
+# Throughput of ShardedCourseService with 1, 2, 4... shard processes against CourseServiceImpl
+# in this process: bulk grade submissions spread over many courses, and single calls.
+# Bulk calls are split by shard and run in parallel; each single call is one round trip
+# to a shard process, so it is slower than an in-process call whatever the number of shards.
+#
+# Run: python -m benchmarks.bench_sharding --shards 1 2 4
+import argparse
+import random
+import time
+
+from app.course_service_impl import CourseServiceImpl
+from app.sharded_course_service import ShardedCourseService
+
+
+def populate(service, courses, students):
+    assignments = {}
+    for i in range(courses):
+        course_id = service.create_course("Course " + str(i)).course_id
+        assignments[course_id] = [service.create_assignment(course_id, "Lab " + str(j)).assignment_id for j in range(5)]
+        service.enroll_students_bulk(course_id, ["S" + str(s) for s in range(students)])
+    return assignments
+
+
+def make_records(assignments, students, count, seed):
+    rnd = random.Random(seed)
+    course_ids = list(assignments)
+    records = []
+    for _ in range(count):
+        course_id = rnd.choice(course_ids)
+        records.append((course_id, "S" + str(rnd.randrange(students)), rnd.choice(assignments[course_id]), rnd.randint(0, 100)))
+    return records
+
+
+def run(service, args):
+    assignments = populate(service, args.courses, args.students)
+    batches = [make_records(assignments, args.students, args.batch, args.seed + i) for i in range(args.batches)]
+
+    start = time.perf_counter()
+    for records in batches:
+        service.submit_assignments_bulk(records)
+    bulk = args.batch * args.batches / (time.perf_counter() - start)
+
+    rnd = random.Random(args.seed)
+    course_ids = list(assignments)
+    start = time.perf_counter()
+    for _ in range(args.calls):
+        service.get_top_five_students(rnd.choice(course_ids))
+    calls = args.calls / (time.perf_counter() - start)
+    return bulk, calls
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sharded service scaling")
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--courses", type=int, default=64)
+    parser.add_argument("--students", type=int, default=500)
+    parser.add_argument("--batch", type=int, default=100000, help="records per bulk call")
+    parser.add_argument("--batches", type=int, default=5)
+    parser.add_argument("--calls", type=int, default=20000, help="single calls")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print("%-22s %16s %14s" % ("", "bulk records/sec", "calls/sec"))
+    bulk, calls = run(CourseServiceImpl(), args)
+    print("%-22s %16.0f %14.0f" % ("in process", bulk, calls))
+    for shards in args.shards:
+        with ShardedCourseService(shards) as service:
+            bulk, calls = run(service, args)
+        print("%-22s %16.0f %14.0f" % (str(shards) + " shard(s)", bulk, calls))
@@ -0,0 +1,60 @@
+# SqliteCourseService (in memory and in a file) against CourseServiceImpl:
+# loading a generated dataset with the bulk calls, single grade submissions
+# (one transaction each), average queries and top five queries.
+#
+# Run: python -m benchmarks.bench_sqlite --courses 200 --students 10000
+import argparse
+import os
+import tempfile
+import time
+
+from app.course_service_impl import CourseServiceImpl
+from app.sqlite_course_service import SqliteCourseService
+from benchmarks import workload
+
+
+def run(service, args):
+    results = {}
+    start = time.perf_counter()
+    data = workload.generate(service, args.courses, args.students, args.assignments, args.enrollments, args.grades, args.seed)
+    results["load (s)"] = time.perf_counter() - start
+
+    submissions = [data.random_submission() for _ in range(args.operations)]
+    calls = [
+        ("submit_assignment/s", lambda c, s, a: service.submit_assignment(c, s, a, 50)),
+        ("get_student_grade_avg/s", lambda c, s, a: service.get_student_grade_avg(c, s)),
+        ("get_assignment_grade_avg/s", lambda c, s, a: service.get_assignment_grade_avg(c, a)),
+        ("get_top_five_students/s", lambda c, s, a: service.get_top_five_students(c)),
+    ]
+    for name, call in calls:
+        start = time.perf_counter()
+        for c, s, a in submissions:
+            call(c, s, a)
+        results[name] = len(submissions) / (time.perf_counter() - start)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SQLite vs in-memory CourseService")
+    parser.add_argument("--courses", type=int, default=200)
+    parser.add_argument("--students", type=int, default=10000)
+    parser.add_argument("--assignments", type=int, default=5, help="assignments per course")
+    parser.add_argument("--enrollments", type=int, default=4, help="courses per student")
+    parser.add_argument("--grades", type=int, default=100, help="grades per assignment")
+    parser.add_argument("--operations", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engines = [
+            ("in memory", CourseServiceImpl()),
+            ("sqlite :memory:", SqliteCourseService()),
+            ("sqlite file", SqliteCourseService(os.path.join(directory, "bench.db"))),
+        ]
+        rows = [(name, run(service, args)) for name, service in engines]
+        for name, service in engines[1:]:
+            service.close()
+
+    print("%-28s" % "" + "".join("%18s" % name for name, results in rows))
+    for metric in rows[0][1]:
+        print("%-28s" % metric + "".join("%18.2f" % results[metric] for name, results in rows))
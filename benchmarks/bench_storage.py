@@ -0,0 +1,71 @@
+# Compares the storage engines of CourseServiceImpl:
+#   ListStorage - lists, lookups by id walk the list (original implementation)
+#   DictStorage - hash maps keyed by id (default)
+#
+# Run: python -m benchmarks.bench_storage --courses 2000 --students 20000
+import argparse
+import random
+import time
+
+from app.course_service_impl import CourseServiceImpl
+from app.storage import ListStorage, DictStorage
+
+
+# Creates the courses, one assignment per course and enrolls the students
+def populate(service, courses, students):
+    for i in range(courses):
+        course = service.create_course("Course " + str(i))
+        service.create_assignment(course.course_id, "Assignment " + str(i))
+    for i in range(students):
+        service.enroll_student(1 + i % courses, "S" + str(i))
+
+
+# Returns the number of operations per second of the function
+def ops_per_second(function, arguments):
+    start = time.perf_counter()
+    for args in arguments:
+        function(*args)
+    elapsed = time.perf_counter() - start
+    return len(arguments) / elapsed if elapsed > 0 else float("inf")
+
+
+def run(storage_class, courses, students, operations, seed):
+    service = CourseServiceImpl(storage_class())
+    start = time.perf_counter()
+    populate(service, courses, students)
+    populate_time = time.perf_counter() - start
+
+    rnd = random.Random(seed)
+    course_ids = [(rnd.randint(1, courses),) for _ in range(operations)]
+    enrollments = [(rnd.randint(1, courses), "S" + str(rnd.randrange(students))) for _ in range(operations)]
+    submissions = []
+    for _ in range(operations):
+        i = rnd.randrange(students)
+        course_id = 1 + i % courses
+        submissions.append((course_id, "S" + str(i), course_id, rnd.randint(0, 100)))
+
+    return {
+        "populate (s)": populate_time,
+        "get_course_by_id": ops_per_second(service.get_course_by_id, course_ids),
+        "enroll_student": ops_per_second(service.enroll_student, enrollments),
+        "submit_assignment": ops_per_second(service.submit_assignment, submissions),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ListStorage vs DictStorage")
+    parser.add_argument("--courses", type=int, default=1000)
+    parser.add_argument("--students", type=int, default=10000)
+    parser.add_argument("--operations", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    results = {}
+    for storage_class in [ListStorage, DictStorage]:
+        results[storage_class.__name__] = run(storage_class, args.courses, args.students, args.operations, args.seed)
+
+    print("courses=%d students=%d operations=%d (ops/sec)" % (args.courses, args.students, args.operations))
+    for metric in results["ListStorage"]:
+        list_value = results["ListStorage"][metric]
+        dict_value = results["DictStorage"][metric]
+        print("  %-18s list=%12.1f dict=%12.1f" % (metric, list_value, dict_value))
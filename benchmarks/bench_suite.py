@@ -0,0 +1,151 @@
+# Times every CourseService method on generated datasets of several sizes (see workload.py)
+# and reports ops/sec and p50/p99 latency. Results can be saved as JSON and compared with
+# a previous run, to find regressions between versions.
+#
+# Run: python -m benchmarks.bench_suite --scales small medium --output results.json
+#      python -m benchmarks.bench_suite --scales small medium --compare results.json
+import argparse
+import json
+import platform
+import sys
+import time
+
+from app.course_service_impl import CourseServiceImpl
+from app.storage import DictStorage, ListStorage
+from benchmarks import workload
+
+# courses, students, assignments per course, enrollments per student, grades per assignment
+SCALES = {
+    "small":  (50, 1000, 5, 3, 20),
+    "medium": (500, 20000, 8, 4, 100),
+    "large":  (2000, 100000, 10, 5, 200),
+}
+
+STORAGES = {
+    "dict": DictStorage,
+    "list": ListStorage,
+}
+
+BULK_SIZE = 1000
+
+
+# Arguments of each benchmarked call, in the order they run: reads first, then the calls
+# that add data, then the ones that remove it
+def make_calls(service, data, operations):
+    rnd = data.rnd
+    calls = {}
+    calls["get_courses"] = [()] * min(operations, 200)
+    calls["get_course_by_id"] = [(data.random_course(),) for _ in range(operations)]
+    submissions = [data.random_submission() for _ in range(operations)]
+    calls["get_assignment_grade_avg"] = [(c, a) for c, s, a in submissions]
+    calls["get_student_grade_avg"] = [(c, s) for c, s, a in submissions]
+    calls["get_top_five_students"] = [(c,) for c, s, a in submissions]
+    calls["get_top_k_students"] = [(c, 20) for c, s, a in submissions]
+    calls["get_student_rank"] = [(c, s) for c, s, a in submissions]
+    calls["get_students_in_rank_range"] = [(c, 10, 30) for c, s, a in submissions]
+    calls["get_assignment_grade_percentile"] = [(c, a, 90) for c, s, a in submissions]
+    calls["get_assignment_grade_median"] = [(c, a) for c, s, a in submissions]
+    calls["get_course_grade_distribution"] = [(c,) for c, s, a in submissions]
+    calls["submit_assignment"] = [(c, s, a, rnd.randint(0, 100)) for c, s, a in submissions]
+    calls["submit_assignments_bulk"] = [
+        ([submission + (rnd.randint(0, 100),) for submission in (data.random_submission() for _ in range(BULK_SIZE))],)
+        for _ in range(max(1, operations // 100))
+    ]
+    calls["create_course"] = [("New course " + str(i),) for i in range(operations)]
+    calls["create_assignment"] = [(data.random_course(), "New assignment " + str(i)) for i in range(operations)]
+    calls["enroll_student"] = [(data.random_course(), "N" + str(i)) for i in range(operations)]
+    calls["enroll_students_bulk"] = [
+        (data.random_course(), ["B" + str(i) + "-" + str(j) for j in range(100)]) for i in range(max(1, operations // 100))
+    ]
+    enrolled = [(c, s) for c, roster in data.rosters.items() for s in roster]
+    calls["dropout_student"] = rnd.sample(enrolled, min(operations, len(enrolled)))
+    course_ids = data.course_ids()
+    calls["delete_course"] = [(c,) for c in rnd.sample(course_ids, min(operations, len(course_ids) // 2))]
+    return calls
+
+
+# Returns the statistics of the calls of one method
+def time_calls(method, calls):
+    latencies = []
+    perf_counter_ns = time.perf_counter_ns
+    for args in calls:
+        start = perf_counter_ns()
+        method(*args)
+        latencies.append(perf_counter_ns() - start)
+    latencies.sort()
+    total = sum(latencies)
+    return {
+        "calls": len(latencies),
+        "ops_per_sec": len(latencies) / (total / 1e9) if total else 0.0,
+        "p50_us": latencies[len(latencies) // 2] / 1000,
+        "p99_us": latencies[min(len(latencies) - 1, len(latencies) * 99 // 100)] / 1000,
+    }
+
+
+def run_scale(scale, storage, operations, seed):
+    service = CourseServiceImpl(STORAGES[storage]())
+    start = time.perf_counter()
+    data = workload.generate(service, *SCALES[scale], seed=seed)
+    results = {"load_sec": time.perf_counter() - start}
+    for name, calls in make_calls(service, data, operations).items():
+        results[name] = time_calls(getattr(service, name), calls)
+    return results
+
+
+# Prints the change of every method against a previous run; returns the regressions
+# (ops/sec lower by more than threshold)
+def compare(baseline, current, threshold):
+    regressions = []
+    print("%-8s %-32s %14s %14s %9s" % ("scale", "method", "baseline op/s", "current op/s", "change"))
+    for scale, methods in current["results"].items():
+        for name, stats in methods.items():
+            old = baseline["results"].get(scale, {}).get(name)
+            if not isinstance(stats, dict) or old is None:
+                continue
+            change = stats["ops_per_sec"] / old["ops_per_sec"] - 1 if old["ops_per_sec"] else 0.0
+            flag = ""
+            if change < -threshold:
+                regressions.append((scale, name, change))
+                flag = "  REGRESSION"
+            print("%-8s %-32s %14.0f %14.0f %+8.1f%%%s" % (scale, name, old["ops_per_sec"], stats["ops_per_sec"], change * 100, flag))
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark of every CourseService method")
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=["small", "medium"])
+    parser.add_argument("--storage", choices=list(STORAGES), default="dict")
+    parser.add_argument("--operations", type=int, default=2000, help="calls per method")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="save the results as JSON")
+    parser.add_argument("--compare", help="JSON results of a previous run")
+    parser.add_argument("--threshold", type=float, default=0.2, help="slowdown reported as a regression")
+    args = parser.parse_args()
+
+    current = {
+        "python": platform.python_version(),
+        "storage": args.storage,
+        "operations": args.operations,
+        "seed": args.seed,
+        "results": {},
+    }
+    for scale in args.scales:
+        results = current["results"][scale] = run_scale(scale, args.storage, args.operations, args.seed)
+        print("%s: %s courses, %s students, %s assignments/course, %s enrollments/student, %s grades/assignment (loaded in %.2fs)"
+              % ((scale,) + SCALES[scale] + (results["load_sec"],)))
+        print("  %-32s %8s %12s %10s %10s" % ("method", "calls", "ops/sec", "p50 us", "p99 us"))
+        for name, stats in results.items():
+            if isinstance(stats, dict):
+                print("  %-32s %8d %12.0f %10.1f %10.1f" % (name, stats["calls"], stats["ops_per_sec"], stats["p50_us"], stats["p99_us"]))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, current, args.threshold)
+        if regressions:
+            print(str(len(regressions)) + " regression(s)")
+            sys.exit(1)
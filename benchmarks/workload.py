@@ -0,0 +1,62 @@
+# Synthetic datasets for the benchmarks: courses with assignments, students enrolled in
+# several courses, and grades, with configurable sizes and a seed so runs are repeatable.
+import random
+
+
+class Workload:
+    """
+    Ids of a generated dataset, used to build the arguments of the benchmarked calls.
+    """
+
+    def __init__(self, seed):
+        self.rnd = random.Random(seed)
+        self.assignments = {} # course_id -> [assignment_id]
+        self.rosters = {}     # course_id -> [student_id]
+        self.student_ids = []
+
+    def course_ids(self):
+        return list(self.assignments)
+
+    def random_course(self):
+        return self.rnd.choice(list(self.assignments))
+
+    # Returns (course_id, student_id, assignment_id) of an enrolled student
+    def random_submission(self):
+        course_id = self.rnd.choice([c for c in self.assignments if self.rosters[c] and self.assignments[c]])
+        return course_id, self.rnd.choice(self.rosters[course_id]), self.rnd.choice(self.assignments[course_id])
+
+
+# Fills the service; uses the bulk calls, so large datasets load fast
+#   courses, students                 number of courses and students
+#   assignments_per_course
+#   enrollments_per_student           courses of each student (at most courses)
+#   grades_per_assignment             graded students of each assignment (at most the roster)
+def generate(service, courses, students, assignments_per_course, enrollments_per_student, grades_per_assignment, seed=1):
+    workload = Workload(seed)
+    rnd = workload.rnd
+    for i in range(courses):
+        course_id = service.create_course("Course " + str(i)).course_id
+        workload.assignments[course_id] = [
+            service.create_assignment(course_id, "Assignment " + str(j)).assignment_id
+            for j in range(assignments_per_course)
+        ]
+        workload.rosters[course_id] = []
+
+    course_ids = workload.course_ids()
+    enrollments = min(enrollments_per_student, len(course_ids))
+    for i in range(students):
+        student_id = "S" + str(i)
+        workload.student_ids.append(student_id)
+        for course_id in rnd.sample(course_ids, enrollments):
+            workload.rosters[course_id].append(student_id)
+    for course_id, roster in workload.rosters.items():
+        service.enroll_students_bulk(course_id, roster)
+
+    records = []
+    for course_id, roster in workload.rosters.items():
+        for assignment_id in workload.assignments[course_id]:
+            for student_id in rnd.sample(roster, min(grades_per_assignment, len(roster))):
+                records.append((course_id, student_id, assignment_id, rnd.randint(0, 100)))
+    rnd.shuffle(records)
+    service.submit_assignments_bulk(records)
+    return workload
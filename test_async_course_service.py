@@ -0,0 +1,101 @@
+import asyncio
+import inspect
+import unittest
+
+from app.async_course_service import AsyncCourseService
+from app.course_service import CourseService
+from app.course_service_impl import CourseServiceImpl
+
+
+# Counts the calls made to the service
+class CountingCourseService(CourseServiceImpl):
+
+    def __init__(self):
+        super().__init__()
+        self.calls = {}
+
+    def get_top_k_students(self, course_id, k):
+        self.calls["get_top_k_students"] = self.calls.get("get_top_k_students", 0) + 1
+        return super().get_top_k_students(course_id, k)
+
+
+# Run: python -m unittest test_async_course_service.py
+class AsyncCourseServiceTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.service = CountingCourseService()
+        self.async_service = AsyncCourseService(self.service)
+
+    async def asyncTearDown(self):
+        await self.async_service.close()
+
+    # Every method of CourseService is a coroutine
+    def test_mirrors_course_service(self):
+        for name in CourseService.__abstractmethods__:
+            self.assertTrue(inspect.iscoroutinefunction(getattr(AsyncCourseService, name)), name)
+
+    # Identical reads at the same time share one computation
+    async def test_coalesced_reads(self):
+        course = await self.async_service.create_course("Database I")
+        await self.async_service.enroll_students_bulk(course.course_id, ["S1", "S2"])
+
+        results = await asyncio.gather(*[self.async_service.get_top_five_students(course.course_id) for _ in range(50)])
+        self.assertEqual(results, [["S1", "S2"]] * 50)
+        self.assertEqual(self.service.calls["get_top_k_students"], 1)
+        self.assertEqual(self.async_service.stats["coalesced_reads"], 49)
+
+        # Each caller gets its own list: changing one doesn't change the others
+        self.assertEqual(len({id(result) for result in results}), 50)
+        results[0].append("X")
+        self.assertEqual(results[1], ["S1", "S2"])
+        pages = await asyncio.gather(*[self.async_service.get_course_students_page(course.course_id) for _ in range(3)])
+        self.assertIsNot(pages[0], pages[1])
+        self.assertEqual([s.student_id for s in pages[1]], ["S1", "S2"])
+
+        # Later reads run again
+        await self.async_service.get_top_five_students(course.course_id)
+        self.assertEqual(self.service.calls["get_top_k_students"], 2)
+
+    # Writes made together are applied in one step, in order; errors go to their caller only
+    async def test_micro_batched_writes(self):
+        course = await self.async_service.create_course("Database I")
+        batches = self.async_service.stats["write_batches"]
+
+        calls = [self.async_service.enroll_student(course.course_id, "S" + str(i)) for i in range(100)]
+        calls.append(self.async_service.create_course("#invalid"))
+        results = await asyncio.gather(*calls, return_exceptions=True)
+
+        self.assertEqual([s.student_id for s in results[:100]], ["S" + str(i) for i in range(100)])
+        self.assertIsInstance(results[100], ValueError)
+        self.assertEqual(self.async_service.stats["write_batches"], batches + 1)
+        self.assertEqual([s.student_id for s in course.students], ["S" + str(i) for i in range(100)])
+
+    # A read sees the writes made before it, even if they were not awaited yet
+    async def test_read_after_write(self):
+        course = await self.async_service.create_course("Database I")
+        assignment = await self.async_service.create_assignment(course.course_id, "Lab 1")
+        await self.async_service.enroll_student(course.course_id, "S1")
+
+        before = asyncio.ensure_future(self.async_service.get_assignment_grade_avg(course.course_id, assignment.assignment_id))
+        await asyncio.sleep(0) # the first read is running
+        write = asyncio.ensure_future(self.async_service.submit_assignment(course.course_id, "S1", assignment.assignment_id, 90))
+        after = asyncio.ensure_future(self.async_service.get_assignment_grade_avg(course.course_id, assignment.assignment_id))
+
+        self.assertEqual(await after, 90) # not shared with the read made before the write
+        await write
+        self.assertIn(await before, [0, 90])
+
+    # The event loop keeps running while the service works
+    async def test_does_not_block_loop(self):
+        ticks = 0
+        async def tick():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+        ticker = asyncio.ensure_future(tick())
+
+        course = await self.async_service.create_course("Database I")
+        await self.async_service.enroll_students_bulk(course.course_id, ["S" + str(i) for i in range(20000)])
+        ticker.cancel()
+        self.assertGreater(ticks, 1)
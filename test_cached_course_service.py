@@ -0,0 +1,122 @@
+import random
+import unittest
+
+from app.cached_course_service import CachedCourseService
+from app.course_service_impl import CourseServiceImpl
+import test_course
+
+# Run: python -m unittest test_cached_course_service.py
+
+# Same tests as CourseServiceTest, through the cache
+class CachedCourseServiceCourseTest(test_course.CourseServiceTest):
+
+    def setUp(self):
+        self.service = CachedCourseService()
+
+
+class CachedCourseServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.service = CachedCourseService(max_entries=100)
+        self.course_id = self.service.create_course("Database I").course_id
+        self.lab = self.service.create_assignment(self.course_id, "Lab 1").assignment_id
+        self.service.enroll_student(self.course_id, "S1")
+
+    def test_hits_and_misses(self):
+        self.assertEqual(self.service.get_top_five_students(self.course_id), ["S1"])
+        self.assertEqual(self.service.get_top_five_students(self.course_id), ["S1"])
+        self.service.get_student_grade_avg(self.course_id, "S1")
+        self.assertEqual(self.service.stats, {"hits": 1, "misses": 2, "evictions": 0})
+
+        # The returned lists are copies
+        self.service.get_top_five_students(self.course_id).append("X")
+        self.assertEqual(self.service.get_top_five_students(self.course_id), ["S1"])
+
+        # Another course doesn't change the cached results
+        other = self.service.create_course("Algorithms").course_id
+        self.service.enroll_student(other, "S2")
+        hits = self.service.stats["hits"]
+        self.service.get_top_five_students(self.course_id)
+        self.assertEqual(self.service.stats["hits"], hits + 1)
+
+    def test_writes_invalidate(self):
+        course_id = self.course_id
+        top = lambda: self.service.get_top_five_students(course_id)
+        self.assertEqual(self.service.get_assignment_grade_avg(course_id, self.lab), 0)
+        self.assertEqual(top(), ["S1"])
+
+        self.service.enroll_student(course_id, "S2")
+        self.assertEqual(top(), ["S1", "S2"])
+        self.service.submit_assignment(course_id, "S2", self.lab, 90)
+        self.assertEqual(top(), ["S2", "S1"])
+        self.assertEqual(self.service.get_assignment_grade_avg(course_id, self.lab), 90)
+        self.service.submit_assignments_bulk([(course_id, "S1", self.lab, 100), ("bad",)])
+        self.assertEqual(top(), ["S1", "S2"])
+        self.assertEqual(self.service.get_assignment_grade_avg(course_id, self.lab), 95)
+        records = ((course_id, student_id, self.lab, 80) for student_id in ("S1", "S2"))
+        self.service.submit_assignments_bulk(records) # a generator, read once
+        self.assertEqual(self.service.get_assignment_grade_avg(course_id, self.lab), 80)
+        self.service.dropout_student(course_id, "S1")
+        self.assertEqual(top(), ["S2"])
+        self.service.enroll_students_bulk(course_id, ["S3"])
+        self.assertEqual(top(), ["S2", "S3"])
+        self.assertTrue(self.service.delete_course(course_id))
+        self.assertEqual(top(), [])
+
+        # A query cached before the course existed
+        self.assertEqual(self.service.get_top_five_students(course_id + 1), [])
+        new_id = self.service.create_course("Algorithms").course_id
+        self.assertEqual(new_id, course_id + 1)
+        self.service.enroll_student(new_id, "S9")
+        self.assertEqual(self.service.get_top_five_students(new_id), ["S9"])
+
+    def test_lru_eviction(self):
+        service = CachedCourseService(max_entries=3)
+        course_id = service.create_course("Database I").course_id
+        for k in range(3):
+            service.get_top_k_students(course_id, k)
+        service.get_top_k_students(course_id, 0) # most recently used
+        service.get_top_k_students(course_id, 3) # evicts k=1
+        self.assertEqual(len(service), 3)
+        self.assertEqual(service.stats["evictions"], 1)
+        hits = service.stats["hits"]
+        service.get_top_k_students(course_id, 0)
+        service.get_top_k_students(course_id, 1)
+        self.assertEqual(service.stats["hits"], hits + 1)
+        with self.assertRaises(ValueError):
+            CachedCourseService(max_entries=0)
+        with self.assertRaises(ValueError):
+            service.get_top_k_students(course_id, -1)
+
+    # Random changes and queries give the same answers as the service without cache
+    def test_never_stale(self):
+        rnd = random.Random(11)
+        service = CachedCourseService(max_entries=50)
+        reference = CourseServiceImpl()
+        for target in (service, reference):
+            for i in range(4):
+                course_id = target.create_course("Course " + str(i)).course_id
+                target.create_assignment(course_id, "Lab")
+        for _ in range(3000):
+            course_id = rnd.randint(1, 5)
+            student_id = "S" + str(rnd.randrange(8))
+            action = rnd.random()
+            if action < 0.15:
+                calls = [("enroll_student", course_id, student_id)]
+            elif action < 0.2:
+                calls = [("dropout_student", course_id, student_id)]
+            elif action < 0.4:
+                calls = [("submit_assignment", course_id, student_id, course_id, rnd.randint(0, 100))]
+            else:
+                calls = [("get_top_five_students", course_id), ("get_student_grade_avg", course_id, student_id),
+                         ("get_assignment_grade_avg", course_id, course_id), ("get_top_k_students", course_id, 2)]
+            for name, *args in calls:
+                result = getattr(service, name)(*args)
+                expected = getattr(reference, name)(*args)
+                if name.startswith("get"):
+                    self.assertEqual(result, expected)
+        self.assertGreater(service.stats["hits"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import random
+import statistics
+import unittest
+
+from app.course_service_impl import CourseServiceImpl
+from app.columnar_grade_store import ColumnarGradeStore
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Run: python -m unittest test_columnar_grade_store.py
+@unittest.skipIf(np is None, "numpy is not installed")
+class ColumnarGradeStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.service = CourseServiceImpl()
+        self.course = self.service.create_course("Database I")
+        self.other = self.service.create_course("Database II")
+        self.students = ["S" + str(i) for i in range(20)]
+        self.service.enroll_students_bulk(self.course.course_id, self.students)
+        self.service.enroll_students_bulk(self.other.course_id, self.students)
+        self.a1 = self.service.create_assignment(self.course.course_id, "Lab 1")
+        self.a2 = self.service.create_assignment(self.course.course_id, "Lab 2")
+        self.a3 = self.service.create_assignment(self.other.course_id, "Lab 3")
+
+    # Helper: grades of an assignment as saved in the service
+    def grades_of(self, assignment_id):
+        return [g.grade for g in self.service.grade_list if g.assignment.assignment_id == assignment_id]
+
+    # Statistics match statistics/numpy computed from the grade list, also after overrides and dropouts
+    def test_assignment_stats(self):
+        self.service.submit_assignment(self.course.course_id, "S0", self.a1.assignment_id, 50) # before attach
+        store = ColumnarGradeStore.attach(self.service, capacity=4) # small capacity: arrays grow
+
+        rnd = random.Random(3)
+        for _ in range(200):
+            student_id = rnd.choice(self.students)
+            assignment = rnd.choice([self.a1, self.a2, self.a3])
+            self.service.submit_assignment(assignment.course.course_id, student_id, assignment.assignment_id, rnd.randint(0, 100))
+        self.service.dropout_student(self.course.course_id, "S1")
+        self.service.dropout_student(self.course.course_id, "S2")
+        self.assertEqual(len(store), len(self.service.grade_list))
+
+        stats = store.assignment_stats(self.course.course_id, percentiles=(10, 90))
+        self.assertEqual(sorted(stats), [self.a1.assignment_id, self.a2.assignment_id])
+        for assignment_id, s in stats.items():
+            grades = self.grades_of(assignment_id)
+            self.assertEqual(s["count"], len(grades))
+            self.assertAlmostEqual(s["mean"], statistics.mean(grades))
+            self.assertAlmostEqual(s["std"], statistics.pstdev(grades))
+            self.assertAlmostEqual(s["median"], statistics.median(grades))
+            self.assertEqual(s["min"], min(grades))
+            self.assertEqual(s["max"], max(grades))
+            self.assertAlmostEqual(s["percentiles"][90], float(np.percentile(grades, 90)))
+
+        course_grades = self.grades_of(self.a1.assignment_id) + self.grades_of(self.a2.assignment_id)
+        course_stats = store.course_stats(self.course.course_id)
+        self.assertEqual(course_stats["count"], len(course_grades))
+        self.assertAlmostEqual(course_stats["median"], statistics.median(course_grades))
+
+        histograms = store.assignment_histograms(self.course.course_id, bins=10)
+        expected = np.histogram(self.grades_of(self.a2.assignment_id), bins=10, range=(0, 100))[0].tolist()
+        self.assertEqual(histograms[self.a2.assignment_id], expected)
+        self.assertEqual(sum(store.course_histogram(self.course.course_id)), len(course_grades))
+
+    # Each course keeps its own rows, found by integer keys
+    def test_rows_by_course(self):
+        store = ColumnarGradeStore.attach(self.service, capacity=2)
+        for i, student_id in enumerate(self.students):
+            self.service.submit_assignment(self.course.course_id, student_id, self.a1.assignment_id, i)
+        self.service.submit_assignment(self.other.course_id, "S0", self.a3.assignment_id, 80)
+        self.service.submit_assignment(self.other.course_id, "S0", self.a3.assignment_id, 90) # override
+        self.assertEqual(len(store), len(self.students) + 1)
+        self.assertEqual(store.courses[self.course.course_id].size, len(self.students))
+        self.assertEqual(store.courses[self.other.course_id].size, 1)
+        self.assertTrue(all(type(key) is int for columns in store.courses.values() for key in columns.rows))
+
+        self.service.dropout_student(self.course.course_id, "S0") # moves the last row into its place
+        assignments, grades = store.course_columns(self.course.course_id)
+        self.assertEqual(grades.tolist(), list(range(1, len(self.students))))
+        self.assertEqual(store.course_stats(self.other.course_id)["max"], 90)
+
+    # Deleting a course removes its grades from the store
+    def test_delete_course(self):
+        store = ColumnarGradeStore.attach(self.service)
+        self.service.submit_assignment(self.course.course_id, "S0", self.a1.assignment_id, 70)
+        self.service.submit_assignment(self.other.course_id, "S0", self.a3.assignment_id, 80)
+
+        self.service.delete_course(self.course.course_id)
+        self.assertEqual(len(store), 1)
+        self.assertEqual(store.assignment_stats(self.course.course_id), {})
+        self.assertIsNone(store.course_stats(self.course.course_id))
+        self.assertEqual(store.course_stats(self.other.course_id)["mean"], 80.0)
+        self.assertNotIn(self.course.course_id, store.courses)
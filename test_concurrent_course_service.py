@@ -0,0 +1,195 @@
+import math
+import os
+import random
+import sys
+import tempfile
+import threading
+import unittest
+
+from app.concurrent_course_service import ConcurrentCourseService
+from app.course_service_impl import CourseServiceImpl
+from app.rwlock import ReadWriteLock
+import test_course
+
+# Run: python -m unittest test_concurrent_course_service.py
+
+# Same tests as CourseServiceTest, on one thread
+class ConcurrentCourseServiceSingleThreadTest(test_course.CourseServiceTest):
+
+    def setUp(self):
+        self.service = ConcurrentCourseService()
+
+
+class ConcurrentCourseServiceStressTest(unittest.TestCase):
+
+    THREADS = 8
+    OPERATIONS = 1500
+
+    # Switch threads often, so the operations interleave
+    def setUp(self):
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-5)
+
+    def tearDown(self):
+        sys.setswitchinterval(self.switch_interval)
+
+    # Many threads create courses and change and read them; at the end the ids are unique
+    # and the indexes match the grades
+    def test_stress(self):
+        service = ConcurrentCourseService()
+        for i in range(4):
+            course = service.create_course("Shared " + str(i))
+            service.create_assignment(course.course_id, "Lab")
+        students = ["S" + str(i) for i in range(40)]
+        errors = []
+
+        def work(seed):
+            rnd = random.Random(seed)
+            try:
+                for _ in range(self.OPERATIONS):
+                    courses = service.get_courses()
+                    course = rnd.choice(courses)
+                    course_id = course.course_id
+                    student_id = rnd.choice(students)
+                    operation = rnd.random()
+                    if operation < 0.02:
+                        new_course = service.create_course("Course " + str(seed))
+                        service.create_assignment(new_course.course_id, "Lab")
+                    elif operation < 0.03 and len(courses) > 6:
+                        service.delete_course(course_id)
+                    elif operation < 0.06:
+                        service.create_assignment(course_id, "Lab")
+                    elif operation < 0.25:
+                        service.enroll_student(course_id, student_id)
+                    elif operation < 0.30:
+                        service.dropout_student(course_id, student_id)
+                    elif operation < 0.55:
+                        assignments = list(course.assignments)
+                        if assignments:
+                            assignment = rnd.choice(assignments)
+                            service.submit_assignment(course_id, student_id, assignment.assignment_id, rnd.randint(0, 100))
+                    elif operation < 0.60:
+                        records = []
+                        for other in rnd.sample(courses, min(3, len(courses))):
+                            assignments = list(other.assignments)
+                            if assignments:
+                                records.append((other.course_id, rnd.choice(students),
+                                                rnd.choice(assignments).assignment_id, rnd.randint(0, 100)))
+                        service.submit_assignments_bulk(records)
+                    elif operation < 0.80:
+                        service.get_top_five_students(course_id)
+                    else:
+                        service.get_student_grade_avg(course_id, student_id)
+            except Exception as e: # reported in the main thread
+                errors.append(e)
+
+        threads = [threading.Thread(target=work, args=(seed,)) for seed in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+        # Ids are unique and follow the serials
+        course_ids = [c.course_id for c in service.get_courses()]
+        self.assertEqual(course_ids, sorted(set(course_ids)))
+        self.assertLessEqual(max(course_ids), service.serial_course_id)
+        assignment_ids = [a.assignment_id for a in service.assignment_list]
+        self.assertEqual(len(assignment_ids), len(set(assignment_ids)))
+        self.assertLessEqual(max(assignment_ids), service.serial_assignment_id)
+
+        # Indexes match the grades
+        for course in service.get_courses():
+            self.assertIn(course.course_id, service.course_locks)
+            expected = []
+            for student in course.students:
+                self.assertIn(course, student.courses)
+                grades = [g.grade for g in service.grade_list
+                          if g.course is course and g.student is student]
+                average = math.floor(sum(grades) / len(grades)) if grades else 0
+                self.assertEqual(service.get_student_grade_avg(course.course_id, student.student_id), average)
+                expected.append((student.student_id, average))
+            expected.sort(key=lambda x: x[1], reverse=True)
+            self.assertEqual(service.get_top_k_students(course.course_id, 100), [x[0] for x in expected])
+        for grade in service.grade_list:
+            self.assertIn(grade.student, grade.course.students)
+            self.assertIs(service.get_course_by_id(grade.course.course_id), grade.course)
+
+    # A snapshot taken while threads write is consistent
+    def test_snapshot_while_writing(self):
+        service = ConcurrentCourseService()
+        course = service.create_course("Database I")
+        assignment = service.create_assignment(course.course_id, "Lab")
+        stop = threading.Event()
+
+        def write():
+            i = 0
+            while not stop.is_set():
+                student_id = "S" + str(i % 50)
+                service.enroll_student(course.course_id, student_id)
+                service.submit_assignment(course.course_id, student_id, assignment.assignment_id, i % 101)
+                i += 1
+
+        thread = threading.Thread(target=write)
+        thread.start()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "snapshot.bin")
+            for _ in range(5):
+                service.save_snapshot(path)
+                loaded = CourseServiceImpl.load_snapshot(path)
+                for grade in loaded.grade_list:
+                    self.assertIn(grade.student, grade.course.students)
+        stop.set()
+        thread.join()
+
+    # A restored course has its lock, so concurrent writes to it are not lost
+    def test_load_snapshot_locks_courses(self):
+        service = ConcurrentCourseService()
+        course_ids = [service.create_course("Course " + str(i)).course_id for i in range(3)]
+        assignment = service.create_assignment(course_ids[0], "Lab")
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "snapshot.bin")
+            service.save_snapshot(path)
+            loaded = ConcurrentCourseService.load_snapshot(path)
+        self.assertIsInstance(loaded, ConcurrentCourseService)
+        self.assertEqual(sorted(loaded.course_locks), course_ids)
+        self.assertTrue(all(isinstance(lock, ReadWriteLock) for lock in loaded.course_locks.values()))
+
+        course_id = course_ids[0]
+        def write(start):
+            for i in range(start, start + 50):
+                student_id = "S" + str(i)
+                loaded.enroll_student(course_id, student_id)
+                loaded.submit_assignment(course_id, student_id, assignment.assignment_id, i % 101)
+        threads = [threading.Thread(target=write, args=(50 * i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(loaded.get_course_by_id(course_id).students), 200)
+        self.assertEqual(len(loaded.get_top_k_students(course_id, 1000)), 200)
+        self.assertEqual(loaded.get_assignment_grade_avg(course_id, assignment.assignment_id),
+                         math.floor(sum(i % 101 for i in range(200)) / 200))
+
+
+class ReadWriteLockTest(unittest.TestCase):
+
+    # Readers share the lock, a writer waits for them and blocks new readers
+    def test_readers_and_writer(self):
+        lock = ReadWriteLock()
+        lock.acquire_read()
+        lock.acquire_read() # shared
+        self.assertEqual(lock.readers, 2)
+
+        acquired = threading.Event()
+        def write():
+            with lock.write_lock:
+                acquired.set()
+        writer = threading.Thread(target=write)
+        writer.start()
+        self.assertFalse(acquired.wait(0.05)) # readers hold the lock
+        lock.release_read()
+        lock.release_read()
+        self.assertTrue(acquired.wait(5))
+        writer.join()
+        self.assertFalse(lock.writer)
@@ -1,310 +1,653 @@
-import unittest
-
-from app.course_service_impl import CourseServiceImpl
-from app.course import Course
-from app.assignment import Assignment
-from app.student import Student
-from app.grade import Grade
-
-# Run: python -m unittest test_course.py
-class CourseServiceTest(unittest.TestCase):
-
-    def setUp(self):
-        self.service = CourseServiceImpl()
-
-    # Validate a name (Curse_name, Assignment Name)
-    def test_validate_name(self):
-
-        # Cannot be none
-        self.assertRaises(ValueError, self.service.validate_name, None )
-        
-        # Name should be a string type
-        self.assertRaises( ValueError, self.service.validate_name, 1 )
-        self.assertRaises( ValueError, self.service.validate_name, True )
-        self.assertEqual( self.service.validate_name("A"), "A" ) # Valid
-        
-        # Ate least one character non-space
-        self.assertRaises( ValueError, self.service.validate_name, " " )
-        self.assertRaises( ValueError, self.service.validate_name, "         " )
-
-        # At least one character and Cannot exceed 100
-        self.assertRaises( ValueError, self.service.validate_name, "" ) # lower than 1
-        self.assertRaises( ValueError, self.service.validate_name, "AssignmentAssignmentAssignmentAssignmentAssignmentAssignmentAssignmentAssignmentAssignmentAssignmentA" ) #101 characters
-        self.assertEqual( self.service.validate_name("m"), "m" ) # Valid
-        self.assertEqual( self.service.validate_name("AssignmentAssignmentAssignmentAssignmentAssignmentAssignmentAssignmentAssignmentAssignmentAssignment"), 
-                          "AssignmentAssignmentAssignmentAssignmentAssignmentAssignmentAssignmentAssignmentAssignmentAssignment") #100 characters: Valid
-
-        # Can contain only letters, numbers, :,./&_- and space
-        self.assertRaises( ValueError, self.service.validate_name, "!" ) # invalid
-        self.assertRaises( ValueError, self.service.validate_name, "#" ) # invalid
-        self.assertEqual( self.service.validate_name("Abc9:,./&Z- z_") , "Abc9:,./&Z- z_") # valid
-
-        # Remove left and right space
-        self.assertEqual( self.service.validate_name("    Database    "), "Database" ) # valid
-        self.assertEqual( self.service.validate_name("    object     oriented        programming    "), "object oriented programming" ) # valid
-
-    # Create Course
-    def test_create_course(self):
-        
-        # Create simple couse
-        course_name = "Database I"
-        course = self.service.create_course(course_name)
-        self.assertEqual( 1           , course.course_id  ) # course id
-        self.assertEqual( course_name , course.course_name  ) # course name
-
-        # course_id should be sequential, so the next course should be 2
-        course_name = "Database II"
-        course = self.service.create_course(course_name)
-        self.assertEqual( 2           , course.course_id  ) # course id
-        self.assertEqual( course_name , course.course_name  ) # course name
-
-        # Ensure create_course applies formatting correctly (see test_validate_name() )
-        course_name = "    Database    "
-        course = self.service.create_course(course_name)
-        self.assertEqual(course.course_name, "Database")  # Right/Left spaces removed
-        self.assertEqual(3           , course.course_id  ) # course id
-
-        course_name = "    object     oriented        programming    "
-        course = self.service.create_course(course_name)
-        self.assertEqual(course.course_name, "object oriented programming") # Extra spaces removed
-        self.assertEqual(4           , course.course_id  ) # course id
-    
-    # Get course by id and get all
-    def test_create_and_get_course(self):
-
-        # Create a new course
-        course = self.service.create_course("Database I")
-        self.assertIsInstance(course, Course)
-        self.assertEqual(course.course_name, "Database I")
-        self.assertEqual(course.course_id, 1)
-
-        # Get this course by ID
-        course_search = self.service.get_course_by_id( 1 )
-        self.assertIsInstance(course, Course)
-        self.assertEqual(course.course_name, "Database I")
-        self.assertEqual(course.course_id, 1)
-
-        # Try to get a course that doesn't exist
-        course_search = self.service.get_course_by_id( 100 )
-        self.assertIsNone(course_search)
-
-        # Get list of courses
-        courses = self.service.get_courses()
-        self.assertEqual(len(courses), 1)
-        self.assertEqual(courses[0].course_name, "Database I")
-
-    # Delete course
-    def test_delete_course(self):
-
-        course1 = self.service.create_course("Database I")
-        course2 = self.service.create_course("Database II")
-        result = self.service.delete_course(course1.course_id) # delete Database I
-        self.assertTrue(result) # returns True
-
-        courses = self.service.get_courses()
-        self.assertEqual(len(courses), 1)
-        self.assertEqual(courses[0].course_name, "Database II")
-
-        # Delete a course that doesn't exist
-        result = self.service.delete_course(100)
-        self.assertFalse(result) # returns True
-
-    # create_assignment
-    def test_add_assignment(self):
-        course1 = self.service.create_course("Database I")
-        assignment1 = self.service.create_assignment(course1.course_id, "DBS Project")
-
-        self.assertIsInstance(assignment1, Assignment)
-        self.assertEqual(assignment1.assignment_id, 1) # assignment ID is sequential
-        self.assertEqual(assignment1.assignment_name, "DBS Project")
-
-        # Ensure create_assignment applies formatting correctly (see test_validate_name() )
-        assignment_name = "    DBS Final Test    "
-        assignment2 = self.service.create_assignment(course1.course_id, assignment_name)
-        self.assertEqual(assignment2.assignment_name, "DBS Final Test")  # Right/Left spaces removed
-        self.assertEqual(2 , assignment2.assignment_id  ) # assignment id
-
-        assignment_name = "    DBS     Workshop        10    "
-        assignment3 = self.service.create_assignment(course1.course_id, assignment_name)
-        self.assertEqual(assignment3.assignment_name, "DBS Workshop 10") # Extra spaces removed
-        self.assertEqual(3, assignment3.assignment_id  ) # assignment id
-
-    # Enroll and Dropout student
-    def test_enroll_and_dropout_student(self):
-
-        # Enroll
-        course = self.service.create_course("Database I")
-        student = self.service.enroll_student(course.course_id, "JO01")
-
-        self.assertIsInstance(student, Student)
-        self.assertIn(student, course.students)
-
-        # Enroll invalid course ID
-        result = self.service.enroll_student(100, "JO01")
-        self.assertIsNone(result)
-
-        # Enroll duplicated student
-        self.service.enroll_student(course.course_id, "JO01")
-        # The course should contains only student "JO01"
-        self.assertIsNotNone(course.students)
-        self.assertEqual( len(course.students), 1 ) # one student
-        self.assertEqual( course.students[0].student_id, "JO01" )
-        
-        # Dropout
-        self.service.dropout_student(course.course_id, "JO01")
-        self.assertNotIn(student, course.students)
-
-    # Submit Assignment
-    def test_create_assignment_and_submit_grade(self):
-        
-        course = self.service.create_course("Database I")
-        self.service.enroll_student(course.course_id, "JO01")
-
-        assignment = self.service.create_assignment(course.course_id, "Lab 1")
-        self.assertIsInstance(assignment, Assignment)
-        self.assertEqual(assignment.assignment_name, "Lab 1")
-
-        # Invalid: grade lower than zero
-        with self.assertRaises(ValueError):
-            self.service.submit_assignment(course.course_id, "JO01", assignment.assignment_id, -1)
-        # Invalid: grade > 100
-        with self.assertRaises(ValueError):
-            self.service.submit_assignment(course.course_id, "JO01", assignment.assignment_id, 101)
-        # Invalid: grade not integer
-        with self.assertRaises(ValueError):
-            self.service.submit_assignment(course.course_id, "JO01", assignment.assignment_id, 5.8)
-
-        self.service.submit_assignment(course.course_id, "JO01", assignment.assignment_id, 9)
-        grade = next((g for g in self.service.grade_list if g.student.student_id == "JO01"), None)
-        self.assertIsNotNone(grade)
-        self.assertEqual(grade.grade, 9)
-
-        # Submit a new grade to same course, student and assignment (need to override the previous one)
-        self.service.submit_assignment(course.course_id, "JO01", assignment.assignment_id, 8)
-        grade = next((g for g in self.service.grade_list if g.student.student_id == "JO01"), None)
-        self.assertIsNotNone(grade)
-        self.assertEqual(grade.grade, 8)
-
-    # average grade for an assignment
-    def test_get_assignment_grade_avg(self):
-        course = self.service.create_course("Database I")
-        self.service.enroll_student(course.course_id, "JO01")
-        self.service.enroll_student(course.course_id, "TO01")
-
-        assignment = self.service.create_assignment(course.course_id, "Test")
-        self.service.submit_assignment(course.course_id, "JO01", assignment.assignment_id, 7)
-        self.service.submit_assignment(course.course_id, "TO01", assignment.assignment_id, 9)
-
-        avg = self.service.get_assignment_grade_avg(course.course_id, assignment.assignment_id)
-        self.assertEqual(avg, 8)
-
-    # average grade for an student
-    def test_get_student_grade_avg(self):
-
-        course = self.service.create_course("Database I")
-        self.service.enroll_student(course.course_id, "JO01")
-
-        a1 = self.service.create_assignment(course.course_id, "Midterm")
-        a2 = self.service.create_assignment(course.course_id, "Final")
-        self.service.submit_assignment(course.course_id, "JO01", a1.assignment_id, 6)
-        self.service.submit_assignment(course.course_id, "JO01", a2.assignment_id, 8)
-
-        avg = self.service.get_student_grade_avg(course.course_id, "JO01")
-        self.assertEqual(avg, 7)
-
-    # Top 5 based on grade
-    def test_get_top_five_students(self):
-
-        course = self.service.create_course("Database I")
-        # Enroll students
-        self.service.enroll_student(course.course_id, "S1")
-        self.service.enroll_student(course.course_id, "S2")
-        self.service.enroll_student(course.course_id, "S3")
-        self.service.enroll_student(course.course_id, "S4")
-        self.service.enroll_student(course.course_id, "S5")
-        
-        # Assignment
-        a1 = self.service.create_assignment(course.course_id, "Final Project")
-        self.service.submit_assignment(course.course_id, "S1", a1.assignment_id, 10)
-        self.service.submit_assignment(course.course_id, "S2", a1.assignment_id, 9)
-        self.service.submit_assignment(course.course_id, "S3", a1.assignment_id, 8)
-        self.service.submit_assignment(course.course_id, "S4", a1.assignment_id, 7)
-        self.service.submit_assignment(course.course_id, "S5", a1.assignment_id, 6)
-
-        top_five = self.service.get_top_five_students(course.course_id)
-        self.assertEqual(top_five, ["S1", "S2", "S3", "S4", "S5"])  # Top 5 based on grade
-
-    # Top 5 based on grade (less than 5 students)
-    def test_get_top_five_students_less_than_5_students(self):
-
-        course = self.service.create_course("Database I")
-        # Enroll students
-        self.service.enroll_student(course.course_id, "S1")
-        self.service.enroll_student(course.course_id, "S2")
-        self.service.enroll_student(course.course_id, "S3")
-        
-        # Assignment
-        a1 = self.service.create_assignment(course.course_id, "Final Project")
-        self.service.submit_assignment(course.course_id, "S1", a1.assignment_id, 10)
-        self.service.submit_assignment(course.course_id, "S2", a1.assignment_id, 9)
-        self.service.submit_assignment(course.course_id, "S3", a1.assignment_id, 8)
-
-        top_five = self.service.get_top_five_students(course.course_id)
-        self.assertEqual(top_five, ["S1", "S2", "S3"])  # Top 5 based on grade
-
-    # Top 5 based on grade (more than 5 students)
-    def test_get_top_five_students_more_than_5_students(self):
-
-        course = self.service.create_course("Database I")
-        # Enroll students
-        self.service.enroll_student(course.course_id, "S1")
-        self.service.enroll_student(course.course_id, "S2")
-        self.service.enroll_student(course.course_id, "S3")
-        self.service.enroll_student(course.course_id, "S4")
-        self.service.enroll_student(course.course_id, "S5")
-        self.service.enroll_student(course.course_id, "S6")
-        self.service.enroll_student(course.course_id, "S7")
-        
-        # Assignment
-        a1 = self.service.create_assignment(course.course_id, "Final Project")
-        self.service.submit_assignment(course.course_id, "S1", a1.assignment_id, 10)
-        self.service.submit_assignment(course.course_id, "S2", a1.assignment_id, 9)
-        self.service.submit_assignment(course.course_id, "S3", a1.assignment_id, 8)
-        self.service.submit_assignment(course.course_id, "S4", a1.assignment_id, 7)
-        self.service.submit_assignment(course.course_id, "S5", a1.assignment_id, 6)
-        self.service.submit_assignment(course.course_id, "S6", a1.assignment_id, 5)
-        self.service.submit_assignment(course.course_id, "S7", a1.assignment_id, 4)
-
-        top_five = self.service.get_top_five_students(course.course_id)
-        self.assertEqual(top_five, ["S1", "S2", "S3", "S4", "S5"])  # Top 5 based on grade
-
-    # Top 5 based on grade (many assignments)
-    def test_get_top_five_students_many_assignments(self):
-
-        course = self.service.create_course("Database I")
-
-        # Enroll students
-        self.service.enroll_student(course.course_id, "S1")
-        self.service.enroll_student(course.course_id, "S2")
-        self.service.enroll_student(course.course_id, "S3")
-        self.service.enroll_student(course.course_id, "S4")
-        self.service.enroll_student(course.course_id, "S5")
-        
-        # Assignment 1
-        a1 = self.service.create_assignment(course.course_id, "Final Project")
-        self.service.submit_assignment(course.course_id, "S1", a1.assignment_id, 10)
-        self.service.submit_assignment(course.course_id, "S2", a1.assignment_id, 9)
-        self.service.submit_assignment(course.course_id, "S3", a1.assignment_id, 8)
-        self.service.submit_assignment(course.course_id, "S4", a1.assignment_id, 7)
-        self.service.submit_assignment(course.course_id, "S5", a1.assignment_id, 6)
-
-        # Assignment 2
-        a2 = self.service.create_assignment(course.course_id, "Workshop")
-        self.service.submit_assignment(course.course_id, "S1", a2.assignment_id, 9)
-        self.service.submit_assignment(course.course_id, "S2", a2.assignment_id, 8)
-        self.service.submit_assignment(course.course_id, "S3", a2.assignment_id, 7)
-        self.service.submit_assignment(course.course_id, "S4", a2.assignment_id, 6)
-        self.service.submit_assignment(course.course_id, "S5", a2.assignment_id, 5)
-
-        top_five = self.service.get_top_five_students(course.course_id)
-        self.assertEqual(top_five, ["S1", "S2", "S3", "S4", "S5"])  # Top 5 based on grade
+import unittest
+import math
+import random
+
+from app.course_service_impl import CourseServiceImpl
+from app.course import Course
+from app.assignment import Assignment
+from app.student import Student
+from app.grade import Grade
+from app.page import iterate_pages
+
+# Run: python -m unittest test_course.py
+class CourseServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.service = CourseServiceImpl()
+
+    # Validate a name (Curse_name, Assignment Name)
+    def test_validate_name(self):
+
+        # Cannot be none
+        self.assertRaises(ValueError, self.service.validate_name, None )
+        
+        # Name should be a string type
+        self.assertRaises( ValueError, self.service.validate_name, 1 )
+        self.assertRaises( ValueError, self.service.validate_name, True )
+        self.assertEqual( self.service.validate_name("A"), "A" ) # Valid
+        
+        # Ate least one character non-space
+        self.assertRaises( ValueError, self.service.validate_name, " " )
+        self.assertRaises( ValueError, self.service.validate_name, "         " )
+
+        # At least one character and Cannot exceed 100
+        self.assertRaises( ValueError, self.service.validate_name, "" ) # lower than 1
+        self.assertRaises( ValueError, self.service.validate_name, "AssignmentAssignmentAssignmentAssignmentAssignmentAssignmentAssignmentAssignmentAssignmentAssignmentA" ) #101 characters
+        self.assertEqual( self.service.validate_name("m"), "m" ) # Valid
+        self.assertEqual( self.service.validate_name("AssignmentAssignmentAssignmentAssignmentAssignmentAssignmentAssignmentAssignmentAssignmentAssignment"), 
+                          "AssignmentAssignmentAssignmentAssignmentAssignmentAssignmentAssignmentAssignmentAssignmentAssignment") #100 characters: Valid
+
+        # Can contain only letters, numbers, :,./&_- and space
+        self.assertRaises( ValueError, self.service.validate_name, "!" ) # invalid
+        self.assertRaises( ValueError, self.service.validate_name, "#" ) # invalid
+        self.assertEqual( self.service.validate_name("Abc9:,./&Z- z_") , "Abc9:,./&Z- z_") # valid
+
+        # Remove left and right space
+        self.assertEqual( self.service.validate_name("    Database    "), "Database" ) # valid
+        self.assertEqual( self.service.validate_name("    object     oriented        programming    "), "object oriented programming" ) # valid
+
+    # Create Course
+    def test_create_course(self):
+        
+        # Create simple couse
+        course_name = "Database I"
+        course = self.service.create_course(course_name)
+        self.assertEqual( 1           , course.course_id  ) # course id
+        self.assertEqual( course_name , course.course_name  ) # course name
+
+        # course_id should be sequential, so the next course should be 2
+        course_name = "Database II"
+        course = self.service.create_course(course_name)
+        self.assertEqual( 2           , course.course_id  ) # course id
+        self.assertEqual( course_name , course.course_name  ) # course name
+
+        # Ensure create_course applies formatting correctly (see test_validate_name() )
+        course_name = "    Database    "
+        course = self.service.create_course(course_name)
+        self.assertEqual(course.course_name, "Database")  # Right/Left spaces removed
+        self.assertEqual(3           , course.course_id  ) # course id
+
+        course_name = "    object     oriented        programming    "
+        course = self.service.create_course(course_name)
+        self.assertEqual(course.course_name, "object oriented programming") # Extra spaces removed
+        self.assertEqual(4           , course.course_id  ) # course id
+    
+    # Get course by id and get all
+    def test_create_and_get_course(self):
+
+        # Create a new course
+        course = self.service.create_course("Database I")
+        self.assertIsInstance(course, Course)
+        self.assertEqual(course.course_name, "Database I")
+        self.assertEqual(course.course_id, 1)
+
+        # Get this course by ID
+        course_search = self.service.get_course_by_id( 1 )
+        self.assertIsInstance(course, Course)
+        self.assertEqual(course.course_name, "Database I")
+        self.assertEqual(course.course_id, 1)
+
+        # Try to get a course that doesn't exist
+        course_search = self.service.get_course_by_id( 100 )
+        self.assertIsNone(course_search)
+
+        # Get list of courses
+        courses = self.service.get_courses()
+        self.assertEqual(len(courses), 1)
+        self.assertEqual(courses[0].course_name, "Database I")
+
+    # Delete course
+    def test_delete_course(self):
+
+        course1 = self.service.create_course("Database I")
+        course2 = self.service.create_course("Database II")
+        result = self.service.delete_course(course1.course_id) # delete Database I
+        self.assertTrue(result) # returns True
+
+        courses = self.service.get_courses()
+        self.assertEqual(len(courses), 1)
+        self.assertEqual(courses[0].course_name, "Database II")
+
+        # Delete a course that doesn't exist
+        result = self.service.delete_course(100)
+        self.assertFalse(result) # returns True
+
+    # create_assignment
+    def test_add_assignment(self):
+        course1 = self.service.create_course("Database I")
+        assignment1 = self.service.create_assignment(course1.course_id, "DBS Project")
+
+        self.assertIsInstance(assignment1, Assignment)
+        self.assertEqual(assignment1.assignment_id, 1) # assignment ID is sequential
+        self.assertEqual(assignment1.assignment_name, "DBS Project")
+
+        # Ensure create_assignment applies formatting correctly (see test_validate_name() )
+        assignment_name = "    DBS Final Test    "
+        assignment2 = self.service.create_assignment(course1.course_id, assignment_name)
+        self.assertEqual(assignment2.assignment_name, "DBS Final Test")  # Right/Left spaces removed
+        self.assertEqual(2 , assignment2.assignment_id  ) # assignment id
+
+        assignment_name = "    DBS     Workshop        10    "
+        assignment3 = self.service.create_assignment(course1.course_id, assignment_name)
+        self.assertEqual(assignment3.assignment_name, "DBS Workshop 10") # Extra spaces removed
+        self.assertEqual(3, assignment3.assignment_id  ) # assignment id
+
+    # Enroll and Dropout student
+    def test_enroll_and_dropout_student(self):
+
+        # Enroll
+        course = self.service.create_course("Database I")
+        student = self.service.enroll_student(course.course_id, "JO01")
+
+        self.assertIsInstance(student, Student)
+        self.assertIn(student, course.students)
+
+        # Enroll invalid course ID
+        result = self.service.enroll_student(100, "JO01")
+        self.assertIsNone(result)
+
+        # Enroll duplicated student
+        self.service.enroll_student(course.course_id, "JO01")
+        # The course should contains only student "JO01"
+        self.assertIsNotNone(course.students)
+        self.assertEqual( len(course.students), 1 ) # one student
+        self.assertEqual( course.students[0].student_id, "JO01" )
+        
+        # Dropout
+        self.service.dropout_student(course.course_id, "JO01")
+        self.assertNotIn(student, course.students)
+
+    # Submit Assignment
+    def test_create_assignment_and_submit_grade(self):
+        
+        course = self.service.create_course("Database I")
+        self.service.enroll_student(course.course_id, "JO01")
+
+        assignment = self.service.create_assignment(course.course_id, "Lab 1")
+        self.assertIsInstance(assignment, Assignment)
+        self.assertEqual(assignment.assignment_name, "Lab 1")
+
+        # Invalid: grade lower than zero
+        with self.assertRaises(ValueError):
+            self.service.submit_assignment(course.course_id, "JO01", assignment.assignment_id, -1)
+        # Invalid: grade > 100
+        with self.assertRaises(ValueError):
+            self.service.submit_assignment(course.course_id, "JO01", assignment.assignment_id, 101)
+        # Invalid: grade not integer
+        with self.assertRaises(ValueError):
+            self.service.submit_assignment(course.course_id, "JO01", assignment.assignment_id, 5.8)
+
+        self.service.submit_assignment(course.course_id, "JO01", assignment.assignment_id, 9)
+        grade = next((g for g in self.service.grade_list if g.student.student_id == "JO01"), None)
+        self.assertIsNotNone(grade)
+        self.assertEqual(grade.grade, 9)
+
+        # Submit a new grade to same course, student and assignment (need to override the previous one)
+        self.service.submit_assignment(course.course_id, "JO01", assignment.assignment_id, 8)
+        grade = next((g for g in self.service.grade_list if g.student.student_id == "JO01"), None)
+        self.assertIsNotNone(grade)
+        self.assertEqual(grade.grade, 8)
+
+    # average grade for an assignment
+    def test_get_assignment_grade_avg(self):
+        course = self.service.create_course("Database I")
+        self.service.enroll_student(course.course_id, "JO01")
+        self.service.enroll_student(course.course_id, "TO01")
+
+        assignment = self.service.create_assignment(course.course_id, "Test")
+        self.service.submit_assignment(course.course_id, "JO01", assignment.assignment_id, 7)
+        self.service.submit_assignment(course.course_id, "TO01", assignment.assignment_id, 9)
+
+        avg = self.service.get_assignment_grade_avg(course.course_id, assignment.assignment_id)
+        self.assertEqual(avg, 8)
+
+    # average grade for an student
+    def test_get_student_grade_avg(self):
+
+        course = self.service.create_course("Database I")
+        self.service.enroll_student(course.course_id, "JO01")
+
+        a1 = self.service.create_assignment(course.course_id, "Midterm")
+        a2 = self.service.create_assignment(course.course_id, "Final")
+        self.service.submit_assignment(course.course_id, "JO01", a1.assignment_id, 6)
+        self.service.submit_assignment(course.course_id, "JO01", a2.assignment_id, 8)
+
+        avg = self.service.get_student_grade_avg(course.course_id, "JO01")
+        self.assertEqual(avg, 7)
+
+    # Top 5 based on grade
+    def test_get_top_five_students(self):
+
+        course = self.service.create_course("Database I")
+        # Enroll students
+        self.service.enroll_student(course.course_id, "S1")
+        self.service.enroll_student(course.course_id, "S2")
+        self.service.enroll_student(course.course_id, "S3")
+        self.service.enroll_student(course.course_id, "S4")
+        self.service.enroll_student(course.course_id, "S5")
+        
+        # Assignment
+        a1 = self.service.create_assignment(course.course_id, "Final Project")
+        self.service.submit_assignment(course.course_id, "S1", a1.assignment_id, 10)
+        self.service.submit_assignment(course.course_id, "S2", a1.assignment_id, 9)
+        self.service.submit_assignment(course.course_id, "S3", a1.assignment_id, 8)
+        self.service.submit_assignment(course.course_id, "S4", a1.assignment_id, 7)
+        self.service.submit_assignment(course.course_id, "S5", a1.assignment_id, 6)
+
+        top_five = self.service.get_top_five_students(course.course_id)
+        self.assertEqual(top_five, ["S1", "S2", "S3", "S4", "S5"])  # Top 5 based on grade
+
+    # Top 5 based on grade (less than 5 students)
+    def test_get_top_five_students_less_than_5_students(self):
+
+        course = self.service.create_course("Database I")
+        # Enroll students
+        self.service.enroll_student(course.course_id, "S1")
+        self.service.enroll_student(course.course_id, "S2")
+        self.service.enroll_student(course.course_id, "S3")
+        
+        # Assignment
+        a1 = self.service.create_assignment(course.course_id, "Final Project")
+        self.service.submit_assignment(course.course_id, "S1", a1.assignment_id, 10)
+        self.service.submit_assignment(course.course_id, "S2", a1.assignment_id, 9)
+        self.service.submit_assignment(course.course_id, "S3", a1.assignment_id, 8)
+
+        top_five = self.service.get_top_five_students(course.course_id)
+        self.assertEqual(top_five, ["S1", "S2", "S3"])  # Top 5 based on grade
+
+    # Top 5 based on grade (more than 5 students)
+    def test_get_top_five_students_more_than_5_students(self):
+
+        course = self.service.create_course("Database I")
+        # Enroll students
+        self.service.enroll_student(course.course_id, "S1")
+        self.service.enroll_student(course.course_id, "S2")
+        self.service.enroll_student(course.course_id, "S3")
+        self.service.enroll_student(course.course_id, "S4")
+        self.service.enroll_student(course.course_id, "S5")
+        self.service.enroll_student(course.course_id, "S6")
+        self.service.enroll_student(course.course_id, "S7")
+        
+        # Assignment
+        a1 = self.service.create_assignment(course.course_id, "Final Project")
+        self.service.submit_assignment(course.course_id, "S1", a1.assignment_id, 10)
+        self.service.submit_assignment(course.course_id, "S2", a1.assignment_id, 9)
+        self.service.submit_assignment(course.course_id, "S3", a1.assignment_id, 8)
+        self.service.submit_assignment(course.course_id, "S4", a1.assignment_id, 7)
+        self.service.submit_assignment(course.course_id, "S5", a1.assignment_id, 6)
+        self.service.submit_assignment(course.course_id, "S6", a1.assignment_id, 5)
+        self.service.submit_assignment(course.course_id, "S7", a1.assignment_id, 4)
+
+        top_five = self.service.get_top_five_students(course.course_id)
+        self.assertEqual(top_five, ["S1", "S2", "S3", "S4", "S5"])  # Top 5 based on grade
+
+    # Top 5 based on grade (many assignments)
+    def test_get_top_five_students_many_assignments(self):
+
+        course = self.service.create_course("Database I")
+
+        # Enroll students
+        self.service.enroll_student(course.course_id, "S1")
+        self.service.enroll_student(course.course_id, "S2")
+        self.service.enroll_student(course.course_id, "S3")
+        self.service.enroll_student(course.course_id, "S4")
+        self.service.enroll_student(course.course_id, "S5")
+        
+        # Assignment 1
+        a1 = self.service.create_assignment(course.course_id, "Final Project")
+        self.service.submit_assignment(course.course_id, "S1", a1.assignment_id, 10)
+        self.service.submit_assignment(course.course_id, "S2", a1.assignment_id, 9)
+        self.service.submit_assignment(course.course_id, "S3", a1.assignment_id, 8)
+        self.service.submit_assignment(course.course_id, "S4", a1.assignment_id, 7)
+        self.service.submit_assignment(course.course_id, "S5", a1.assignment_id, 6)
+
+        # Assignment 2
+        a2 = self.service.create_assignment(course.course_id, "Workshop")
+        self.service.submit_assignment(course.course_id, "S1", a2.assignment_id, 9)
+        self.service.submit_assignment(course.course_id, "S2", a2.assignment_id, 8)
+        self.service.submit_assignment(course.course_id, "S3", a2.assignment_id, 7)
+        self.service.submit_assignment(course.course_id, "S4", a2.assignment_id, 6)
+        self.service.submit_assignment(course.course_id, "S5", a2.assignment_id, 5)
+
+        top_five = self.service.get_top_five_students(course.course_id)
+        self.assertEqual(top_five, ["S1", "S2", "S3", "S4", "S5"])  # Top 5 based on grade
+
+    # Overriding a grade keeps its position in grade_list
+    def test_submit_assignment_override_keeps_order(self):
+        course = self.service.create_course("Database I")
+        self.service.enroll_student(course.course_id, "JO01")
+        self.service.enroll_student(course.course_id, "TO01")
+        a1 = self.service.create_assignment(course.course_id, "Lab 1")
+
+        self.service.submit_assignment(course.course_id, "JO01", a1.assignment_id, 6)
+        self.service.submit_assignment(course.course_id, "TO01", a1.assignment_id, 7)
+        self.service.submit_assignment(course.course_id, "JO01", a1.assignment_id, 9) # override
+
+        grades = [(g.student.student_id, g.grade) for g in self.service.grade_list]
+        self.assertEqual(grades, [("JO01", 9), ("TO01", 7)])
+        self.assertEqual(self.service.find_grade(course.course_id, "JO01", a1.assignment_id).grade, 9)
+        self.assertIsNone(self.service.find_grade(course.course_id, "MI01", a1.assignment_id))
+
+    # Dropout and delete course remove the related grades
+    def test_dropout_and_delete_course_remove_grades(self):
+        course1 = self.service.create_course("Database I")
+        course2 = self.service.create_course("Database II")
+        self.service.enroll_student(course1.course_id, "JO01")
+        self.service.enroll_student(course1.course_id, "TO01")
+        self.service.enroll_student(course2.course_id, "JO01")
+        a1 = self.service.create_assignment(course1.course_id, "Lab 1")
+        a2 = self.service.create_assignment(course2.course_id, "Lab 2")
+        self.service.submit_assignment(course1.course_id, "JO01", a1.assignment_id, 6)
+        self.service.submit_assignment(course1.course_id, "TO01", a1.assignment_id, 7)
+        self.service.submit_assignment(course2.course_id, "JO01", a2.assignment_id, 8)
+
+        self.service.dropout_student(course1.course_id, "JO01")
+        self.assertIsNone(self.service.find_grade(course1.course_id, "JO01", a1.assignment_id))
+        grades = [(g.course.course_id, g.student.student_id) for g in self.service.grade_list]
+        self.assertEqual(grades, [(1, "TO01"), (2, "JO01")])
+
+        self.service.delete_course(course2.course_id)
+        self.assertIsNone(self.service.find_grade(course2.course_id, "JO01", a2.assignment_id))
+        grades = [(g.course.course_id, g.student.student_id) for g in self.service.grade_list]
+        self.assertEqual(grades, [(1, "TO01")])
+
+    # Averages follow overrides, dropouts and deleted courses
+    def test_grade_avg_after_override_dropout_and_delete(self):
+        course = self.service.create_course("Database I")
+        self.service.enroll_student(course.course_id, "JO01")
+        self.service.enroll_student(course.course_id, "TO01")
+        a1 = self.service.create_assignment(course.course_id, "Lab 1")
+        a2 = self.service.create_assignment(course.course_id, "Lab 2")
+
+        self.service.submit_assignment(course.course_id, "JO01", a1.assignment_id, 4)
+        self.service.submit_assignment(course.course_id, "TO01", a1.assignment_id, 9)
+        self.service.submit_assignment(course.course_id, "JO01", a2.assignment_id, 7)
+        self.assertEqual(self.service.get_assignment_grade_avg(course.course_id, a1.assignment_id), 6) # 13/2 floored
+        self.assertEqual(self.service.get_student_grade_avg(course.course_id, "JO01"), 5) # 11/2 floored
+
+        # Override JO01 grade for Lab 1
+        self.service.submit_assignment(course.course_id, "JO01", a1.assignment_id, 10)
+        self.assertEqual(self.service.get_assignment_grade_avg(course.course_id, a1.assignment_id), 9) # 19/2 floored
+        self.assertEqual(self.service.get_student_grade_avg(course.course_id, "JO01"), 8) # 17/2 floored
+
+        # Dropout TO01
+        self.service.dropout_student(course.course_id, "TO01")
+        self.assertEqual(self.service.get_assignment_grade_avg(course.course_id, a1.assignment_id), 10)
+        self.assertEqual(self.service.get_student_grade_avg(course.course_id, "TO01"), 0)
+
+        # Delete the course
+        self.service.delete_course(course.course_id)
+        self.assertEqual(self.service.get_assignment_grade_avg(course.course_id, a1.assignment_id), 0)
+        self.assertEqual(self.service.get_student_grade_avg(course.course_id, "JO01"), 0)
+
+    # Top k students, ties ordered by enrollment
+    def test_get_top_k_students(self):
+        course = self.service.create_course("Database I")
+        for student_id in ["S1", "S2", "S3", "S4"]:
+            self.service.enroll_student(course.course_id, student_id)
+        a1 = self.service.create_assignment(course.course_id, "Final Project")
+        self.service.submit_assignment(course.course_id, "S1", a1.assignment_id, 7)
+        self.service.submit_assignment(course.course_id, "S2", a1.assignment_id, 9)
+        self.service.submit_assignment(course.course_id, "S3", a1.assignment_id, 9)
+        # S4 has no grade, average 0
+
+        self.assertEqual(self.service.get_top_k_students(course.course_id, 2), ["S2", "S3"])
+        self.assertEqual(self.service.get_top_k_students(course.course_id, 10), ["S2", "S3", "S1", "S4"])
+        self.assertEqual(self.service.get_top_k_students(course.course_id, 0), [])
+        self.assertEqual(self.service.get_top_k_students(100, 3), []) # course doesn't exist
+        self.assertRaises(ValueError, self.service.get_top_k_students, course.course_id, -1)
+
+        # S2 drops out and enrolls again: it goes after S3 and S1 (no grades anymore)
+        self.service.dropout_student(course.course_id, "S2")
+        self.service.enroll_student(course.course_id, "S2")
+        self.assertEqual(self.service.get_top_k_students(course.course_id, 4), ["S3", "S1", "S4", "S2"])
+
+    # The top students are the same as sorting the students by average (stable sort, enrollment order)
+    def test_get_top_k_students_matches_sort(self):
+        rnd = random.Random(7)
+        course = self.service.create_course("Database I")
+        students = ["S" + str(i) for i in range(30)]
+        for student_id in students:
+            self.service.enroll_student(course.course_id, student_id)
+        assignments = [self.service.create_assignment(course.course_id, "Lab " + str(i)) for i in range(4)]
+
+        for _ in range(300):
+            student_id = rnd.choice(students)
+            operation = rnd.random()
+            if operation < 0.85:
+                assignment = rnd.choice(assignments)
+                self.service.submit_assignment(course.course_id, student_id, assignment.assignment_id, rnd.randint(0, 100))
+            elif operation < 0.95:
+                self.service.dropout_student(course.course_id, student_id)
+            else:
+                self.service.enroll_student(course.course_id, student_id)
+
+            expected = []
+            for student in course.students:
+                grades = [g.grade for g in self.service.grade_list
+                          if g.course.course_id == course.course_id and g.student.student_id == student.student_id]
+                expected.append((student.student_id, math.floor(sum(grades) / len(grades)) if grades else 0))
+            expected.sort(key=lambda x: x[1], reverse=True)
+            self.assertEqual(self.service.get_top_k_students(course.course_id, 10), [x[0] for x in expected[:10]])
+
+    # Bulk enrollment
+    def test_enroll_students_bulk(self):
+        course = self.service.create_course("Database I")
+        self.service.enroll_student(course.course_id, "S2")
+
+        result = self.service.enroll_students_bulk(course.course_id, ["S1", "S2", "S3", "S1"])
+        self.assertEqual(result.applied, 4)
+        self.assertEqual(result.errors, [])
+        self.assertEqual([s.student_id for s in course.students], ["S2", "S1", "S3"]) # no duplicates
+        self.assertIn(course, result.results[0].courses)
+
+        # Invalid course ID: every record is rejected
+        result = self.service.enroll_students_bulk(100, ["S1", "S2"])
+        self.assertEqual(result.applied, 0)
+        self.assertEqual([e[0] for e in result.errors], [0, 1])
+
+    # Bulk grade submission
+    def test_submit_assignments_bulk(self):
+        course1 = self.service.create_course("Database I")
+        course2 = self.service.create_course("Database II")
+        self.service.enroll_students_bulk(course1.course_id, ["S1", "S2", "S3"])
+        a1 = self.service.create_assignment(course1.course_id, "Lab 1")
+        a2 = self.service.create_assignment(course2.course_id, "Lab 2")
+
+        result = self.service.submit_assignments_bulk([
+            (course1.course_id, "S1", a1.assignment_id, 6),
+            (course1.course_id, "S2", a1.assignment_id, 9),
+            (course1.course_id, "S1", a1.assignment_id, 10),  # override
+            (course1.course_id, "S3", a1.assignment_id, 101), # invalid grade
+            (100, "S3", a1.assignment_id, 5),                 # invalid course
+            (course1.course_id, "XX", a1.assignment_id, 5),   # invalid student
+            (course1.course_id, "S3", a2.assignment_id, 5),   # assignment of another course
+            (course2.course_id, "S3", a2.assignment_id, 5),   # student not enrolled
+            (course1.course_id, "S3"),                        # malformed record
+        ])
+        self.assertEqual(result.applied, 3)
+        self.assertEqual([e[0] for e in result.errors], [3, 4, 5, 6, 7, 8])
+
+        self.assertEqual(self.service.get_assignment_grade_avg(course1.course_id, a1.assignment_id), 9) # (10 + 9)/2 floored
+        self.assertEqual(self.service.get_top_five_students(course1.course_id), ["S1", "S2", "S3"])
+        self.assertEqual(len(self.service.grade_list), 2)
+
+    # Deleting a course releases its assignments, enrollments and grades
+    def test_delete_course_releases_course_data(self):
+        course1 = self.service.create_course("Database I")
+        course2 = self.service.create_course("Database II")
+        student = self.service.enroll_student(course1.course_id, "JO01")
+        self.service.enroll_student(course2.course_id, "JO01")
+        a1 = self.service.create_assignment(course1.course_id, "Lab 1")
+        a2 = self.service.create_assignment(course2.course_id, "Lab 2")
+        self.service.submit_assignment(course1.course_id, "JO01", a1.assignment_id, 6)
+        self.service.submit_assignment(course2.course_id, "JO01", a2.assignment_id, 8)
+
+        self.service.delete_course(course1.course_id)
+        self.assertEqual(self.service.assignment_list, [a2])
+        self.assertEqual(list(student.courses), [course2])
+        self.assertEqual([g.grade for g in self.service.grade_list], [8])
+        self.assertIsNone(self.service.submit_assignment(course1.course_id, "JO01", a1.assignment_id, 7))
+
+    # Pages of courses, by id; the cursor stays valid when courses are added or deleted
+    def test_get_courses_page(self):
+        courses = [self.service.create_course("Course " + str(i)) for i in range(7)]
+        ids = [c.course_id for c in courses]
+
+        page = self.service.get_courses_page(limit=3)
+        self.assertEqual([c.course_id for c in page], ids[:3])
+        self.assertIsNotNone(page.next_cursor)
+        self.assertIsInstance(page.items, tuple) # read-only
+
+        self.service.delete_course(ids[3])
+        created = self.service.create_course("Course 7")
+        page = self.service.get_courses_page(page.next_cursor, 3)
+        self.assertEqual([c.course_id for c in page], ids[4:7])
+        page = self.service.get_courses_page(page.next_cursor, 3)
+        self.assertEqual([c.course_id for c in page], [created.course_id])
+        self.assertIsNone(page.next_cursor)
+
+        self.assertEqual([c.course_id for c in iterate_pages(self.service.get_courses_page, limit=2)],
+                         [c.course_id for c in self.service.get_courses()])
+        self.assertRaises(ValueError, self.service.get_courses_page, None, 0)
+
+    # Pages of the students and assignments of a course, and of the courses of a student
+    def test_get_course_students_and_assignments_pages(self):
+        course = self.service.create_course("Database I")
+        other = self.service.create_course("Database II")
+        for i in range(5):
+            self.service.enroll_student(course.course_id, "S" + str(i))
+            self.service.create_assignment(course.course_id, "Lab " + str(i))
+        for c in (other, course):
+            self.service.enroll_student(c.course_id, "JO01")
+
+        page = self.service.get_course_students_page(course.course_id, limit=2)
+        self.assertEqual([s.student_id for s in page], ["S0", "S1"])
+        self.service.dropout_student(course.course_id, "S1") # the cursor is kept
+        self.service.dropout_student(course.course_id, "S2")
+        page = self.service.get_course_students_page(course.course_id, page.next_cursor, 2)
+        self.assertEqual([s.student_id for s in page], ["S3", "S4"])
+        page = self.service.get_course_students_page(course.course_id, page.next_cursor, 2)
+        self.assertEqual([s.student_id for s in page], ["JO01"])
+        self.assertIsNone(page.next_cursor)
+
+        assignments = list(iterate_pages(self.service.get_course_assignments_page, course.course_id, limit=2))
+        self.assertEqual([a.assignment_name for a in assignments], ["Lab " + str(i) for i in range(5)])
+        page = self.service.get_course_assignments_page(course.course_id, limit=5)
+        self.assertEqual(len(page), 5)
+        self.assertIsNone(page.next_cursor)
+
+        page = self.service.get_student_courses_page("JO01", limit=1)
+        self.assertEqual([c.course_id for c in page], [other.course_id])
+        page = self.service.get_student_courses_page("JO01", page.next_cursor, 1)
+        self.assertEqual([c.course_id for c in page], [course.course_id])
+        self.assertIsNone(page.next_cursor)
+
+        self.assertIsNone(self.service.get_course_students_page(100))
+        self.assertIsNone(self.service.get_course_assignments_page(100))
+        self.assertIsNone(self.service.get_student_courses_page("XX"))
+        self.assertRaises(ValueError, self.service.get_course_students_page, course.course_id, None, -1)
+
+    # Transcript and overall average follow submissions, overrides, dropouts and deletions
+    def test_get_student_transcript_and_overall_avg(self):
+        course1 = self.service.create_course("Database I")
+        course2 = self.service.create_course("Database II")
+        course3 = self.service.create_course("Database III")
+        a1 = self.service.create_assignment(course1.course_id, "Lab 1")
+        a2 = self.service.create_assignment(course1.course_id, "Lab 2")
+        b1 = self.service.create_assignment(course2.course_id, "Lab 1")
+        c1 = self.service.create_assignment(course3.course_id, "Lab 1")
+        for c in (course2, course1, course3):
+            self.service.enroll_student(c.course_id, "JO01")
+        self.service.enroll_student(course1.course_id, "S2")
+        self.assertEqual(self.service.get_student_overall_avg("JO01"), 0)
+
+        self.service.submit_assignment(course1.course_id, "JO01", a2.assignment_id, 70)
+        self.service.submit_assignment(course1.course_id, "JO01", a1.assignment_id, 81)
+        self.service.submit_assignment(course2.course_id, "JO01", b1.assignment_id, 90)
+        self.service.submit_assignment(course3.course_id, "JO01", c1.assignment_id, 10)
+        self.service.submit_assignment(course1.course_id, "S2", a1.assignment_id, 100)
+        self.service.submit_assignment(course1.course_id, "JO01", a2.assignment_id, 71) # override
+        self.assertEqual(self.service.get_student_overall_avg("JO01"), 63) # (71 + 81 + 90 + 10) / 4
+
+        transcript = self.service.get_student_transcript("JO01")
+        self.assertEqual([e.course.course_id for e in transcript], [course2.course_id, course1.course_id, course3.course_id])
+        self.assertEqual([(g.assignment.assignment_id, g.grade) for g in transcript[1].grades],
+                         [(a2.assignment_id, 71), (a1.assignment_id, 81)])
+        self.assertEqual([e.average for e in transcript], [90, 76, 10])
+
+        self.service.dropout_student(course3.course_id, "JO01")
+        self.service.delete_course(course2.course_id)
+        self.assertEqual(self.service.get_student_overall_avg("JO01"), 76)
+        transcript = self.service.get_student_transcript("JO01")
+        self.assertEqual([(e.course.course_id, e.average) for e in transcript], [(course1.course_id, 76)])
+        self.assertEqual(self.service.get_student_overall_avg("S2"), 100)
+
+        self.assertIsNone(self.service.get_student_transcript("XX"))
+        self.assertIsNone(self.service.get_student_overall_avg("XX"))
+
+    # Percentiles, medians and distributions follow overrides, dropouts and deletions
+    def test_grade_percentiles_and_distribution(self):
+        course = self.service.create_course("Database I")
+        a1 = self.service.create_assignment(course.course_id, "Lab 1")
+        a2 = self.service.create_assignment(course.course_id, "Lab 2")
+        self.assertIsNone(self.service.get_assignment_grade_median(course.course_id, a1.assignment_id))
+        self.assertIsNone(self.service.get_assignment_grade_percentile(course.course_id, a1.assignment_id, 50))
+        self.assertEqual(self.service.get_course_grade_distribution(course.course_id), [0] * 101)
+
+        grades = [40, 90, 10, 70, 100]
+        for i, grade in enumerate(grades):
+            self.service.enroll_student(course.course_id, "S" + str(i))
+            self.service.submit_assignment(course.course_id, "S" + str(i), a1.assignment_id, grade)
+        self.service.submit_assignment(course.course_id, "S0", a2.assignment_id, 40)
+
+        percentile = lambda p: self.service.get_assignment_grade_percentile(course.course_id, a1.assignment_id, p)
+        self.assertEqual([percentile(p) for p in (0, 20, 21, 50, 80, 99.5, 100)], [10, 10, 40, 70, 90, 100, 100])
+        self.assertEqual(self.service.get_assignment_grade_median(course.course_id, a1.assignment_id), 70)
+
+        self.service.submit_assignment(course.course_id, "S3", a1.assignment_id, 75) # override 70
+        self.service.dropout_student(course.course_id, "S4")                         # removes 100
+        self.assertEqual(self.service.get_assignment_grade_median(course.course_id, a1.assignment_id), 57) # (40 + 75) / 2
+        self.assertEqual(percentile(100), 90)
+
+        distribution = self.service.get_course_grade_distribution(course.course_id)
+        self.assertEqual(len(distribution), 101)
+        self.assertEqual({g: c for g, c in enumerate(distribution) if c}, {10: 1, 40: 2, 75: 1, 90: 1})
+        distribution[40] = 0 # a copy
+        self.assertEqual(self.service.get_course_grade_distribution(course.course_id)[40], 2)
+
+        self.assertRaises(ValueError, percentile, 101)
+        self.assertRaises(ValueError, percentile, "50")
+        self.service.delete_course(course.course_id)
+        self.assertIsNone(self.service.get_course_grade_distribution(course.course_id))
+        self.assertIsNone(self.service.get_assignment_grade_median(course.course_id, a1.assignment_id))
+
+    # Ranks follow the averages, ties are ordered by enrollment as in get_top_k_students
+    def test_get_student_rank_and_rank_range(self):
+        course = self.service.create_course("Database I")
+        assignment = self.service.create_assignment(course.course_id, "Lab 1")
+        grades = {"S0": 50, "S1": 90, "S2": 50, "S3": None, "S4": 70}
+        for student_id, grade in grades.items():
+            self.service.enroll_student(course.course_id, student_id)
+            if grade is not None:
+                self.service.submit_assignment(course.course_id, student_id, assignment.assignment_id, grade)
+
+        ranked = ["S1", "S4", "S0", "S2", "S3"]
+        self.assertEqual([self.service.get_student_rank(course.course_id, s) for s in ranked], [1, 2, 3, 4, 5])
+        self.assertEqual(self.service.get_students_in_rank_range(course.course_id, 1, 5), self.service.get_top_k_students(course.course_id, 5))
+        self.assertEqual(self.service.get_students_in_rank_range(course.course_id, 2, 3), ["S4", "S0"])
+        self.assertEqual(self.service.get_students_in_rank_range(course.course_id, 5, 9), ["S3"])
+        self.assertEqual(self.service.get_students_in_rank_range(course.course_id, 6, 9), [])
+
+        self.service.submit_assignment(course.course_id, "S2", assignment.assignment_id, 95) # moves up
+        self.service.dropout_student(course.course_id, "S1")
+        self.assertEqual(self.service.get_student_rank(course.course_id, "S2"), 1)
+        self.assertEqual(self.service.get_student_rank(course.course_id, "S3"), 4)
+        self.assertIsNone(self.service.get_student_rank(course.course_id, "S1"))
+        self.assertIsNone(self.service.get_student_rank(100, "S2"))
+        self.assertEqual(self.service.get_students_in_rank_range(100, 1, 3), [])
+
+        self.assertRaises(ValueError, self.service.get_students_in_rank_range, course.course_id, 0, 3)
+        self.assertRaises(ValueError, self.service.get_students_in_rank_range, course.course_id, 3, 2)
+        self.assertRaises(ValueError, self.service.get_students_in_rank_range, course.course_id, 1, "3")
+
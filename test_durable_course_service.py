@@ -0,0 +1,122 @@
+import os
+import tempfile
+import unittest
+
+from app.durable_course_service import DurableCourseService
+from app.operation_log import OperationLog, OperationLogReader
+from app import operation_log
+
+# Run: python -m unittest test_durable_course_service.py
+class DurableCourseServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = self.directory.name
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def open(self, **options):
+        return DurableCourseService(self.path, flush_interval=None, **options)
+
+    # Helper: the state of a service as plain values
+    def state(self, durable):
+        service = durable.service
+        return {
+            "serials": (service.serial_course_id, service.serial_assignment_id),
+            "courses": [(c.course_id, c.course_name, [s.student_id for s in c.students]) for c in service.get_courses()],
+            "assignments": [(a.assignment_id, a.assignment_name) for a in service.assignment_list],
+            "grades": [(g.course.course_id, g.student.student_id, g.assignment.assignment_id, g.grade)
+                       for g in service.grade_list],
+            "top": [service.get_top_five_students(c.course_id) for c in service.get_courses()],
+        }
+
+    # Helper: some changes of every kind
+    def make_changes(self, service, prefix):
+        course1 = service.create_course(prefix + " Database I")
+        course2 = service.create_course(prefix + " Database II")
+        service.create_course(prefix + " Deleted")
+        service.delete_course(course2.course_id + 1)
+        a1 = service.create_assignment(course1.course_id, "Lab 1")
+        a2 = service.create_assignment(course2.course_id, "Lab 2")
+        service.enroll_student(course1.course_id, "JO01")
+        service.enroll_students_bulk(course1.course_id, ["TO01", 42, "MI01"])
+        service.enroll_student(course2.course_id, "JO01")
+        service.submit_assignment(course1.course_id, "JO01", a1.assignment_id, 70)
+        service.submit_assignments_bulk([
+            (course1.course_id, "TO01", a1.assignment_id, 90),
+            (course1.course_id, 42, a1.assignment_id, 80),
+            (course1.course_id, "JO01", a1.assignment_id, 75), # override
+            (course2.course_id, "JO01", a2.assignment_id, 60),
+            (course2.course_id, "XX", a2.assignment_id, 60),   # rejected, not logged
+        ])
+        service.dropout_student(course1.course_id, "MI01")
+        self.assertRaises(ValueError, service.create_course, "#invalid") # not logged, no id used
+
+    # Reopening the directory replays the log
+    def test_replay(self):
+        service = self.open()
+        self.make_changes(service, "A")
+        expected = self.state(service)
+        service.close()
+
+        service = self.open()
+        self.assertEqual(self.state(service), expected)
+        self.assertGreater(service.replayed, 0)
+        # New ids continue after the replayed ones
+        self.assertEqual(service.create_course("Next").course_id, expected["serials"][0] + 1)
+        service.close()
+
+    # A checkpoint saves a snapshot, the log starts again
+    def test_checkpoint(self):
+        service = self.open()
+        self.make_changes(service, "A")
+        service.checkpoint()
+        self.make_changes(service, "B")
+        expected = self.state(service)
+        service.close()
+        self.assertEqual(sorted(os.listdir(self.path)), ["log-00000001.bin", "snapshot-00000001.bin"])
+
+        service = self.open()
+        self.assertEqual(self.state(service), expected)
+        service.close()
+
+    # A frame cut by a crash is ignored and removed
+    def test_torn_record(self):
+        service = self.open()
+        self.make_changes(service, "A")
+        expected = self.state(service)
+        service.close()
+
+        log_path = os.path.join(self.path, "log-00000000.bin")
+        size = os.path.getsize(log_path)
+        with open(log_path, "ab") as file:
+            file.write(operation_log.encode_frame([operation_log.encode(operation_log.CREATE_COURSE, 99, "Cut")])[:-3])
+
+        service = self.open()
+        self.assertEqual(self.state(service), expected)
+        self.assertEqual(os.path.getsize(log_path), size)
+        service.close()
+
+    # Records are written by batch
+    def test_group_commit(self):
+        log_path = os.path.join(self.path, "group.bin")
+        log = OperationLog(log_path, batch_size=3, flush_interval=None)
+        log.append(operation_log.ENROLL_STUDENT, 1, "JO01")
+        log.append(operation_log.ENROLL_STUDENT, 1, "TO01")
+        self.assertEqual(os.path.getsize(log_path), 0) # waiting for the batch
+        log.append(operation_log.DROPOUT_STUDENT, 1, "JO01")
+        self.assertGreater(os.path.getsize(log_path), 0)
+        log.append(operation_log.SUBMIT_ASSIGNMENT, 1, 2, 100, "TO01")
+        log.close() # writes the last record
+        self.assertRaises(ValueError, log.append, operation_log.ENROLL_STUDENT, 1, "LATE") # not acknowledged
+        log.flush()
+        log.close()
+
+        self.assertEqual(list(OperationLogReader(log_path)), [
+            (operation_log.ENROLL_STUDENT, 1, "JO01"),
+            (operation_log.ENROLL_STUDENT, 1, "TO01"),
+            (operation_log.DROPOUT_STUDENT, 1, "JO01"),
+            (operation_log.SUBMIT_ASSIGNMENT, 1, 2, 100, "TO01"),
+        ])
+        self.assertRaises(ValueError, OperationLog, log_path, 0)
@@ -0,0 +1,134 @@
+import os
+import random
+import tempfile
+import unittest
+
+from app.course import Course
+from app.course_service_impl import CourseServiceImpl
+from app.enrollment_index import EnrollmentIndex, EnrollmentView, CourseStudents, StudentCourses
+from app.ordered_set import OrderedSet
+from app.storage import CompactStorage, DictStorage
+from app.student import Student
+
+# Run: python -m unittest test_enrollment_index.py
+class EnrollmentIndexTest(unittest.TestCase):
+
+    # Attaching keeps the members already there, the views list the objects in both directions
+    def test_attach_and_views(self):
+        index = EnrollmentIndex()
+        course = Course(1, "Database I")
+        students = [Student("S" + str(i)) for i in range(3)]
+        course.add_students(students[0])
+        index.attach_course(course)
+        self.assertIsInstance(course.students, CourseStudents)
+        self.assertIsInstance(students[0].courses, StudentCourses)
+
+        course.add_students(students[1])
+        course.add_students(students[2])
+        course.add_students(students[1]) # duplicate
+        self.assertEqual(list(course.students), students)
+        self.assertEqual(list(students[1].courses), [course])
+        self.assertIn(students[2], course.students)
+        self.assertIn(course, students[2].courses)
+        self.assertEqual(course.students[-1], students[2])
+        self.assertEqual(course.students[1:], students[1:])
+
+        students[1].courses.discard(course)
+        self.assertEqual(course.students, [students[0], students[2]])
+        self.assertEqual(course.students[1], students[2])
+        self.assertNotIn(students[1], course.students)
+        self.assertRaises(ValueError, course.students.remove, students[1])
+        self.assertEqual(index.students.key("S2"), 2) # dense keys
+
+        index.detach_course(course)
+        self.assertEqual(len(course.students), 0)
+        self.assertEqual(list(students[0].courses), [])
+
+        # A view must say where its pairs are
+        self.assertRaises(TypeError, EnrollmentView, index, 0)
+
+    # Same contents and pages as OrderedSet after random enrollments and removals
+    def test_matches_ordered_sets(self):
+        rnd = random.Random(11)
+        index = EnrollmentIndex()
+        courses = [Course(i, "Course " + str(i)) for i in range(4)]
+        students = [Student("S" + str(i)) for i in range(30)]
+        for course in courses:
+            index.attach_course(course)
+        expected_students = {course: OrderedSet() for course in courses}
+        expected_courses = {student: OrderedSet() for student in students}
+        for _ in range(3000):
+            course = rnd.choice(courses)
+            student = rnd.choice(students)
+            if rnd.random() < 0.6:
+                course.students.add(student)
+                expected_students[course].add(student)
+                expected_courses[student].add(course)
+            else:
+                student.courses.discard(course)
+                expected_students[course].discard(student)
+                expected_courses[student].discard(course)
+            self.assertEqual(list(course.students), list(expected_students[course]))
+            self.assertEqual(list(student.courses), list(expected_courses[student]))
+            self.assertEqual(len(course.students), len(expected_students[course]))
+
+        # Pages keep their cursor while the course changes
+        course = courses[0]
+        page, cursor = course.students.page(limit=4)
+        self.assertEqual(page, list(expected_students[course])[:4])
+        course.students.discard(page[-1])
+        newcomer = Student("NEW")
+        course.students.add(newcomer)
+        seen = page[:]
+        while cursor is not None:
+            page, cursor = course.students.page(cursor, 4)
+            seen.extend(page)
+        self.assertEqual(seen[4:], [s for s in course.students if s not in seen[:4]])
+        self.assertEqual(seen[-1], newcomer)
+
+    # A service on CompactStorage is saved and loaded with the same enrollments
+    def test_snapshot_round_trip(self):
+        service = CourseServiceImpl(CompactStorage())
+        course1 = service.create_course("Database I")
+        course2 = service.create_course("Database II")
+        service.enroll_students_bulk(course1.course_id, ["S1", "S2", "S3"])
+        service.enroll_student(course2.course_id, "S2")
+        service.dropout_student(course1.course_id, "S1")
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "snapshot.bin")
+            service.save_snapshot(path)
+            loaded = CourseServiceImpl.load_snapshot(path, CompactStorage())
+        course = loaded.get_course_by_id(course1.course_id)
+        self.assertIsInstance(course.students, CourseStudents)
+        self.assertEqual([s.student_id for s in course.students], ["S2", "S3"])
+        self.assertEqual([c.course_id for c in loaded.find_student_by_id("S2").courses], [course1.course_id, course2.course_id])
+
+    # Saved from and loaded into either storage, every roster and every student's courses keep their order
+    def test_snapshot_keeps_enrollment_order(self):
+        rnd = random.Random(5)
+        for storage in (CompactStorage, DictStorage):
+            service = CourseServiceImpl(storage())
+            course_ids = [service.create_course("Course " + str(i)).course_id for i in range(20)]
+            for _ in range(600):
+                course_id = rnd.choice(course_ids)
+                student_id = "S" + str(rnd.randrange(40))
+                if rnd.random() < 0.2:
+                    service.dropout_student(course_id, student_id)
+                else:
+                    service.enroll_student(course_id, student_id)
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "snapshot.bin")
+                service.save_snapshot(path)
+                for loaded_storage in (CompactStorage, DictStorage):
+                    loaded = CourseServiceImpl.load_snapshot(path, loaded_storage())
+                    for student in service.storage.students():
+                        self.assertEqual([c.course_id for c in loaded.find_student_by_id(student.student_id).courses],
+                                         [c.course_id for c in student.courses])
+                    for course in service.get_courses():
+                        self.assertEqual([s.student_id for s in loaded.get_course_by_id(course.course_id).students],
+                                         [s.student_id for s in course.students])
+
+
+if __name__ == "__main__":
+    unittest.main()
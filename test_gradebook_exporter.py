@@ -0,0 +1,118 @@
+import io
+import json
+import unittest
+
+from app.cached_course_service import CachedCourseService
+from app.course_service_impl import CourseServiceImpl
+from app.gradebook_exporter import GradebookExporter
+from app.sqlite_course_service import SqliteCourseService
+from app.storage import ListStorage
+
+# Run: python -m unittest test_gradebook_exporter.py
+
+class GradebookExporterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.service = CourseServiceImpl()
+        self.database = self.service.create_course("Database I").course_id
+        self.dsa = self.service.create_course("Data Structure Algorithm").course_id
+        self.lab1 = self.service.create_assignment(self.database, "Lab 1").assignment_id
+        self.lab2 = self.service.create_assignment(self.database, "Lab 2").assignment_id
+        self.quiz = self.service.create_assignment(self.dsa, "Quiz").assignment_id
+        self.service.enroll_students_bulk(self.database, ["S1", "S2", "S3"])
+        self.service.enroll_student(self.dsa, "S1")
+        self.service.submit_assignment(self.database, "S1", self.lab1, 90)
+        self.service.submit_assignment(self.database, "S1", self.lab2, 71)
+        self.service.submit_assignment(self.database, "S2", self.lab2, 60)
+        self.service.submit_assignment(self.dsa, "S1", self.quiz, 100)
+        self.exporter = GradebookExporter(self.service)
+
+    def test_gradebook_csv(self):
+        out = io.StringIO()
+        self.assertEqual(self.exporter.gradebook(self.database).write_csv(out), 3)
+        self.assertEqual(out.getvalue(),
+                         "student_id,Lab 1,Lab 2,average\n"
+                         "S1,90,71,80\n"
+                         "S2,,60,60\n"
+                         "S3,,,0\n")
+
+    def test_gradebook_jsonl(self):
+        out = io.StringIO()
+        self.exporter.gradebook(self.dsa).write(out, "jsonl")
+        self.assertEqual([json.loads(line) for line in out.getvalue().splitlines()],
+                         [{"student_id": "S1", "Quiz": 100, "average": 100}])
+        with self.assertRaises(ValueError):
+            self.exporter.gradebook(self.dsa).write(out, "xml")
+
+    def test_duplicate_assignment_names(self):
+        lab = self.service.create_assignment(self.database, "Lab 1").assignment_id
+        table = self.exporter.gradebook(self.database)
+        self.assertEqual(table.fields, ["student_id", "Lab 1 #" + str(self.lab1), "Lab 2", "Lab 1 #" + str(lab), "average"])
+
+    def test_roster_and_transcript(self):
+        self.assertEqual(list(self.exporter.roster(self.database)), [
+            {"student_id": "S1", "graded": 2, "average": 80},
+            {"student_id": "S2", "graded": 1, "average": 60},
+            {"student_id": "S3", "graded": 0, "average": 0},
+        ])
+        out = io.StringIO()
+        self.assertEqual(self.exporter.transcript("S1").write_csv(out), 3)
+        self.assertEqual(out.getvalue().splitlines(), [
+            "course_id,course_name,assignment_id,assignment_name,grade",
+            "%d,Database I,%d,Lab 1,90" % (self.database, self.lab1),
+            "%d,Database I,%d,Lab 2,71" % (self.database, self.lab2),
+            "%d,Data Structure Algorithm,%d,Quiz,100" % (self.dsa, self.quiz),
+        ])
+
+    # Enrollments and grades changed during an export don't break it
+    def test_changes_during_export(self):
+        rows = iter(self.exporter.gradebook(self.database))
+        self.assertEqual(next(rows)["student_id"], "S1")
+        self.service.enroll_student(self.database, "S4")
+        self.service.dropout_student(self.database, "S3")
+        self.assertEqual([row["student_id"] for row in rows], ["S2", "S3"])
+
+        rows = iter(self.exporter.roster(self.database))
+        next(rows)
+        self.service.dropout_student(self.database, "S4")
+        self.assertEqual(len(list(rows)), 2)
+
+        rows = iter(self.exporter.transcript("S1"))
+        next(rows)
+        lab3 = self.service.create_assignment(self.database, "Lab 3").assignment_id
+        self.service.submit_assignment(self.database, "S1", lab3, 50)
+        self.service.dropout_student(self.dsa, "S1") # its grades are removed before they are read
+        self.assertEqual([row["assignment_id"] for row in rows], [self.lab2])
+
+    def test_not_found(self):
+        self.assertIsNone(self.exporter.gradebook(99))
+        self.assertIsNone(self.exporter.roster(99))
+        self.assertIsNone(self.exporter.transcript("S99"))
+
+    # Exports read the indexes of the course or student, never the list of all the grades
+    def test_reads_only_indexed_data(self):
+        def scan():
+            raise AssertionError("all grades scanned")
+        self.service.storage.grades = scan
+        self.assertEqual(len(list(self.exporter.gradebook(self.database))), 3)
+        self.assertEqual(len(list(self.exporter.transcript("S1"))), 3)
+
+    def test_list_storage(self):
+        service = CourseServiceImpl(ListStorage())
+        course_id = service.create_course("Database I").course_id
+        lab = service.create_assignment(course_id, "Lab 1").assignment_id
+        service.enroll_student(course_id, "S1")
+        service.submit_assignment(course_id, "S1", lab, 42)
+        self.assertEqual(list(GradebookExporter(service).gradebook(course_id)), [{"student_id": "S1", "Lab 1": 42, "average": 42}])
+
+    # Wrapped services are followed to their storage, a service without one is rejected
+    def test_service_without_storage(self):
+        cached = GradebookExporter(CachedCourseService(self.service))
+        self.assertEqual(len(list(cached.gradebook(self.database))), 3)
+        with SqliteCourseService() as service:
+            self.assertRaisesRegex(TypeError, "SqliteCourseService", GradebookExporter, service)
+            self.assertRaisesRegex(TypeError, "CachedCourseService", GradebookExporter, CachedCourseService(service))
+
+
+if __name__ == "__main__":
+    unittest.main()
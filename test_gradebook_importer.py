@@ -0,0 +1,108 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+
+from app.course_service_impl import CourseServiceImpl
+from app.gradebook_importer import GradebookImporter
+
+# Run: python -m unittest test_gradebook_importer.py
+
+class GradebookImporterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.service = CourseServiceImpl()
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w", newline="") as f:
+            f.write(text)
+        return path
+
+    def test_import_csv(self):
+        path = self.write("grades.csv",
+            "course,assignment,student_id,grade\n"
+            "Database I,Lab 1,S1,90\n"
+            "  Database   I ,Lab 1,S2,70\n"   # same course once the name is normalized
+            "Database I,Lab 2,S1,80\n"
+            "Algorithms,Quiz,S1,101\n"        # grade out of range
+            "Algorithms,Quiz,S3,ten\n"        # not an integer
+            "Algo$,Quiz,S3,50\n"              # invalid name
+            "Algorithms,Quiz,,50\n"           # no student
+            "Algorithms,Quiz,S3,60\n"
+            "Database I,Lab 1,S1,95\n")       # overrides the first grade
+        progress = []
+        rejected_path = os.path.join(self.directory.name, "rejected.csv")
+        importer = GradebookImporter(self.service, batch_size=3, progress=lambda r: progress.append(r.rows),
+                                     rejected_path=rejected_path)
+        report = importer.import_file(path)
+
+        self.assertEqual((report.rows, report.imported, report.rejected), (9, 5, 4))
+        self.assertEqual((report.created_courses, report.created_assignments), (2, 3))
+        self.assertEqual(report.progress, 1.0)
+        self.assertEqual(progress, [3, 9]) # rows read after each batch of 3 valid rows
+        self.assertEqual([line for line, reason in report.samples], [5, 6, 7, 8])
+
+        database, algorithms = self.service.get_courses()
+        self.assertEqual(database.course_name, "Database I")
+        self.assertEqual([s.student_id for s in database.students], ["S1", "S2"])
+        self.assertEqual([s.student_id for s in algorithms.students], ["S3"])
+        lab1 = database.assignments[0]
+        self.assertEqual(self.service.get_assignment_grade_avg(database.course_id, lab1.assignment_id), 82)
+        self.assertEqual(self.service.get_student_grade_avg(algorithms.course_id, "S3"), 60)
+
+        with open(rejected_path, newline="") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0], ["line", "reason", "row"])
+        self.assertEqual([row[0] for row in rows[1:]], ["5", "6", "7", "8"])
+        self.assertEqual(rows[1][1], "Grade must be an integer between 0 and 100.")
+
+    def test_import_jsonl_uses_existing_courses(self):
+        course = self.service.create_course("Database I")
+        lab = self.service.create_assignment(course.course_id, "Lab 1")
+        path = self.write("grades.jsonl",
+            json.dumps({"course": "Database I", "assignment": "Lab 1", "student_id": "S1", "grade": 90}) + "\n"
+            "not json\n"
+            "\n"
+            + json.dumps({"course": "Database I", "assignment": "Lab 1", "student_id": 7, "grade": 40}) + "\n"
+            + json.dumps({"course": "Database I", "assignment": "Lab 1", "grade": 40}) + "\n"
+            + json.dumps({"course": "Database I", "assignment": "Lab 1", "student_id": "S2", "grade": True}) + "\n")
+        report = GradebookImporter(self.service).import_file(path)
+
+        self.assertEqual((report.rows, report.imported, report.rejected), (5, 2, 3))
+        self.assertEqual((report.created_courses, report.created_assignments), (0, 0))
+        self.assertEqual(report.samples, [(2, "Row is not a JSON object"), (5, "Missing student_id"),
+                                          (6, "Grade must be an integer between 0 and 100.")])
+        self.assertEqual(len(self.service.get_courses()), 1)
+        self.assertEqual(self.service.get_assignment_grade_avg(course.course_id, lab.assignment_id), 65)
+
+    def test_without_create(self):
+        course = self.service.create_course("Database I")
+        self.service.create_assignment(course.course_id, "Lab 1")
+        rows = [
+            (1, {"course": "Database I", "assignment": "Lab 1", "student_id": "S1", "grade": 50}),
+            (2, {"course": "Database II", "assignment": "Lab 1", "student_id": "S1", "grade": 50}),
+            (3, {"course": "Database I", "assignment": "Lab 9", "student_id": "S1", "grade": 50}),
+        ]
+        report = GradebookImporter(self.service, create=False).import_rows(iter(rows))
+        self.assertEqual(report.imported, 1)
+        self.assertEqual(report.samples, [(2, "Course not found"), (3, "Assignment not found in course")])
+
+    def test_columns(self):
+        path = self.write("grades.csv", "Class;Work;Learner;Score\nDatabase I;Lab 1;S1;88\n")
+        importer = GradebookImporter(self.service, columns={"course": "Class", "assignment": "Work",
+                                                            "student_id": "Learner", "grade": "Score"})
+        with self.assertRaises(ValueError):
+            importer.import_file(path, format="xml")
+        rows = csv.DictReader(["Class,Work,Learner,Score", "Database I,Lab 1,S1,88"])
+        report = importer.import_rows(enumerate(rows, 2))
+        self.assertEqual(report.imported, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import random
+import unittest
+
+from app.course_service_impl import CourseServiceImpl
+from app.instrumentation import InstrumentedCourseService, LatencyHistogram
+import test_course
+
+# Run: python -m unittest test_instrumentation.py
+
+# Same tests as CourseServiceTest, through the proxy
+class InstrumentedCourseServiceTest(test_course.CourseServiceTest):
+
+    def setUp(self):
+        self.service = InstrumentedCourseService(CourseServiceImpl(), sample_every=1)
+
+
+class InstrumentationTest(unittest.TestCase):
+
+    def test_counts_and_errors(self):
+        service = InstrumentedCourseService(CourseServiceImpl(), sample_every=4)
+        course = service.create_course("Database I")
+        service.create_assignment(course.course_id, "Lab 1")
+        for i in range(10):
+            service.enroll_student(course.course_id, "S" + str(i))
+        with self.assertRaises(ValueError):
+            service.submit_assignment(course.course_id, "S1", 1, 101)
+        service.submit_assignment(course.course_id, "S1", 1, 90)
+
+        snapshot = service.instrumentation.snapshot()
+        methods = snapshot["methods"]
+        self.assertEqual(methods["enroll_student"]["calls"], 10)
+        self.assertEqual(methods["enroll_student"]["timed"], 2) # 1 of every 4
+        self.assertEqual(methods["submit_assignment"]["calls"], 2)
+        self.assertEqual(methods["submit_assignment"]["errors"], 1)
+        self.assertEqual(methods["get_courses"]["calls"], 0)
+        self.assertEqual(snapshot["collections"],
+                         {"course_list": 1, "assignment_list": 1, "student_list": 10, "grade_list": 1})
+
+        service.reset()
+        self.assertEqual(service.instrumentation.snapshot()["methods"]["enroll_student"]["calls"], 0)
+        service.enroll_student(course.course_id, "S10")
+        self.assertEqual(service.instrumentation.snapshot()["methods"]["enroll_student"]["calls"], 1)
+        with self.assertRaises(ValueError):
+            InstrumentedCourseService(CourseServiceImpl(), sample_every=0)
+
+    # The percentiles are within the bucket precision of the exact ones
+    def test_histogram_percentiles(self):
+        rnd = random.Random(3)
+        histogram = LatencyHistogram()
+        values = [int(rnd.lognormvariate(10, 2)) for _ in range(5000)]
+        for value in values:
+            histogram.record(value)
+        values.sort()
+        self.assertEqual(histogram.count, len(values))
+        for q in (0.5, 0.9, 0.99, 1.0):
+            exact = values[max(0, int(len(values) * q + 0.999999) - 1)]
+            self.assertGreaterEqual(histogram.percentile(q), exact)
+            self.assertLessEqual(histogram.percentile(q), exact * (1 + 1 / LatencyHistogram.SUB_COUNT))
+        self.assertEqual(LatencyHistogram().percentile(0.5), 0)
+        self.assertEqual(sum(count for limit, count in histogram.buckets()), len(values))
+
+    def test_prometheus_text(self):
+        service = InstrumentedCourseService(CourseServiceImpl(), sample_every=1)
+        course = service.create_course("Database I")
+        service.get_course_by_id(course.course_id)
+        service.get_course_by_id(course.course_id)
+        text = service.instrumentation.prometheus_text()
+        lines = text.splitlines()
+        self.assertIn("# TYPE course_service_latency_seconds histogram", lines)
+        self.assertIn('course_service_calls_total{method="get_course_by_id"} 2', lines)
+        self.assertIn('course_service_errors_total{method="get_course_by_id"} 0', lines)
+        self.assertIn('course_service_latency_seconds_bucket{method="get_course_by_id",le="+Inf"} 2', lines)
+        self.assertIn('course_service_latency_seconds_count{method="get_course_by_id"} 2', lines)
+        self.assertIn('course_service_collection_size{collection="course_list"} 1', lines)
+        for line in lines:
+            if not line.startswith("#"):
+                name, value = line.rsplit(" ", 1)
+                float(value)
+
+
+if __name__ == "__main__":
+    unittest.main()
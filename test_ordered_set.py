@@ -0,0 +1,61 @@
+import unittest
+
+from app.ordered_set import OrderedSet
+
+# Run: python -m unittest test_ordered_set.py
+class OrderedSetTest(unittest.TestCase):
+
+    # Keeps insertion order and ignores duplicates
+    def test_add_and_order(self):
+        items = OrderedSet()
+        items.add("b")
+        items.add("a")
+        items.add("c")
+        items.add("a") # duplicate
+        self.assertEqual(list(items), ["b", "a", "c"])
+        self.assertEqual(len(items), 3)
+        self.assertIn("a", items)
+        self.assertNotIn("d", items)
+
+    # Removing keeps the order of the other items
+    def test_remove(self):
+        items = OrderedSet(["a", "b", "c"])
+        items.remove("b")
+        self.assertEqual(list(items), ["a", "c"])
+        self.assertRaises(ValueError, items.remove, "b") # not in the set, as list.remove
+        items.discard("b") # no error
+        items.add("b")
+        self.assertEqual(list(items), ["a", "c", "b"])
+
+    # Indexing as a list
+    def test_getitem(self):
+        items = OrderedSet(["a", "b", "c"])
+        self.assertEqual(items[0], "a")
+        self.assertEqual(items[1], "b")
+        self.assertEqual(items[-1], "c")
+        self.assertEqual(items[1:], ["b", "c"])
+        self.assertRaises(IndexError, items.__getitem__, 3)
+        self.assertRaises(IndexError, OrderedSet().__getitem__, 0)
+        self.assertEqual(items, ["a", "b", "c"])
+
+    # Pages after a cursor; the cursor stays valid when items are added or removed
+    def test_page(self):
+        items = OrderedSet(range(10))
+        page, cursor = items.page(limit=4)
+        self.assertEqual(page, [0, 1, 2, 3])
+        items.discard(3) # last item of the page
+        items.discard(4)
+        items.add(10)
+        page, cursor = items.page(cursor, 4)
+        self.assertEqual(page, [5, 6, 7, 8])
+        page, cursor = items.page(cursor, 4)
+        self.assertEqual(page, [9, 10])
+        self.assertIsNone(cursor)
+
+        for i in range(9): # compacts the order list
+            items.discard(i)
+        self.assertEqual(list(items), [9, 10])
+        self.assertEqual(items[1], 10)
+        self.assertEqual(items.page(limit=1), ([9], items.seq_of(9)))
+        self.assertEqual(OrderedSet().page(), ([], None))
+
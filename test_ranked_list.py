@@ -0,0 +1,62 @@
+import random
+import unittest
+
+from app.ranked_list import RankedList
+
+
+class SmallRankedList(RankedList):
+    __slots__ = ()
+    LOAD = 4
+
+
+# Run: python -m unittest test_ranked_list.py
+class RankedListTest(unittest.TestCase):
+
+    # Items stay sorted, positions are found by item and items by position
+    def test_add_remove_and_positions(self):
+        items = RankedList([5, 1, 3])
+        items.add(4)
+        items.add(0)
+        self.assertEqual(list(items), [0, 1, 3, 4, 5])
+        self.assertEqual(items.index(4), 3)
+        self.assertEqual(items[1], 1)
+        self.assertEqual(items[-1], 5)
+        self.assertEqual(list(items.range(1, 3)), [1, 3])
+        self.assertEqual(list(items.range(3, 10)), [4, 5])
+        self.assertEqual(list(items.range(4, 2)), [])
+
+        items.remove(3)
+        self.assertEqual(items.index(4), 2)
+        self.assertEqual(len(items), 4)
+        self.assertRaises(ValueError, items.remove, 3) # as list.remove
+        self.assertRaises(ValueError, items.index, 9)
+        self.assertRaises(IndexError, items.__getitem__, 4)
+        self.assertEqual(list(RankedList().range(0, 5)), [])
+
+    # Same answers as a sorted list, with small blocks so they split and empty often
+    def test_matches_sorted_list(self):
+        rnd = random.Random(7)
+        items = SmallRankedList()
+        expected = []
+        for _ in range(3000):
+            if expected and rnd.random() < 0.45:
+                item = rnd.choice(expected)
+                items.remove(item)
+                expected.remove(item)
+            else:
+                item = rnd.randrange(200)
+                items.add(item)
+                expected.append(item)
+                expected.sort()
+            self.assertEqual(len(items), len(expected))
+            if expected:
+                i = rnd.randrange(len(expected))
+                self.assertEqual(items[i], expected[i])
+                self.assertEqual(items.index(expected[i]), expected.index(expected[i]))
+                self.assertEqual(list(items.range(i, i + 5)), expected[i:i + 5])
+        items.extend([3, 1, 2])
+        self.assertEqual(list(items), sorted(expected + [3, 1, 2]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,173 @@
+import random
+import threading
+import unittest
+
+from app.course_service_impl import CourseServiceImpl
+from app.sharded_course_service import ShardedCourseService
+from app.page import iterate_pages
+
+# Run: python -m unittest test_sharded_course_service.py
+
+class ShardedCourseServiceTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.service = ShardedCourseService(3)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.service.close()
+
+    def test_ids_are_unique_across_shards(self):
+        courses = [self.service.create_course("Sharded " + str(i)) for i in range(6)]
+        course_ids = [c.course_id for c in courses]
+        self.assertEqual(course_ids, list(range(course_ids[0], course_ids[0] + 6)))
+        self.assertEqual(len({self.service.shard_of(course_id) for course_id in course_ids}), 3)
+
+        assignment_ids = [self.service.create_assignment(course_id, "Lab").assignment_id for course_id in course_ids]
+        self.assertEqual(assignment_ids, list(range(assignment_ids[0], assignment_ids[0] + 6)))
+        # A failed creation doesn't use an id
+        self.assertIsNone(self.service.create_assignment(-1, "Lab"))
+        with self.assertRaises(ValueError):
+            self.service.create_assignment(course_ids[0], "")
+        self.assertEqual(self.service.create_assignment(course_ids[0], "Lab 2").assignment_id, assignment_ids[-1] + 1)
+
+        listed = [c.course_id for c in self.service.get_courses()]
+        self.assertEqual([i for i in listed if i in course_ids], course_ids)
+        with self.assertRaises(ValueError):
+            self.service.create_course("  ")
+
+    def test_student_in_courses_of_several_shards(self):
+        courses = [self.service.create_course("Cross " + str(i)).course_id for i in range(3)]
+        for course_id in courses:
+            student = self.service.enroll_student(course_id, "CROSS")
+        self.assertEqual([c.course_id for c in student.courses], courses)
+
+        self.assertTrue(self.service.dropout_student(courses[1], "CROSS"))
+        self.assertTrue(self.service.delete_course(courses[2]))
+        student = self.service.enroll_student(courses[0], "CROSS")
+        self.assertEqual([c.course_id for c in student.courses], [courses[0]])
+        self.assertFalse(self.service.delete_course(courses[2]))
+
+        # The course lists its students and assignments; the copies don't reach further
+        self.service.create_assignment(courses[0], "Quiz")
+        course = self.service.get_course_by_id(courses[0])
+        self.assertEqual([s.student_id for s in course.students], ["CROSS"])
+        self.assertEqual([a.assignment_name for a in course.assignments], ["Quiz"])
+        self.assertIs(course.assignments[0].course, course)
+
+    # Same calls on ShardedCourseService and CourseServiceImpl give the same answers
+    def test_matches_course_service_impl(self):
+        rnd = random.Random(5)
+        service = ShardedCourseService(4)
+        reference = CourseServiceImpl()
+        try:
+            assignments = {}
+            for i in range(8):
+                course_id = service.create_course("Course " + str(i)).course_id
+                self.assertEqual(reference.create_course("Course " + str(i)).course_id, course_id)
+                students = ["S" + str(s) for s in range(i, 40, 3)]
+                result = service.enroll_students_bulk(course_id, students)
+                reference.enroll_students_bulk(course_id, students)
+                self.assertEqual(len(result.results), len(students))
+                assignments[course_id] = []
+                for j in range(3):
+                    assignment_id = service.create_assignment(course_id, "Lab " + str(j)).assignment_id
+                    reference.create_assignment(course_id, "Lab " + str(j))
+                    assignments[course_id].append(assignment_id)
+
+            records = []
+            for _ in range(2000):
+                course_id = rnd.choice(list(assignments) + [99])
+                records.append((course_id, "S" + str(rnd.randrange(40)),
+                                rnd.choice(assignments.get(course_id, [1])), rnd.randint(-5, 100)))
+            records.append(("bad",))
+            result = service.submit_assignments_bulk(records)
+            expected = reference.submit_assignments_bulk(records)
+            self.assertEqual(result.errors, expected.errors)
+            self.assertEqual([(g.course.course_id, g.student.student_id, g.assignment.assignment_id, g.grade) for g in result.results],
+                             [(g.course.course_id, g.student.student_id, g.assignment.assignment_id, g.grade) for g in expected.results])
+
+            for course_id, assignment_ids in assignments.items():
+                self.assertEqual(service.get_top_five_students(course_id), reference.get_top_five_students(course_id))
+                self.assertEqual(service.get_top_k_students(course_id, 12), reference.get_top_k_students(course_id, 12))
+                self.assertEqual(service.get_students_in_rank_range(course_id, 4, 9), reference.get_students_in_rank_range(course_id, 4, 9))
+                self.assertEqual(service.get_student_rank(course_id, "S5"), reference.get_student_rank(course_id, "S5"))
+                for assignment_id in assignment_ids:
+                    self.assertEqual(service.get_assignment_grade_avg(course_id, assignment_id),
+                                     reference.get_assignment_grade_avg(course_id, assignment_id))
+                    self.assertEqual(service.get_assignment_grade_median(course_id, assignment_id),
+                                     reference.get_assignment_grade_median(course_id, assignment_id))
+                self.assertEqual(service.get_course_grade_distribution(course_id), reference.get_course_grade_distribution(course_id))
+                for s in range(40):
+                    self.assertEqual(service.get_student_grade_avg(course_id, "S" + str(s)),
+                                     reference.get_student_grade_avg(course_id, "S" + str(s)))
+            self.assertEqual([c.course_name for c in service.get_courses()], [c.course_name for c in reference.get_courses()])
+
+            # Pages, merged across the shards
+            self.assertEqual([c.course_id for c in iterate_pages(service.get_courses_page, limit=3)],
+                             [c.course_id for c in reference.get_courses()])
+            course_id = next(iter(assignments))
+            self.assertEqual([s.student_id for s in iterate_pages(service.get_course_students_page, course_id, limit=4)],
+                             [s.student_id for s in reference.get_course_by_id(course_id).students])
+            self.assertEqual([a.assignment_id for a in iterate_pages(service.get_course_assignments_page, course_id, limit=2)],
+                             assignments[course_id])
+            for s in ("S0", "S7"):
+                self.assertEqual([c.course_id for c in iterate_pages(service.get_student_courses_page, s, limit=1)],
+                                 [c.course_id for c in reference.find_student_by_id(s).courses])
+                self.assertEqual(service.get_student_overall_avg(s), reference.get_student_overall_avg(s))
+                self.assertEqual([(e.course.course_id, [g.grade for g in e.grades], e.average) for e in service.get_student_transcript(s)],
+                                 [(e.course.course_id, [g.grade for g in e.grades], e.average) for e in reference.get_student_transcript(s)])
+        finally:
+            service.close()
+
+    # Courses created and deleted while other threads list the courses of a student
+    def test_concurrent_create_and_delete(self):
+        kept = self.service.create_course("Kept").course_id
+        errors = []
+        created = []
+        stop = threading.Event()
+
+        def churn():
+            for i in range(40):
+                course_id = self.service.create_course("Churn " + str(i)).course_id
+                created.append(course_id)
+                self.service.enroll_student(course_id, "CHURN")
+                self.service.delete_course(course_id)
+            stop.set()
+
+        def read():
+            try:
+                while not stop.is_set():
+                    self.service.get_student_courses_page("CHURN")
+                    self.service.enroll_student(kept, "CHURN")
+            except Exception as e:
+                errors.append(e)
+                stop.set()
+
+        threads = [threading.Thread(target=churn), threading.Thread(target=churn)] + [threading.Thread(target=read) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(len(set(created)), 80) # unique ids
+        self.assertEqual([c.course_id for c in self.service.get_student_courses_page("CHURN")], [kept])
+
+        # A course in the courses of a student but without its name yet (being created) is skipped
+        creating = self.service.create_course("Creating").course_id
+        self.service.enroll_student(creating, "CHURN")
+        name = self.service.course_names.pop(creating)
+        try:
+            self.assertEqual([c.course_id for c in self.service.get_student_courses_page("CHURN")], [kept])
+            self.assertEqual([c.course_id for c in self.service.enroll_student(kept, "CHURN").courses], [kept])
+        finally:
+            self.service.course_names[creating] = name
+
+    def test_invalid_shards(self):
+        with self.assertRaises(ValueError):
+            ShardedCourseService(0)
+
+
+if __name__ == "__main__":
+    unittest.main()
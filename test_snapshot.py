@@ -0,0 +1,105 @@
+import os
+import random
+import struct
+import tempfile
+import unittest
+
+from app import snapshot
+from app.course_service_impl import CourseServiceImpl
+
+# Run: python -m unittest test_snapshot.py
+class SnapshotTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "service.snapshot")
+        self.service = CourseServiceImpl()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    # Helper: the state of a service as plain values
+    def state(self, service):
+        return {
+            "serials": (service.serial_course_id, service.serial_assignment_id),
+            "courses": [(c.course_id, c.course_name, [a.assignment_id for a in c.assignments],
+                         [s.student_id for s in c.students]) for c in service.get_courses()],
+            "assignments": [(a.assignment_id, a.assignment_name, a.course.course_id) for a in service.assignment_list],
+            "students": [(s.student_id, [c.course_id for c in s.courses]) for s in service.student_list],
+            "grades": [(g.course.course_id, g.student.student_id, g.assignment.assignment_id, g.grade)
+                       for g in service.grade_list],
+            "top": {c.course_id: service.get_top_k_students(c.course_id, 100) for c in service.get_courses()},
+            "averages": {(c.course_id, s.student_id): service.get_student_grade_avg(c.course_id, s.student_id)
+                         for c in service.get_courses() for s in c.students},
+        }
+
+    # The loaded service has the same objects, order, indexes and serials
+    def test_save_and_load(self):
+        rnd = random.Random(5)
+        courses = [self.service.create_course("Course " + str(i)) for i in range(5)]
+        self.service.delete_course(courses[1].course_id)
+        courses.pop(1)
+        assignments = [self.service.create_assignment(c.course_id, "Lab " + str(i)) for i in range(3) for c in courses]
+        students = ["S" + str(i) for i in range(15)] + [7, "Zoë"] # int and unicode ids
+        for student_id in students:
+            for course in rnd.sample(courses, 2):
+                self.service.enroll_student(course.course_id, student_id)
+        for _ in range(150):
+            assignment = rnd.choice(assignments)
+            course = assignment.course
+            student = rnd.choice(list(course.students))
+            self.service.submit_assignment(course.course_id, student.student_id, assignment.assignment_id, rnd.randint(0, 100))
+        self.service.dropout_student(courses[0].course_id, list(courses[0].students)[0].student_id)
+
+        self.service.save_snapshot(self.path)
+        loaded = CourseServiceImpl.load_snapshot(self.path)
+        self.assertEqual(self.state(loaded), self.state(self.service))
+
+        # The serials continue where they stopped
+        self.assertEqual(loaded.create_course("New").course_id, self.service.serial_course_id + 1)
+        self.assertEqual(loaded.create_assignment(courses[0].course_id, "New").assignment_id,
+                         self.service.serial_assignment_id + 1)
+
+        # The loaded service keeps working
+        student_id = list(courses[2].students)[0].student_id
+        loaded.submit_assignment(courses[2].course_id, student_id, courses[2].assignments[0].assignment_id, 100)
+        self.assertEqual(loaded.get_top_k_students(courses[2].course_id, 1), [student_id])
+
+    # An empty service
+    def test_empty(self):
+        self.service.save_snapshot(self.path)
+        loaded = CourseServiceImpl.load_snapshot(self.path)
+        self.assertEqual(loaded.get_courses(), [])
+        self.assertEqual(loaded.create_course("Database I").course_id, 1)
+
+    # Not a snapshot file
+    def test_invalid_file(self):
+        with open(self.path, "wb") as file:
+            file.write(b"not a snapshot" * 10)
+        self.assertRaises(ValueError, CourseServiceImpl.load_snapshot, self.path)
+
+        self.service.create_course("Database I")
+        self.service.save_snapshot(self.path)
+        with open(self.path, "r+b") as file:
+            file.truncate(os.path.getsize(self.path) - 4)
+        self.assertRaises(ValueError, CourseServiceImpl.load_snapshot, self.path)
+
+        # Cut in the string offsets, or with a string count larger than the file
+        self.service.save_snapshot(self.path)
+        with open(self.path, "r+b") as file:
+            file.truncate(snapshot.HEADER.size + 8)
+        self.assertRaisesRegex(ValueError, "Invalid snapshot", CourseServiceImpl.load_snapshot, self.path)
+        self.service.save_snapshot(self.path)
+        with open(self.path, "r+b") as file:
+            file.seek(24) # string_count in the header
+            file.write(struct.pack("<Q", 1 << 40))
+        self.assertRaisesRegex(ValueError, "Invalid snapshot", CourseServiceImpl.load_snapshot, self.path)
+
+        # A record with a string index out of the string table
+        self.service.save_snapshot(self.path)
+        with snapshot.SnapshotReader(self.path) as reader:
+            courses_start = reader.sections["courses"][1]
+        with open(self.path, "r+b") as file:
+            file.seek(courses_start + 8) # name of the first course
+            file.write(struct.pack("<I", 1 << 31))
+        self.assertRaisesRegex(ValueError, "Invalid snapshot", CourseServiceImpl.load_snapshot, self.path)
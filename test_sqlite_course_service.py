@@ -0,0 +1,138 @@
+import os
+import random
+import sqlite3
+import tempfile
+import unittest
+
+from app.course_service_impl import CourseServiceImpl
+from app.sqlite_course_service import SqliteCourseService
+import test_course
+
+# Run: python -m unittest test_sqlite_course_service.py
+
+# Same tests as CourseServiceTest, on SQLite
+class SqliteCourseServiceCourseTest(test_course.CourseServiceTest):
+
+    def setUp(self):
+        self.service = SqliteCourseService()
+
+    def tearDown(self):
+        self.service.close()
+
+
+class SqliteCourseServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "courses.db")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    # The data is back when the file is opened again, and the ids continue
+    def test_reopen(self):
+        with SqliteCourseService(self.path) as service:
+            database = service.create_course("Database I").course_id
+            removed = service.create_course("Database II").course_id
+            lab = service.create_assignment(database, "Lab 1").assignment_id
+            service.enroll_students_bulk(database, ["S2", "S1"])
+            service.enroll_student(removed, "S1")
+            service.submit_assignments_bulk([(database, "S1", lab, 90), (database, "S2", lab, 71)])
+            service.delete_course(removed)
+
+        with SqliteCourseService(self.path) as service:
+            course = service.get_course_by_id(database)
+            self.assertEqual([c.course_id for c in service.get_courses()], [database])
+            self.assertEqual([s.student_id for s in course.students], ["S2", "S1"])
+            self.assertEqual([a.assignment_id for a in course.assignments], [lab])
+            self.assertIs(service.student_list[1].courses[0], course)
+            self.assertEqual(service.get_top_five_students(database), ["S1", "S2"])
+            self.assertEqual(service.get_assignment_grade_avg(database, lab), 80)
+            self.assertEqual([(g.student.student_id, g.grade) for g in service.grade_list], [("S1", 90), ("S2", 71)])
+            self.assertIs(service.grade_list[0].course, course)
+            # Deleted ids are not used again
+            self.assertEqual(service.create_course("Algorithms").course_id, removed + 1)
+            self.assertEqual(service.create_assignment(database, "Lab 2").assignment_id, lab + 1)
+
+    # An enrollment id is not used again, so a roster cursor doesn't skip a student enrolled later
+    def test_page_after_dropout_and_enroll(self):
+        with SqliteCourseService(self.path) as service:
+            course_id = service.create_course("Database I").course_id
+            service.enroll_students_bulk(course_id, ["S1", "S2", "S3"])
+            page = service.get_course_students_page(course_id, limit=2)
+            self.assertEqual([s.student_id for s in page], ["S1", "S2"])
+            service.dropout_student(course_id, "S3")
+            service.dropout_student(course_id, "S2") # the highest id is now the one of S1
+            service.enroll_student(course_id, "S4")
+            page = service.get_course_students_page(course_id, page.next_cursor, limit=2)
+            self.assertEqual([s.student_id for s in page], ["S4"])
+            self.assertIsNone(page.next_cursor)
+
+    # A rolled back enrollment leaves no new student in the objects of the service
+    def test_rollback_keeps_no_student(self):
+        with SqliteCourseService(self.path) as service:
+            course_id = service.create_course("Database I").course_id
+            with self.assertRaises(sqlite3.Error):
+                service.enroll_students_bulk(course_id, ["S1", "S2", object()]) # not a valid SQL value
+            self.assertEqual(service.student_list, [])
+            self.assertEqual(service.connection.execute("SELECT COUNT(*) FROM student").fetchone()[0], 0)
+
+            service.enroll_students_bulk(course_id, ["S1", "S2", "S1"])
+            self.assertEqual([s.student_id for s in service.student_list], ["S1", "S2"])
+            self.assertEqual([s.student_id for s in service.get_course_by_id(course_id).students], ["S1", "S2"])
+
+    # Random changes give the same answers as CourseServiceImpl
+    def test_matches_course_service_impl(self):
+        rnd = random.Random(3)
+        service = SqliteCourseService()
+        reference = CourseServiceImpl()
+        for target in (service, reference):
+            for i in range(3):
+                course_id = target.create_course("Course " + str(i)).course_id
+                for j in range(3):
+                    target.create_assignment(course_id, "Lab " + str(j))
+        for _ in range(1500):
+            course_id = rnd.randint(1, 3)
+            student_id = "S" + str(rnd.randrange(12))
+            assignment_id = rnd.randint(1, 9)
+            action = rnd.random()
+            if action < 0.1:
+                call = ("enroll_student", course_id, student_id)
+            elif action < 0.15:
+                call = ("enroll_students_bulk", course_id, [student_id, "S" + str(rnd.randrange(12))])
+            elif action < 0.2:
+                call = ("dropout_student", course_id, student_id)
+            elif action < 0.6:
+                call = ("submit_assignment", course_id, student_id, assignment_id, rnd.randint(0, 100))
+            else:
+                call = ("submit_assignments_bulk", [(rnd.randint(1, 4), "S" + str(rnd.randrange(13)), rnd.randint(1, 9),
+                                                     rnd.randint(0, 101)) for _ in range(5)])
+            name, args = call[0], call[1:]
+            result = getattr(service, name)(*args)
+            expected = getattr(reference, name)(*args)
+            if name == "submit_assignments_bulk":
+                self.assertEqual(result.errors, expected.errors)
+            for course_id in range(1, 4):
+                self.assertEqual(service.get_top_k_students(course_id, 20), reference.get_top_k_students(course_id, 20))
+                self.assertEqual(service.get_student_rank(course_id, student_id), reference.get_student_rank(course_id, student_id))
+                self.assertEqual(service.get_students_in_rank_range(course_id, 3, 7), reference.get_students_in_rank_range(course_id, 3, 7))
+                self.assertEqual(service.get_assignment_grade_avg(course_id, assignment_id),
+                                 reference.get_assignment_grade_avg(course_id, assignment_id))
+                self.assertEqual(service.get_student_grade_avg(course_id, student_id),
+                                 reference.get_student_grade_avg(course_id, student_id))
+            self.assertEqual(service.get_student_overall_avg(student_id), reference.get_student_overall_avg(student_id))
+            self.assertEqual(service.get_course_grade_distribution(course_id), reference.get_course_grade_distribution(course_id))
+            self.assertEqual(service.get_assignment_grade_median(course_id, assignment_id),
+                             reference.get_assignment_grade_median(course_id, assignment_id))
+            self.assertEqual(service.get_assignment_grade_percentile(course_id, assignment_id, 90),
+                             reference.get_assignment_grade_percentile(course_id, assignment_id, 90))
+        key = lambda g: (g.course.course_id, g.student.student_id, g.assignment.assignment_id, g.grade)
+        self.assertEqual([key(g) for g in service.grade_list], [key(g) for g in reference.grade_list])
+        for student in reference.student_list:
+            self.assertEqual([[key(g) for g in e.grades] for e in service.get_student_transcript(student.student_id)],
+                             [[key(g) for g in e.grades] for e in reference.get_student_transcript(student.student_id)])
+        service.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+
+from app.course_service_impl import CourseServiceImpl
+from app.storage import ListStorage, DictStorage, CompactStorage
+from app.course import Course
+from app.student import Student
+import test_course
+
+# Run: python -m unittest test_storage.py
+
+# Same tests as CourseServiceTest, using the list storage (linear scans)
+class ListStorageCourseServiceTest(test_course.CourseServiceTest):
+
+    def setUp(self):
+        self.service = CourseServiceImpl(ListStorage())
+
+
+# Same tests with the enrollments in an EnrollmentIndex (views over arrays of keys)
+class CompactStorageCourseServiceTest(test_course.CourseServiceTest):
+
+    def setUp(self):
+        self.service = CourseServiceImpl(CompactStorage())
+
+
+class DictStorageTest(unittest.TestCase):
+
+    def setUp(self):
+        self.storage = DictStorage()
+
+    # Lookups by id
+    def test_get_by_id(self):
+        course = Course(1, "Database I")
+        self.storage.add_course(course)
+        self.assertIs(self.storage.get_course(1), course)
+        self.assertIsNone(self.storage.get_course(2))
+
+        student = Student("JO01")
+        self.storage.add_student(student)
+        self.assertIs(self.storage.get_student("JO01"), student)
+        self.assertIsNone(self.storage.get_student("MI01"))
+
+    # Courses are listed in insertion order, also after a removal
+    def test_insertion_order(self):
+        for course_id in [3, 1, 2]:
+            self.storage.add_course(Course(course_id, "Course " + str(course_id)))
+        self.assertEqual([c.course_id for c in self.storage.courses()], [3, 1, 2])
+
+        removed = self.storage.remove_course(1)
+        self.assertEqual(removed.course_id, 1)
+        self.assertIsNone(self.storage.remove_course(1)) # already removed
+        self.assertEqual([c.course_id for c in self.storage.courses()], [3, 2])
+
+    # The service uses DictStorage by default
+    def test_default_storage(self):
+        service = CourseServiceImpl()
+        self.assertIsInstance(service.storage, DictStorage)
+        service.create_course("Database I")
+        service.create_course("Database II")
+        service.delete_course(1)
+        service.create_course("Database III")
+        self.assertEqual([c.course_id for c in service.get_courses()], [2, 3])
+
+    # Grades are kept by (course, student, assignment) and in buckets by course and student
+    def test_grade_buckets(self):
+        service = CourseServiceImpl(self.storage)
+        course1 = service.create_course("Database I")
+        course2 = service.create_course("Database II")
+        service.enroll_students_bulk(course1.course_id, ["JO01", "TO01"])
+        service.enroll_student(course2.course_id, "JO01")
+        a1 = service.create_assignment(course1.course_id, "Lab 1")
+        a2 = service.create_assignment(course1.course_id, "Lab 2")
+        a3 = service.create_assignment(course2.course_id, "Lab 3")
+        service.submit_assignments_bulk([
+            (course1.course_id, "JO01", a1.assignment_id, 5),
+            (course1.course_id, "JO01", a2.assignment_id, 6),
+            (course1.course_id, "TO01", a1.assignment_id, 7),
+            (course2.course_id, "JO01", a3.assignment_id, 8),
+        ])
+
+        self.assertEqual(sorted(g.grade for g in self.storage.course_grades(course1.course_id)), [5, 6, 7])
+        self.assertEqual(sorted(g.grade for g in self.storage.student_grades(course1.course_id, "JO01")), [5, 6])
+
+        removed = self.storage.remove_student_grades(course1.course_id, "JO01")
+        self.assertEqual(sorted(g.grade for g in removed), [5, 6])
+        self.assertEqual(list(self.storage.student_grades(course1.course_id, "JO01")), [])
+
+        removed = self.storage.remove_grade(course1.course_id, "TO01", a1.assignment_id)
+        self.assertEqual(removed.grade, 7)
+        self.assertNotIn(course1.course_id, self.storage.grade_buckets) # empty buckets are released
+
+        removed = self.storage.remove_course_grades(course2.course_id)
+        self.assertEqual([g.grade for g in removed], [8])
+        self.assertEqual(self.storage.grade_map, {})
+        self.assertEqual(self.storage.grade_buckets, {})